@@ -0,0 +1,65 @@
+# bench_distance_startup.py - Distance table load time: CSV vs compiled binary
+"""
+WGUPS Distance Table Startup Benchmark
+
+Writes a synthetic distance CSV in the WGUPS layout (bottom-left triangle
+filled in, see synthetic.py), compiles it with distance_file.py, and times
+DistanceManager.load_distance_data on each. The compiled file is
+memory-mapped, so its load time should stay flat as the city grows.
+
+Run from the benchmarks directory:
+    python bench_distance_startup.py --locations 200 1000 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from distance_file import compile_distance_table  # noqa: E402
+from main import DistanceManager  # noqa: E402
+from synthetic import write_distance_table  # noqa: E402
+
+
+def time_load(file_path, backend):
+    """Seconds for a fresh DistanceManager to load file_path."""
+    manager = DistanceManager(backend=backend)
+    start = time.perf_counter()
+    manager.load_distance_data(file_path)
+    elapsed = time.perf_counter() - start
+    if manager.distance_file is not None:
+        manager.distance_file.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs compiled distance table load time")
+    parser.add_argument("--locations", type=int, nargs="+", default=[200, 1000, 2000],
+                        help="Number of locations in the synthetic city")
+    parser.add_argument("--backend", choices=[DistanceManager.LIST, DistanceManager.NUMPY],
+                        default=DistanceManager.LIST)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for location_count in args.locations:
+            csv_path, _ = write_distance_table(folder, location_count, compiled=False)
+            compiled_path = os.path.join(folder, f"distances_{location_count}.wgd")
+            compile_distance_table(csv_path, compiled_path)
+
+            results.append((location_count, os.path.getsize(csv_path), os.path.getsize(compiled_path),
+                            time_load(csv_path, args.backend), time_load(compiled_path, args.backend)))
+
+    print(f"\n{'LOCATIONS':>9} {'CSV (MB)':>9} {'WGD (MB)':>9} {'CSV LOAD (ms)':>14} {'WGD LOAD (ms)':>14}")
+    print("-" * 60)
+    megabyte = 1024 * 1024
+    for location_count, csv_bytes, compiled_bytes, csv_seconds, compiled_seconds in results:
+        print(f"{location_count:>9} {csv_bytes / megabyte:>9.1f} {compiled_bytes / megabyte:>9.1f} "
+              f"{csv_seconds * 1000:>14.1f} {compiled_seconds * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_distance_storage.py - Memory used by full vs triangular distance storage
+"""
+WGUPS Distance Storage Benchmark
+
+Loads the same synthetic distance CSV with full and triangular storage,
+measures the memory each matrix takes with tracemalloc, times a batch of
+random distance lookups, and checks every storage mode gives identical
+distances.
+
+Run from the benchmarks directory:
+    python bench_distance_storage.py --locations 500 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import DistanceManager, np  # noqa: E402
+from synthetic import write_distance_table  # noqa: E402
+
+
+def measure(csv_path, backend, storage, pairs):
+    """
+    Load the CSV and measure it.
+
+    Returns:
+        tuple: (bytes held by the loaded table, lookup seconds, distances for pairs)
+    """
+    manager = DistanceManager(backend=backend, storage=storage)
+
+    tracemalloc.start()
+    manager.load_distance_data(csv_path)
+    # The CSV parsing garbage is gone by now - what's left is the matrix
+    held_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    distances = [manager.get_distance_by_index(i, j) for i, j in pairs]
+    seconds = time.perf_counter() - start
+
+    return held_bytes, seconds, distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full vs triangular distance storage")
+    parser.add_argument("--locations", type=int, nargs="+", default=[500, 2000],
+                        help="Number of locations in the synthetic city")
+    parser.add_argument("--lookups", type=int, default=200_000, help="Random lookups to time")
+    args = parser.parse_args()
+
+    backends = [DistanceManager.LIST] + ([DistanceManager.NUMPY] if np is not None else [])
+    rows = []
+
+    with tempfile.TemporaryDirectory() as folder:
+        for location_count in args.locations:
+            csv_path, _ = write_distance_table(folder, location_count, compiled=False)
+
+            rng = random.Random(1)
+            pairs = [(rng.randrange(location_count), rng.randrange(location_count)) for _ in range(args.lookups)]
+
+            expected = None
+            for backend in backends:
+                for storage in (DistanceManager.FULL, DistanceManager.TRIANGULAR):
+                    held_bytes, seconds, distances = measure(csv_path, backend, storage, pairs)
+                    if expected is None:
+                        expected = distances
+                    assert distances == expected, f"{backend}/{storage} distances differ"
+                    rows.append((location_count, backend, storage, held_bytes, seconds))
+
+    megabyte = 1024 * 1024
+    print(f"\n{'LOCATIONS':>9} {'BACKEND':<7} {'STORAGE':<11} {'MEMORY (MB)':>12} {'LOOKUP (ns)':>12}")
+    print("-" * 56)
+    for location_count, backend, storage, held_bytes, seconds in rows:
+        print(f"{location_count:>9} {backend:<7} {storage:<11} {held_bytes / megabyte:>12.1f} "
+              f"{seconds / args.lookups * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
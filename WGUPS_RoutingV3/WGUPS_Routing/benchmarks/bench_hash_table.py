@@ -0,0 +1,89 @@
+# bench_hash_table.py - Lookup latency micro-benchmark for the WGUPS hash table
+"""
+WGUPS Hash Table Benchmark
+
+Fills the hash table with more and more packages and times random lookups
+at each size. If resizing works, the time per lookup should stay about the
+same from 40 packages all the way up to 1 million.
+
+Run from the benchmarks directory:
+    python bench_hash_table.py
+    python bench_hash_table.py --sizes 40 1000 100000 --mode robin_hood
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# The program modules live in ../src and import each other by plain name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from hash_table import HashTable  # noqa: E402
+
+DEFAULT_SIZES = [40, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def build_table(package_count, mode):
+    """
+    Fill a fresh hash table with package_count fake packages.
+
+    Args:
+        package_count (int): How many packages to insert
+        mode (str): HashTable.CHAINING or HashTable.ROBIN_HOOD
+
+    Returns:
+        tuple: The filled table and how long the inserts took in seconds
+    """
+    table = HashTable(mode=mode)
+    start = time.perf_counter()
+    for package_id in range(1, package_count + 1):
+        table.insert(package_id, "410 S State St", "Salt Lake City", "UT", "84111", "EOD", 1.0)
+    return table, time.perf_counter() - start
+
+
+def time_lookups(table, package_count, lookup_count, seed=42):
+    """
+    Time random lookups against a filled table.
+
+    Returns:
+        float: Average nanoseconds per lookup
+    """
+    rng = random.Random(seed)
+    keys = [rng.randint(1, package_count) for _ in range(lookup_count)]
+
+    start = time.perf_counter()
+    for package_id in keys:
+        table.lookup(package_id)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / lookup_count * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash table lookup latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Package counts to test")
+    parser.add_argument("--lookups", type=int, default=100_000,
+                        help="Random lookups to time at each size")
+    parser.add_argument("--mode", choices=[HashTable.CHAINING, HashTable.ROBIN_HOOD, "both"],
+                        default="both", help="Which collision strategy to benchmark")
+    args = parser.parse_args()
+
+    modes = [HashTable.CHAINING, HashTable.ROBIN_HOOD] if args.mode == "both" else [args.mode]
+
+    print(f"{'MODE':<12} {'PACKAGES':>10} {'CAPACITY':>10} {'RESIZES':>8} "
+          f"{'INSERT (s)':>11} {'LOOKUP (ns)':>12}")
+    print("-" * 68)
+
+    for mode in modes:
+        for package_count in args.sizes:
+            table, insert_seconds = build_table(package_count, mode)
+            lookup_ns = time_lookups(table, package_count, args.lookups)
+            print(f"{mode:<12} {package_count:>10,} {table.capacity:>10,} {table.resize_count:>8} "
+                  f"{insert_seconds:>11.3f} {lookup_ns:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# bench_lookup_allocations.py - Allocation benchmark for package lookups while routing
+"""
+WGUPS Lookup Allocation Benchmark
+
+Routes one synthetic truck two ways and counts the package objects created
+by hash table lookups along the way:
+
+- before: the original nearest neighbor loop, which calls lookup() (a new
+  9-key dictionary) for every candidate at every step
+- after: DeliveryRouter.calculate_route_for_truck, which reads each location
+  once through lookup_view()
+
+Every object a lookup returns is kept alive until the route is done, so
+tracemalloc can add up exactly how many bytes those lookups allocated.
+
+Run from the benchmarks directory:
+    python bench_lookup_allocations.py --stops 16 100 400
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import DeliveryRouter, Truck  # noqa: E402
+
+
+def legacy_nearest_neighbor(router, truck):
+    """The nearest neighbor loop as it was before lookup_view() existed."""
+    unvisited = truck.packages.copy()
+    route = []
+    current_location = truck.current_location
+
+    while unvisited:
+        nearest_package = None
+        nearest_distance = float('inf')
+
+        for package_id in unvisited:
+            package_data = router.package_table.lookup(package_id)
+            distance = router.distance_manager.get_distance(current_location, package_data['delivery_address'])
+            if distance < nearest_distance:
+                nearest_distance = distance
+                nearest_package = package_id
+
+        route.append(nearest_package)
+        unvisited.remove(nearest_package)
+        current_location = router.package_table.lookup(nearest_package)['delivery_address']
+
+    return route
+
+
+def build_router(stop_count, seed=7):
+    """
+    Make a router holding one truck with stop_count packages on it.
+
+    Packages are sent to random addresses from the real distance table.
+    """
+    router = DeliveryRouter()
+    router.distance_manager.load_distance_data()
+    addresses = router.distance_manager.addresses[1:]  # Everything except the hub
+
+    rng = random.Random(seed)
+    truck = Truck(1)
+    truck.capacity = stop_count
+
+    for package_id in range(1, stop_count + 1):
+        address = rng.choice(addresses)
+        router.package_table.insert(package_id, address, "Salt Lake City", "UT", "84111", "EOD", 1.0,
+                                    location_index=router.distance_manager.resolve_address(address))
+        truck.load_package(package_id)
+
+    return router, truck
+
+
+def measure(router, route_function, truck):
+    """
+    Route the truck once while counting what the lookups allocate.
+
+    Returns:
+        tuple: (lookup calls, bytes allocated by lookups, seconds without tracing)
+    """
+    table = router.package_table
+    original_lookup = table.lookup
+    original_lookup_view = table.lookup_view
+    kept_alive = []
+
+    def counting_lookup(package_id):
+        result = original_lookup(package_id)
+        kept_alive.append(result)
+        return result
+
+    def counting_lookup_view(package_id):
+        result = original_lookup_view(package_id)
+        kept_alive.append(result)
+        return result
+
+    # Size the keep-alive list up front so its own growth isn't counted
+    kept_alive.extend([None] * (len(truck.packages) ** 2 * 2 + len(truck.packages)))
+    kept_alive.clear()
+
+    table.lookup = counting_lookup
+    table.lookup_view = counting_lookup_view
+    try:
+        tracemalloc.start()
+        before_bytes = tracemalloc.get_traced_memory()[0]
+        route_function(truck)
+        allocated_bytes = tracemalloc.get_traced_memory()[0] - before_bytes
+        tracemalloc.stop()
+    finally:
+        del table.lookup
+        del table.lookup_view
+
+    calls = len(kept_alive)
+    kept_alive.clear()
+
+    start = time.perf_counter()
+    route_function(truck)
+    seconds = time.perf_counter() - start
+
+    return calls, allocated_bytes, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lookup allocations per routed package")
+    parser.add_argument("--stops", type=int, nargs="+", default=[16, 100, 400],
+                        help="Packages on the benchmark truck")
+    args = parser.parse_args()
+
+    print(f"\n{'STOPS':>6} {'VERSION':<8} {'LOOKUPS/PKG':>12} {'BYTES/PKG':>10} {'ROUTE (ms)':>11}")
+    print("-" * 52)
+
+    for stop_count in args.stops:
+        router, truck = build_router(stop_count)
+        versions = [
+            ("before", lambda t: legacy_nearest_neighbor(router, t)),
+            ("after", router.calculate_route_for_truck),
+        ]
+        for name, route_function in versions:
+            calls, allocated_bytes, seconds = measure(router, route_function, truck)
+            print(f"{stop_count:>6} {name:<8} {calls / stop_count:>12.1f} "
+                  f"{allocated_bytes / stop_count:>10.0f} {seconds * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
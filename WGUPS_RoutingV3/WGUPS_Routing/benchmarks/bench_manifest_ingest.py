@@ -0,0 +1,75 @@
+# bench_manifest_ingest.py - Streaming a large package manifest into the table
+"""
+WGUPS Manifest Ingestion Benchmark
+
+Writes a synthetic package CSV (see synthetic.py, with a small share of
+broken rows mixed in), then loads it with ingest_manifest() and reports:
+
+- rows/s for the whole load (read, check, resolve address, insert)
+- how many rows were left out, which should match the broken rows written
+- memory traced while loading: what's still held once the load is done
+  (the table and its indexes) and the peak on top of that
+
+The extra peak is what the loader itself needs plus the table growing -
+the loader's share should stay about the same whether the manifest has
+10,000 rows or a million, since only one chunk is in memory at a time.
+
+Run from the benchmarks directory:
+    python bench_manifest_ingest.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from hash_table import HashTable  # noqa: E402
+from manifest import CHUNK_SIZE, ingest_manifest  # noqa: E402
+from synthetic import location_addresses, write_manifest  # noqa: E402
+
+ADDRESS_COUNT = 5000
+BROKEN_SHARE = 0.001
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Package manifest ingestion throughput")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000], help="Manifest sizes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc (it slows the load down a lot)")
+    args = parser.parse_args()
+
+    print(f"\n{'ROWS':>9} {'SECONDS':>8} {'ROWS/S':>10} {'LEFT OUT':>9} {'BROKEN':>7} "
+          f"{'KEPT (MB)':>10} {'EXTRA PEAK (MB)':>16}")
+    print("-" * 75)
+
+    addresses = location_addresses(ADDRESS_COUNT)
+    locations = {address: index for index, address in enumerate(addresses)}
+
+    with tempfile.TemporaryDirectory() as folder:
+        for row_count in args.rows:
+            file_path, _, broken = write_manifest(folder, row_count, addresses, truck_count=3,
+                                                  broken_share=BROKEN_SHARE)
+
+            table = HashTable()
+            if not args.no_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            report = ingest_manifest(file_path, table, lambda address: locations.get(address, -1),
+                                     chunk_size=args.chunk_size)
+            seconds = time.perf_counter() - start
+            kept = peak = 0
+            if not args.no_memory:
+                kept, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            print(f"{row_count:>9} {seconds:>8.2f} {row_count / seconds:>10,.0f} {report.rows_rejected:>9} "
+                  f"{broken:>7} {kept / 1e6:>10.1f} {(peak - kept) / 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# bench_nearest_neighbor.py - Nearest neighbor routing time for each distance backend
+"""
+WGUPS Nearest Neighbor Benchmark
+
+Builds a synthetic city (random points, straight-line distances - see
+synthetic.py), puts one
+truck's worth of stops on it and times DeliveryRouter.calculate_route_for_truck
+with the list backend and the NumPy backend. Both backends must produce the
+same route.
+
+Run from the benchmarks directory (NumPy must be installed for the second column):
+    python bench_nearest_neighbor.py --stops 100 500 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import DeliveryRouter, DistanceManager, Truck, np  # noqa: E402
+from synthetic import distance_matrix  # noqa: E402
+
+
+def build_router(backend, addresses, matrix, stop_count):
+    """A router whose distance manager holds the synthetic city and one loaded truck."""
+    router = DeliveryRouter(distance_backend=backend, route_improvers=[])  # Just nearest neighbor
+    manager = router.distance_manager
+    manager.addresses = addresses
+    manager.address_to_index = {address: i for i, address in enumerate(addresses)}
+    manager.distance_matrix = np.array(matrix, dtype=manager.dtype) if backend == DistanceManager.NUMPY else matrix
+
+    truck = Truck(1)
+    truck.capacity = stop_count
+    truck.current_location = addresses[0]  # Location 0 is the hub
+
+    for package_id in range(1, stop_count + 1):
+        location_index = package_id % (len(addresses) - 1) + 1
+        router.package_table.insert(package_id, addresses[location_index], "Salt Lake City", "UT",
+                                    "84111", "EOD", 1.0, location_index=location_index)
+        truck.load_package(package_id)
+
+    return router, truck
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nearest neighbor routing time per backend")
+    parser.add_argument("--stops", type=int, nargs="+", default=[100, 500, 2000],
+                        help="Stops on the benchmark truck (also the number of locations)")
+    args = parser.parse_args()
+
+    backends = [DistanceManager.LIST] + ([DistanceManager.NUMPY] if np is not None else [])
+    print(f"{'STOPS':>6} " + " ".join(f"{backend + ' (ms)':>12}" for backend in backends))
+    print("-" * (8 + 13 * len(backends)))
+
+    for stop_count in args.stops:
+        addresses, matrix = distance_matrix(stop_count + 1)
+        timings = []
+        routes = []
+        for backend in backends:
+            router, truck = build_router(backend, addresses, matrix, stop_count)
+            start = time.perf_counter()
+            routes.append(router.calculate_route_for_truck(truck))
+            timings.append((time.perf_counter() - start) * 1000)
+
+        assert all(route == routes[0] for route in routes), "Backends produced different routes"
+        print(f"{stop_count:>6} " + " ".join(f"{ms:>12.1f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_package_store.py - Memory and column-scan benchmark for the package store
+"""
+WGUPS Package Store Benchmark
+
+Loads a synthetic manifest (see synthetic.py) into the column-based hash
+table and reports:
+
+- memory per package, measured with tracemalloc while the table is built
+- the same manifest stored the old way, as [package_id, [9 fields]] pairs
+- time to find every package due before 10:30 AM with the column scan
+  versus a plain Python loop over lookup()
+
+Run from the benchmarks directory:
+    python bench_package_store.py --packages 1000000
+    python bench_package_store.py --packages 100000 --with-indexes
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from hash_table import HashTable  # noqa: E402
+from synthetic import location_addresses, package_rows  # noqa: E402
+
+ADDRESS_COUNT = 5000
+
+
+def synthetic_rows(package_count):
+    """Yield HashTable.insert() arguments for a synthetic manifest."""
+    addresses = location_addresses(ADDRESS_COUNT)
+    for row, _, _ in package_rows(package_count, addresses, truck_count=3):
+        yield (*row[:6], float(row[6]))
+
+
+def measure_table(package_count, mode, secondary_indexes):
+    """Build the hash table and return (table, traced bytes)."""
+    tracemalloc.start()
+    table = HashTable(mode=mode, secondary_indexes=secondary_indexes)
+    for row in synthetic_rows(package_count):
+        table.insert(*row)
+    traced_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table, traced_bytes
+
+
+def measure_legacy(package_count):
+    """Store the manifest the way the old table did and return traced bytes."""
+    tracemalloc.start()
+    entries = []
+    for row in synthetic_rows(package_count):
+        entries.append([row[0], list(row) + ["At Hub", None]])
+    traced_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+    return traced_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Package store memory and scan benchmark")
+    parser.add_argument("--packages", type=int, default=1_000_000, help="Manifest size")
+    parser.add_argument("--mode", choices=[HashTable.CHAINING, HashTable.ROBIN_HOOD],
+                        default=HashTable.ROBIN_HOOD, help="Hash table mode")
+    parser.add_argument("--with-indexes", action="store_true",
+                        help="Also keep the status/deadline/address/truck indexes")
+    args = parser.parse_args()
+
+    megabyte = 1024 * 1024
+    package_count = args.packages
+
+    legacy_bytes = measure_legacy(package_count)
+    table, traced_bytes = measure_table(package_count, args.mode, args.with_indexes)
+
+    print(f"Packages: {package_count:,} ({args.mode}, secondary indexes "
+          f"{'on' if args.with_indexes else 'off'})")
+    print(f"Old [id, [9 fields]] storage: {legacy_bytes / megabyte:8.1f} MB "
+          f"({legacy_bytes / package_count:.0f} bytes/package)")
+    print(f"Column store (traced):        {traced_bytes / megabyte:8.1f} MB "
+          f"({traced_bytes / package_count:.0f} bytes/package)")
+    print(f"Column store (arrays+index):  {table.memory_usage() / megabyte:8.1f} MB")
+
+    start = time.perf_counter()
+    early = table.packages_with_deadline_before("10:30 AM")
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_result = []
+    for package_id in range(1, package_count + 1):
+        if table.lookup(package_id)['delivery_deadline'] == "9:00 AM":
+            loop_result.append(package_id)
+    loop_seconds = time.perf_counter() - start
+
+    assert sorted(early) == loop_result
+    print(f"\nDue before 10:30 AM: {len(early):,} packages")
+    print(f"Column scan:       {scan_seconds * 1000:8.1f} ms")
+    print(f"lookup() loop:     {loop_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_parallel_routing.py - Serial vs process-pool route planning
+"""
+WGUPS Parallel Routing Benchmark
+
+Loads a synthetic city with many trucks (16 packages each, all leaving at
+8:00 AM), then plans every truck's route with deadline insertion + 2-opt +
+Or-opt two ways:
+
+- serial: calculate_route_for_truck() for each truck in this process
+- parallel: DeliveryRouter.plan_routes() on 1, 2, 4, ... worker processes,
+  with the distance table in shared memory
+
+The parallel times include starting the pool and copying the distance
+table into shared memory, so they're the real wall-clock cost. Speedup is
+against the serial run; efficiency is speedup divided by workers.
+
+Run from the benchmarks directory:
+    python bench_parallel_routing.py --trucks 200 --workers 1 2 4 8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from route_optimizer import OrOptImprover, TwoOptImprover  # noqa: E402
+from synthetic import loaded_router  # noqa: E402
+
+
+def build_router(truck_count):
+    """A synthetic day where every truck has one trip planned for 8:00 AM."""
+    router = loaded_router(truck_count)
+    router.route_improvers = [TwoOptImprover(), OrOptImprover()]
+    for truck in router.trucks:
+        package_ids, truck.packages = truck.packages, []
+        truck.add_trip(package_ids, router.start_time)
+    return router
+
+
+def main():
+    core_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, core_count} | {count for count in (8, 16) if count <= core_count})
+
+    parser = argparse.ArgumentParser(description="Serial vs parallel route planning")
+    parser.add_argument("--trucks", type=int, default=200, help="Trucks (routes) to plan")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers,
+                        help="Worker process counts to try")
+    args = parser.parse_args()
+
+    router = build_router(args.trucks)
+    hub_index = router.distance_manager.resolve_address(router.hub_address)
+
+    start = time.perf_counter()
+    for truck in router.trucks:
+        router.calculate_route_for_truck(truck, start_index=hub_index)
+    serial_seconds = time.perf_counter() - start
+
+    print(f"\n{args.trucks} routes, {core_count} CPU cores")
+    print(f"\n{'WORKERS':>8} {'TIME (ms)':>10} {'SPEEDUP':>8} {'EFFICIENCY':>11}")
+    print("-" * 40)
+    print(f"{'serial':>8} {serial_seconds * 1000:>10.1f} {1.0:>7.2f}x {'':>11}")
+
+    for workers in args.workers:
+        with redirect_stdout(io.StringIO()):
+            seconds = router.plan_routes(workers)
+        speedup = serial_seconds / seconds
+        print(f"{workers:>8} {seconds * 1000:>10.1f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+    if core_count == 1:
+        print("\nOnly one CPU core here - extra workers just take turns on it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_plan_file.py - Saving and reloading a computed day
+"""
+WGUPS Plan File Benchmark
+
+Simulates a synthetic day with many trucks, then compares:
+
+- simulate: running the day (without routing improvement, so this is the
+  cheapest it gets - the real planner takes longer)
+- save: writing the plan file
+- load: load_plan(), which rebuilds the package table, trucks and timeline
+
+for both plan file forms (.jsonl and the pickled .wgp), with file sizes.
+Loading should stay far below simulating and grow linearly with the
+number of packages.
+
+Run from the benchmarks directory:
+    python bench_plan_file.py --trucks 3 30 300
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from plan_file import load_plan, save_plan  # noqa: E402
+from simulation import DeliverySimulation  # noqa: E402
+from synthetic import loaded_router  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan file save/load speed")
+    parser.add_argument("--trucks", type=int, nargs="+", default=[3, 30, 300], help="Fleet sizes to try")
+    args = parser.parse_args()
+
+    print(f"\n{'TRUCKS':>7} {'PACKAGES':>9} {'FORM':>6} {'SIMULATE (ms)':>14} {'SAVE (ms)':>10} "
+          f"{'LOAD (ms)':>10} {'SIZE (KB)':>10}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for truck_count in args.trucks:
+            router = loaded_router(truck_count)
+            start = time.perf_counter()
+            simulation = DeliverySimulation(router, verbose=False)
+            simulation.run()
+            simulate_seconds = time.perf_counter() - start
+            router.timeline = simulation.timeline
+
+            for extension in (".jsonl", ".wgp"):
+                file_path = os.path.join(folder, f"plan{truck_count}{extension}")
+                start = time.perf_counter()
+                save_plan(router, file_path)
+                save_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                loaded = load_plan(file_path)
+                load_seconds = time.perf_counter() - start
+                assert loaded.package_table.size == router.package_table.size
+
+                print(f"{truck_count:>7} {router.package_table.size:>9} {extension[1:]:>6} "
+                      f"{simulate_seconds * 1000:>14.1f} {save_seconds * 1000:>10.1f} "
+                      f"{load_seconds * 1000:>10.1f} {os.path.getsize(file_path) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# bench_replanning.py - Cost of a mid-day package change
+"""
+WGUPS Re-planning Benchmark
+
+Loads a synthetic city with many trucks (16 packages each, all leaving at
+8:00 AM, routes planned with 2-opt + Or-opt), then throws package changes
+at the day partway through: new addresses and tighter deadlines for
+packages that are already out on trucks.
+
+Each change only re-plans the rest of one truck's route, so this compares:
+
+- re-plan: the average time for one change's suffix re-plan
+- full day: planning and simulating the whole day again from scratch,
+  which is what handling a change used to cost
+
+Run from the benchmarks directory:
+    python bench_replanning.py --trucks 30 300 --changes 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from hash_table import deadline_to_minutes  # noqa: E402
+from route_optimizer import OrOptImprover, TwoOptImprover  # noqa: E402
+from simulation import DeliverySimulation, PackageChange  # noqa: E402
+from synthetic import loaded_router  # noqa: E402
+
+
+def build_router(truck_count):
+    """A synthetic day with the normal route improvers turned on."""
+    router = loaded_router(truck_count)
+    router.route_improvers = [TwoOptImprover(), OrOptImprover()]
+    return router
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suffix re-planning vs a full re-run")
+    parser.add_argument("--trucks", type=int, nargs="+", default=[30, 300], help="Fleet sizes to try")
+    parser.add_argument("--changes", type=int, default=50, help="Package changes during the day")
+    parser.add_argument("--at", default="8:45 AM", help="When the changes happen")
+    args = parser.parse_args()
+
+    print(f"\n{'TRUCKS':>7} {'CHANGES':>8} {'RE-PLAN (ms)':>13} {'FULL DAY (ms)':>14} {'SPEEDUP':>9}")
+    print("-" * 56)
+
+    for truck_count in args.trucks:
+        # The whole day from scratch, no changes
+        router = build_router(truck_count)
+        start = time.perf_counter()
+        DeliverySimulation(router, verbose=False).run()
+        full_seconds = time.perf_counter() - start
+
+        # Same day again, with changes partway through
+        router = build_router(truck_count)
+        simulation = DeliverySimulation(router, verbose=False)
+        rng = random.Random(7)
+        at_minutes = deadline_to_minutes(args.at)
+        addresses = router.distance_manager.addresses
+        for package_id in rng.sample(range(1, router.package_table.size + 1), args.changes):
+            if rng.random() < 0.5:
+                change = PackageChange(package_id, at_minutes, address=addresses[rng.randrange(1, len(addresses))])
+            else:
+                change = PackageChange(package_id, at_minutes, deadline="12:00 PM")
+            simulation.schedule_change(change)
+        simulation.run()
+
+        if not simulation.replans:
+            print(f"{truck_count:>7} {args.changes:>8} {'(every changed package was already delivered)':>38}")
+            continue
+
+        replan_seconds = sum(seconds for _, _, _, seconds in simulation.replans) / len(simulation.replans)
+        print(f"{truck_count:>7} {len(simulation.replans):>8} {replan_seconds * 1000:>13.2f} "
+              f"{full_seconds * 1000:>14.1f} {full_seconds / replan_seconds:>8,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
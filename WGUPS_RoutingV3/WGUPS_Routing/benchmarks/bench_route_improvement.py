@@ -0,0 +1,140 @@
+# bench_route_improvement.py - Miles saved by the route improvement stage
+"""
+WGUPS Route Improvement Benchmark
+
+Puts one truck's worth of stops on a synthetic city (see synthetic.py)
+and routes it several ways:
+
+- nearest neighbor on its own
+- nearest neighbor + 2-opt
+- nearest neighbor + 2-opt + Or-opt
+- deadline insertion on its own
+- deadline insertion + 2-opt + Or-opt (the router's default)
+
+Some of the packages get a deadline (--deadline-share), spread out over
+the day so a longer route has more of them to juggle.
+
+For each route size it prints the route length in miles (including the
+drive back to the hub), the percentage saved over nearest neighbor, how
+many packages would be late, and how long the whole
+calculate_route_for_truck call took.
+
+Run from the benchmarks directory:
+    python bench_route_improvement.py --stops 16 50 100 200 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import DeliveryRouter, Truck  # noqa: E402
+from route_optimizer import OrOptImprover, TwoOptImprover  # noqa: E402
+from synthetic import distance_matrix  # noqa: E402
+
+DEADLINES = ["9:00 AM", "10:30 AM", "12:00 PM", "2:00 PM"]
+
+
+def build_router(addresses, matrix, stop_count, deadline_share, seed=5):
+    """A router holding the synthetic city and one loaded truck, some packages with deadlines."""
+    router = DeliveryRouter()
+    manager = router.distance_manager
+    manager.addresses = addresses
+    manager.address_to_index = {address: i for i, address in enumerate(addresses)}
+    manager.distance_matrix = matrix
+
+    rng = random.Random(seed)
+    truck = Truck(1)
+    truck.capacity = stop_count
+    truck.current_location = addresses[0]  # Location 0 is the hub
+    truck.departure_time = router.start_time
+
+    for package_id in range(1, stop_count + 1):
+        location_index = package_id % (len(addresses) - 1) + 1
+        deadline = rng.choice(DEADLINES) if rng.random() < deadline_share else "EOD"
+        router.package_table.insert(package_id, addresses[location_index], "Salt Lake City", "UT",
+                                    "84111", deadline, 1.0, location_index=location_index)
+        truck.load_package(package_id)
+
+    return router, truck
+
+
+def late_packages(router, truck, route):
+    """How many packages the route would deliver after their deadline."""
+    package_locations = {}
+    package_deadlines = {}
+    for package_id in route:
+        package = router.package_table.lookup_view(package_id)
+        package_locations[package_id] = package.location_index
+        package_deadlines[package_id] = package.deadline_minutes * 60  # The router compares in seconds
+    start_index = router.distance_manager.resolve_address(truck.current_location)
+    return router._count_late_packages(truck, route, package_locations, package_deadlines, start_index)
+
+
+def route_miles(router, truck, route):
+    """Miles to drive the route from the truck's start and back again."""
+    get_distance = router.distance_manager.get_distance_by_index
+    start_index = router.distance_manager.resolve_address(truck.current_location)
+
+    miles = 0.0
+    current_index = start_index
+    for package_id in route:
+        location_index = router.package_table.lookup_view(package_id).location_index
+        miles += get_distance(current_index, location_index)
+        current_index = location_index
+    return miles + get_distance(current_index, start_index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Miles saved by 2-opt / Or-opt per route size")
+    parser.add_argument("--stops", type=int, nargs="+", default=[16, 50, 100, 200, 500],
+                        help="Stops on the benchmark truck (also the number of locations)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Seconds the improvers get per route (default: no limit, just the move cap)")
+    parser.add_argument("--deadline-share", type=float, default=0.3,
+                        help="Fraction of packages that get a deadline before EOD")
+    args = parser.parse_args()
+
+    nearest = DeliveryRouter.NEAREST_NEIGHBOR
+    insertion = DeliveryRouter.DEADLINE_INSERTION
+    stages = [
+        ("nearest neighbor", nearest, []),
+        ("  + 2-opt", nearest, [TwoOptImprover()]),
+        ("  + 2-opt + Or-opt", nearest, [TwoOptImprover(), OrOptImprover()]),
+        ("deadline insertion", insertion, []),
+        ("  + 2-opt + Or-opt", insertion, [TwoOptImprover(), OrOptImprover()]),
+    ]
+
+    print(f"\n{'STOPS':>6} {'STAGES':<20} {'MILES':>9} {'SAVED':>7} {'LATE':>5} {'ROUTE (ms)':>11}")
+    print("-" * 63)
+
+    for stop_count in args.stops:
+        addresses, matrix = distance_matrix(stop_count + 1)
+        baseline_miles = None
+
+        for name, strategy, improvers in stages:
+            router, truck = build_router(addresses, matrix, stop_count, args.deadline_share)
+            router.route_strategy = strategy
+            router.route_improvers = improvers
+            router.improvement_time_budget = args.time_budget
+
+            start = time.perf_counter()
+            route = router.calculate_route_for_truck(truck)
+            seconds = time.perf_counter() - start
+
+            assert sorted(route) == sorted(truck.packages), "Improver lost or duplicated a stop"
+            miles = route_miles(router, truck, route)
+            if baseline_miles is None:
+                baseline_miles = miles
+            saved = (baseline_miles - miles) / baseline_miles * 100
+
+            late = late_packages(router, truck, route)
+
+            print(f"{stop_count:>6} {name:<20} {miles:>9.1f} {saved:>6.1f}% {late:>5} {seconds * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_status_queries.py - Status-at-time lookups on the delivery timeline
+"""
+WGUPS Status Query Benchmark
+
+Simulates a synthetic day with many trucks, then times the supervisor
+queries against the timeline the simulation recorded:
+
+- package: one package's status at a random time (one bisect)
+- truck: one truck's status at a random time (one bisect)
+- snapshot: every package's status at one time (one bisect per package)
+
+The snapshot should grow linearly with the number of packages, and the
+single lookups should barely change as the day gets bigger.
+
+Run from the benchmarks directory:
+    python bench_status_queries.py --trucks 3 30 300
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from simulation import DeliverySimulation  # noqa: E402
+from synthetic import loaded_router  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Status-at-time query speed")
+    parser.add_argument("--trucks", type=int, nargs="+", default=[3, 30, 300], help="Fleet sizes to try")
+    parser.add_argument("--queries", type=int, default=10000, help="Single lookups to time")
+    args = parser.parse_args()
+
+    print(f"\n{'TRUCKS':>7} {'PACKAGES':>9} {'PACKAGE (us)':>13} {'TRUCK (us)':>11} {'SNAPSHOT (ms)':>14}")
+    print("-" * 58)
+
+    for truck_count in args.trucks:
+        router = loaded_router(truck_count)
+        simulation = DeliverySimulation(router, verbose=False)
+        simulation.run()
+        router.timeline = simulation.timeline
+
+        rng = random.Random(5)
+        package_count = router.package_table.size
+        times = [router.start_time + datetime.timedelta(minutes=rng.randrange(0, 8 * 60))
+                 for _ in range(args.queries)]
+        package_ids = [rng.randrange(1, package_count + 1) for _ in range(args.queries)]
+        truck_ids = [rng.randrange(1, truck_count + 1) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        for package_id, query_time in zip(package_ids, times):
+            router.get_package_status_at_time(package_id, query_time)
+        package_seconds = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        for truck_id, query_time in zip(truck_ids, times):
+            router.get_truck_status_at_time(truck_id, query_time)
+        truck_seconds = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        router.package_statuses_at(router.start_time + datetime.timedelta(hours=2))
+        snapshot_seconds = time.perf_counter() - start
+
+        print(f"{truck_count:>7} {package_count:>9} {package_seconds * 1e6:>13.2f} {truck_seconds * 1e6:>11.2f} "
+              f"{snapshot_seconds * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
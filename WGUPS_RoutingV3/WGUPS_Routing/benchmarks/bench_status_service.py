@@ -0,0 +1,113 @@
+# bench_status_service.py - Many dashboards polling the status service at once
+"""
+WGUPS Status Service Benchmark
+
+Starts the asyncio status service in this process on a free port, then
+runs many "dashboard" clients at once. Each client keeps one connection
+open and asks for the fleet, a truck or a package at a random time of
+day, like a supervisor screen refreshing. Reports requests per second and
+latency percentiles, then the same again with If-None-Match, where most
+answers are a bodiless 304.
+
+The plan is computed once before the clients start; no request ever
+re-runs the simulation.
+
+Run from the benchmarks directory:
+    python bench_status_service.py --clients 10 100 300 --requests 50
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from status_query import StatusQuery  # noqa: E402
+from status_service import StatusService  # noqa: E402
+
+
+def random_target(rng):
+    """A fleet/truck/package request at a random minute between 8:00 AM and 1:00 PM."""
+    minutes = rng.randrange(8 * 60, 13 * 60)
+    at = f"{minutes // 60}:{minutes % 60:02d}"
+    kind = rng.random()
+    if kind < 0.2:
+        return f"/fleet?at={at}"
+    if kind < 0.5:
+        return f"/trucks/{rng.randint(1, 3)}?at={at}"
+    return f"/packages/{rng.randint(1, 40)}?at={at}"
+
+
+async def client(port, request_count, seed, conditional, latencies):
+    """One dashboard: a keep-alive connection making request_count requests."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = {}
+    for _ in range(request_count):
+        target = random_target(rng)
+        extra = f"If-None-Match: {etags[target]}\r\n" if conditional and target in etags else ""
+        started = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{extra}\r\n".encode())
+        await writer.drain()
+
+        await reader.readline()  # Status line
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+            elif name.lower() == "etag":
+                etags[target] = value.strip()
+        if length:
+            await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(service, client_count, request_count, conditional):
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, request_count, seed, conditional, latencies)
+                           for seed in range(client_count)))
+    seconds = time.perf_counter() - started
+    server.close()
+    await server.wait_closed()
+    return seconds, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent dashboards against the status service")
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 300], help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        query = StatusQuery.compute()
+
+    print(f"\n{'CLIENTS':>8} {'MODE':>12} {'REQUESTS':>9} {'REQ/SEC':>9} {'P50 (ms)':>9} {'P99 (ms)':>9} "
+          f"{'CACHE HITS':>11}")
+    print("-" * 74)
+    for client_count in args.clients:
+        for conditional in (False, True):
+            service = StatusService(query)
+            seconds, latencies = asyncio.run(run(service, client_count, args.requests, conditional))
+            total = len(latencies)
+            print(f"{client_count:>8} {'etag' if conditional else 'plain':>12} {total:>9} {total / seconds:>9,.0f} "
+                  f"{latencies[total // 2] * 1000:>9.2f} {latencies[int(total * 0.99)] * 1000:>9.2f} "
+                  f"{service.hits / (service.hits + service.misses):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
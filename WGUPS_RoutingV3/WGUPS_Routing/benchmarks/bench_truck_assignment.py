@@ -0,0 +1,82 @@
+# bench_truck_assignment.py - Scaling benchmark for the constraint-driven truck assigner
+"""
+WGUPS Truck Assignment Benchmark
+
+Builds a synthetic manifest with the same kinds of special notes as the
+WGUPS package file (truck restrictions, late flights, co-delivery groups)
+and times TruckAssigner.assign() as the number of packages and trucks grows,
+for cities with different numbers of locations (finding each location's
+nearest neighbors is the part that grows with the city). Trucks hold 16
+packages, and there are enough of them for about 85% of the capacity to
+be used. The city and manifest come from synthetic.py.
+
+Run from the benchmarks directory:
+    python bench_truck_assignment.py --packages 400 4000 16000 --locations 500 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from assignment import TruckAssigner  # noqa: E402
+from constraints import ConstraintSet  # noqa: E402
+from hash_table import deadline_to_minutes  # noqa: E402
+from synthetic import distance_matrix, package_rows  # noqa: E402
+
+TRUCK_CAPACITY = 16
+DEADLINE_MIX = {"9:00 AM": 0.2, "10:30 AM": 0.2}
+CONSTRAINT_MIX = {"truck": 0.02, "delayed": 0.05, "together": 0.03}
+
+
+def synthetic_manifest(package_count, truck_count, addresses):
+    """Packages as (package_id, location, deadline) plus their parsed special notes."""
+    locations = {address: index for index, address in enumerate(addresses)}
+    packages = []
+    constraints = ConstraintSet()
+
+    for row, _, _ in package_rows(package_count, addresses, truck_count, DEADLINE_MIX, CONSTRAINT_MIX, seed=9):
+        packages.append((row[0], locations[row[1]], deadline_to_minutes(row[5])))
+        if row[7]:
+            constraints.add_package(row[0], row[7])
+
+    return packages, constraints
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Truck assignment time as the manifest grows")
+    parser.add_argument("--packages", type=int, nargs="+", default=[400, 4000, 16000],
+                        help="Manifest sizes to try")
+    parser.add_argument("--locations", type=int, nargs="+", default=[500, 2000],
+                        help="Delivery locations in the city (one run per size)")
+    args = parser.parse_args()
+
+    print(f"\n{'LOCATIONS':>9} {'PACKAGES':>9} {'TRUCKS':>7} {'ASSIGNED':>9} {'LEFT OVER':>10} {'TIME (ms)':>10} "
+          f"{'US/PKG':>8}")
+    print("-" * 68)
+
+    for location_count in args.locations:
+        addresses, matrix = distance_matrix(location_count)
+
+        def distance(location1, location2):
+            return matrix[location1][location2]
+
+        for package_count in args.packages:
+            truck_count = int(package_count / (TRUCK_CAPACITY * 0.85)) + 1
+            packages, constraints = synthetic_manifest(package_count, truck_count, addresses)
+            assigner = TruckAssigner(distance, 0, 18, 8 * 60)
+            trucks = [(truck_id, TRUCK_CAPACITY) for truck_id in range(1, truck_count + 1)]
+
+            start = time.perf_counter()
+            loads, unassigned = assigner.assign(trucks, packages, constraints)
+            seconds = time.perf_counter() - start
+
+            assigned = sum(len(load.package_ids) for load in loads)
+            print(f"{location_count:>9} {package_count:>9} {truck_count:>7} {assigned:>9} {len(unassigned):>10} "
+                  f"{seconds * 1000:>10.1f} {seconds / package_count * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
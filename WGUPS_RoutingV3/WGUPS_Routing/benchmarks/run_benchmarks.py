@@ -0,0 +1,347 @@
+# run_benchmarks.py - Time the whole delivery day at several sizes and save the results
+"""
+WGUPS Benchmark Harness
+
+The other benchmarks each time one piece on its own. This one runs the
+real pipeline - the same calls run_delivery_simulation() makes - on the
+WGUPS day and on synthetic cities (see synthetic.py), and times each
+stage separately:
+
+    load      distance table + package manifest (validated, see manifest.py)
+    assign    TruckAssigner: trucks, trips and departure times
+    route     every trip's route (deadline insertion + 2-opt/Or-opt)
+    simulate  the discrete-event day, using the routes from "route"
+    status    StatusQuery lookups: one package, one truck, the whole fleet
+
+Scenarios:
+
+    wgups     the real 40-package day
+    small     25 locations, 40 packages
+    medium    500 locations, 2,000 packages
+    large     2,000 locations, 20,000 packages
+    huge      10,000 locations, 1,000,000 packages (load only - the
+              distance table alone is 400 MB)
+    LxP       any L locations and P packages, like 1000x5000
+
+Each stage's time is the best of --repeat runs. The results are written as
+JSON (the commit, Python version and machine are in it too), and
+--compare checks them against an earlier results file, so a change to
+calculate_route_for_truck() or the HashTable that makes something slower
+shows up as a regression:
+
+    python run_benchmarks.py --output before.json
+    (make the change)
+    python run_benchmarks.py --output after.json --compare before.json
+
+--compare exits with status 1 if any stage got slower by more than
+--threshold, so it can gate a CI job.
+
+Run from the benchmarks directory:
+    python run_benchmarks.py
+    python run_benchmarks.py --scenarios small medium large --metric road --repeat 3
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import synthetic  # noqa: E402
+from clock import SECONDS_PER_MINUTE, seconds_of_day  # noqa: E402
+from fleet import FleetConfig  # noqa: E402
+from main import DeliveryRouter  # noqa: E402
+from simulation import DeliverySimulation  # noqa: E402
+from status_query import StatusQuery  # noqa: E402
+
+RESULTS_FORMAT = "wgups-bench"
+RESULTS_VERSION = 1
+
+STAGES = ("load", "assign", "route", "simulate", "status")
+
+# name -> (locations, packages, stages); None = the real WGUPS files
+SCENARIOS = {
+    "wgups": (None, None, STAGES),
+    "small": (25, 40, STAGES),
+    "medium": (500, 2000, STAGES),
+    "large": (2000, 20000, STAGES),
+    "huge": (10000, 1000000, ("load",)),
+}
+DEFAULT_SCENARIOS = ("wgups", "small", "medium")
+
+# Enough trucks that about 3/4 of the trip capacity is used
+TRUCK_CAPACITY = 16
+FLEET_USE = 0.75
+
+# Stages quicker than this are too noisy to call a regression
+MIN_COMPARE_SECONDS = 0.005
+
+
+def parse_scenario(name):
+    """(locations, packages, stages) for a scenario name or "LxP"."""
+    if name in SCENARIOS:
+        return SCENARIOS[name]
+    locations, _, packages = name.lower().partition("x")
+    if not (locations.isdigit() and packages.isdigit()) or int(locations) < 2 or int(packages) < 1:
+        raise ValueError(f"Unknown scenario {name!r} - use one of {', '.join(SCENARIOS)} or LOCATIONSxPACKAGES")
+    return int(locations), int(packages), STAGES
+
+
+def fleet_size(package_count, max_trips=DeliveryRouter.MAX_TRIPS_PER_TRUCK):
+    """How many trucks (each with a driver) a synthetic manifest gets."""
+    return max(3, math.ceil(package_count / (TRUCK_CAPACITY * max_trips * FLEET_USE)))
+
+
+def build_scenario(name, folder, metric):
+    """
+    Write a scenario's files (nothing to write for wgups).
+
+    Returns:
+        dict: What build_router() needs, plus the scenario's size
+    """
+    locations, packages, stages = parse_scenario(name)
+    if locations is None:
+        return {'scenario': name, 'metric': "wgups", 'locations': 27, 'packages': 40, 'trucks': 3,
+                'stages': stages, 'files': None}
+
+    trucks = fleet_size(packages)
+    distance_file, addresses = synthetic.write_distance_table(folder, locations, metric)
+    package_file, corrections_file, _ = synthetic.write_manifest(folder, packages, addresses, trucks)
+    return {'scenario': name, 'metric': metric, 'locations': locations, 'packages': packages, 'trucks': trucks,
+            'stages': stages, 'files': (distance_file, package_file, corrections_file)}
+
+
+def build_router(scenario):
+    """A fresh router for the scenario."""
+    if scenario['files'] is None:
+        return DeliveryRouter()
+    distance_file, package_file, corrections_file = scenario['files']
+    return DeliveryRouter(distance_file=distance_file, package_file=package_file,
+                          corrections_file=corrections_file, hub_address=synthetic.HUB_ADDRESS,
+                          fleet=FleetConfig.uniform(scenario['trucks']))
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run_stages(scenario, query_count=1000, seed=5):
+    """
+    Run the scenario's stages once on a fresh router.
+
+    Returns:
+        dict: stage -> (seconds, details dict)
+    """
+    router = build_router(scenario)
+    times = {}
+
+    def load():
+        router.distance_manager.load_distance_data(router.distance_file)
+        return router.load_package_data()
+
+    seconds, report = _timed(load)
+    times['load'] = (seconds, {'rows_per_second': round(report.rows_per_second),
+                               'rows_rejected': report.rows_rejected})
+    if 'assign' not in scenario['stages']:
+        return times
+
+    seconds, _ = _timed(router.assign_packages_to_trucks)
+    trips = [(truck, trip, package_ids, departure) for truck in router.trucks
+             for trip, (package_ids, departure) in enumerate(zip(truck.trips, truck.trip_departures))]
+    times['assign'] = (seconds, {'trips': len(trips)})
+
+    def route():
+        hub_index = router.distance_manager.resolve_address(router.hub_address)
+        for truck, trip, package_ids, departure in trips:
+            router.planned_routes[(truck.truck_id, trip)] = (departure, router.calculate_route_for_truck(
+                truck, package_ids, departure, start_index=hub_index))
+
+    seconds, _ = _timed(route)
+    times['route'] = (seconds, {'routes': len(trips)})
+
+    simulation = DeliverySimulation(router, verbose=False)
+    seconds, miles = _timed(simulation.run)
+    router.timeline = simulation.timeline
+    late = sum(1 for delivery_time, deadline_minutes in router.package_table.iter_packages(
+        fields=('delivery_time', 'deadline_minutes'))
+               if delivery_time is None or seconds_of_day(delivery_time) > deadline_minutes * SECONDS_PER_MINUTE)
+    times['simulate'] = (seconds, {'miles': round(miles, 1), 'late': late,
+                                   'events': simulation.events_processed})
+
+    query = StatusQuery(router)
+    rng = random.Random(seed)
+    package_ids = sorted(package_id for package_id, in router.package_table.iter_packages(fields=('package_id',)))
+    truck_ids = [truck.truck_id for truck in router.trucks]
+    moments = [router.start_time + datetime.timedelta(seconds=rng.randrange(0, 9 * 3600)) for _ in range(query_count)]
+    package_seconds, _ = _timed(lambda: [query.package(rng.choice(package_ids), moment) for moment in moments])
+    truck_seconds, _ = _timed(lambda: [query.truck(rng.choice(truck_ids), moment) for moment in moments])
+    fleet_seconds, _ = _timed(lambda: query.fleet(moments[0]))
+    times['status'] = (package_seconds + truck_seconds + fleet_seconds, {
+        'package_us': round(package_seconds / query_count * 1e6, 2),
+        'truck_us': round(truck_seconds / query_count * 1e6, 2),
+        'fleet_ms': round(fleet_seconds * 1000, 2),
+    })
+    return times
+
+
+def _git(*args):
+    """Output of a git command run from here, or None if there's no git."""
+    try:
+        return subprocess.run(["git", *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scenario_names, metric=synthetic.EUCLIDEAN, repeat=1, query_count=1000, data_dir=None):
+    """
+    Run every scenario and collect the results.
+
+    Args:
+        scenario_names (list): Scenario names (see SCENARIOS) or "LxP"
+        metric (str): Distance kind for the synthetic cities
+        repeat (int): Runs per scenario - each stage keeps its best time
+        query_count (int): Package and truck lookups in the status stage
+        data_dir (str): Keep the generated files here (defaults to a temporary folder)
+
+    Returns:
+        dict: The results document (see the module docstring)
+    """
+    status = _git("status", "--porcelain", "--", "..")
+    document = {
+        'format': RESULTS_FORMAT,
+        'version': RESULTS_VERSION,
+        'commit': _git("rev-parse", "--short", "HEAD"),
+        'dirty': bool(status) if status is not None else None,
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'started': datetime.datetime.now().isoformat(timespec='seconds'),
+        'repeat': repeat,
+        'results': [],
+    }
+
+    with contextlib.ExitStack() as stack:
+        folder = data_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(folder, exist_ok=True)
+
+        for name in scenario_names:
+            print(f"{name}: writing data...", end="", flush=True)
+            scenario = build_scenario(name, folder, metric)
+            print(f" {scenario['locations']} locations, {scenario['packages']} packages, "
+                  f"{scenario['trucks']} trucks", flush=True)
+
+            best = {}
+            for _ in range(repeat):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    times = run_stages(scenario, query_count)
+                for stage, (seconds, details) in times.items():
+                    if stage not in best or seconds < best[stage][0]:
+                        best[stage] = (seconds, details)
+
+            for stage in STAGES:
+                if stage not in best:
+                    continue
+                seconds, details = best[stage]
+                document['results'].append(dict({
+                    'scenario': name, 'metric': scenario['metric'], 'locations': scenario['locations'],
+                    'packages': scenario['packages'], 'trucks': scenario['trucks'], 'stage': stage,
+                    'seconds': round(seconds, 6)}, **details))
+                print(f"  {stage:<9} {seconds:>10.4f} s   "
+                      + "  ".join(f"{key}={value}" for key, value in details.items()))
+
+    return document
+
+
+def compare_results(current, baseline, threshold=1.25):
+    """
+    Print each stage's time next to the baseline's.
+
+    Args:
+        current (dict): Results document from this run
+        baseline (dict): An earlier results document
+        threshold (float): Slower than baseline * threshold is a regression
+
+    Returns:
+        list: (scenario, stage, baseline seconds, current seconds) for every regression
+    """
+    def keyed(document):
+        return {(result['scenario'], result['metric'], result['stage']): result['seconds']
+                for result in document['results']}
+
+    before = keyed(baseline)
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} (regression = over {threshold:g}x slower)")
+    print(f"{'SCENARIO':<14} {'STAGE':<9} {'BEFORE (s)':>11} {'NOW (s)':>11} {'RATIO':>7}")
+    print("-" * 56)
+    for key, seconds in keyed(current).items():
+        if key not in before:
+            continue
+        scenario, _, stage = key
+        ratio = seconds / before[key] if before[key] > 0 else float('inf')
+        flag = ""
+        if ratio > threshold and seconds >= MIN_COMPARE_SECONDS:
+            regressions.append((scenario, stage, before[key], seconds))
+            flag = "  ❌ slower"
+        elif ratio < 1 / threshold and before[key] >= MIN_COMPARE_SECONDS:
+            flag = "  ✓ faster"
+        print(f"{scenario:<14} {stage:<9} {before[key]:>11.4f} {seconds:>11.4f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time load/assign/route/simulate/status on synthetic cities")
+    parser.add_argument("--scenarios", nargs="+", default=list(DEFAULT_SCENARIOS),
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} or LOCATIONSxPACKAGES")
+    parser.add_argument("--metric", choices=synthetic.METRICS, default=synthetic.EUCLIDEAN,
+                        help="Distances for the synthetic cities")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario (best time is kept)")
+    parser.add_argument("--queries", type=int, default=1000, help="Package and truck lookups in the status stage")
+    parser.add_argument("--data-dir", help="Keep the generated cities and manifests in this folder")
+    parser.add_argument("--output", help="Results JSON file (default: results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    try:
+        for name in args.scenarios:
+            parse_scenario(name)
+    except ValueError as error:
+        parser.error(str(error))
+
+    document = run_benchmarks(args.scenarios, args.metric, max(1, args.repeat), args.queries, args.data_dir)
+
+    output = args.output
+    if output is None:
+        results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+        os.makedirs(results_dir, exist_ok=True)
+        output = os.path.join(results_dir, f"{document['commit'] or 'results'}{'-dirty' if document['dirty'] else ''}.json")
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('format') != RESULTS_FORMAT:
+            parser.error(f"{args.compare} isn't a benchmark results file")
+        regressions = compare_results(document, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} stage(s) got slower")
+            sys.exit(1)
+        print("✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# synthetic.py - Made-up cities and manifests for the benchmarks
+"""
+WGUPS Synthetic Data
+
+Writes the same files the real day is loaded from, just bigger:
+
+- a distance table for N locations, as a WGUPS-style CSV (bottom-left
+  triangle) or, for big cities, a compiled .wgd file (see distance_file.py)
+- a package CSV in the WGUPS layout, with a mix of deadlines and special
+  notes (truck restrictions, late flights, co-delivery groups, wrong
+  addresses), and optionally a share of broken rows for the loader to reject
+- an address corrections CSV for the wrong addresses
+
+Benchmarks that skip the files get the same data in memory:
+distance_matrix() for the distances, package_rows() for the manifest and
+loaded_router() for a router whose trucks are already loaded.
+
+Every benchmark gets its cities and manifests from here, so they all
+measure the same kind of data.
+
+Two kinds of distances:
+
+    euclidean   straight lines between random points
+    road        city blocks (|dx| + |dy|) times a random detour factor
+                for each pair, so the triangle inequality doesn't always
+                hold - like real streets
+
+Location 0 is the hub. Everything comes from a seeded random generator,
+so the same arguments always write the same files.
+"""
+
+import csv
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from distance_file import write_distance_file  # noqa: E402
+
+EUCLIDEAN = "euclidean"
+ROAD = "road"
+METRICS = (EUCLIDEAN, ROAD)
+
+HUB_ADDRESS = "4001 South 700 East"
+
+# Above this many locations the table is written as a .wgd file - a CSV
+# for 10,000 locations would be 50 million cells
+CSV_LOCATION_LIMIT = 2000
+
+# Share of packages with each deadline (the rest are EOD), like the WGUPS file
+DEADLINE_MIX = {"9:00 AM": 0.025, "10:30 AM": 0.35}
+
+# Share of packages with each kind of special note
+CONSTRAINT_MIX = {"truck": 0.1, "delayed": 0.1, "together": 0.15, "wrong_address": 0.025}
+
+# (column, value) pairs that make a row fail the manifest checks
+BROKEN_CELLS = [(5, "25:00 PM"), (6, "12kg"), (4, "841"), (1, "")]
+
+
+def city_points(location_count, seed=11):
+    """
+    Random points for a city, the hub first.
+
+    The city grows with the number of locations (20 x 20 miles for 500 or
+    fewer) so a truck's stops stay about as far apart as in Salt Lake City.
+    """
+    rng = random.Random(seed)
+    side = 20.0 * max(1.0, math.sqrt(location_count / 500))
+    return [(side / 2, side / 2)] + [(rng.uniform(0, side), rng.uniform(0, side))
+                                     for _ in range(location_count - 1)]
+
+
+def distance_function(points, metric=EUCLIDEAN, seed=11):
+    """
+    get_distance(index1, index2) -> miles (rounded to 0.1 like the WGUPS table).
+
+    The road detour factor is worked out from the pair itself, so the same
+    pair gets the same distance whichever way it's asked for.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (use one of {', '.join(METRICS)})")
+
+    def get_distance(index1, index2):
+        if index1 == index2:
+            return 0.0
+        (x1, y1), (x2, y2) = points[index1], points[index2]
+        if metric == EUCLIDEAN:
+            return round(math.hypot(x1 - x2, y1 - y2), 1)
+        low, high = min(index1, index2), max(index1, index2)
+        # A cheap hash of the pair instead of a random generator per pair (10,000
+        # locations is 50 million pairs)
+        detour = 1.05 + 0.3 * (((high * 2654435761 + low * 40503 + seed) * 2246822519 >> 8) & 0xFFFF) / 0xFFFF
+        return max(0.1, round((abs(x1 - x2) + abs(y1 - y2)) * detour, 1))
+
+    return get_distance
+
+
+def location_addresses(location_count):
+    """Address for every location index - the hub's is the WGUPS hub's."""
+    return [HUB_ADDRESS] + [f"{index} Synthetic Ave" for index in range(1, location_count)]
+
+
+def distance_matrix(location_count, metric=EUCLIDEAN, seed=11):
+    """
+    A synthetic city's addresses and full distance matrix, in memory.
+
+    Returns:
+        tuple: (list of addresses, matrix as a list of lists)
+    """
+    get_distance = distance_function(city_points(location_count, seed), metric, seed)
+    matrix = [[0.0] * location_count for _ in range(location_count)]
+    for i in range(location_count):
+        row = matrix[i]
+        for j in range(i):
+            row[j] = matrix[j][i] = get_distance(i, j)
+    return location_addresses(location_count), matrix
+
+
+def write_distance_table(folder, location_count, metric=EUCLIDEAN, seed=11, compiled=None):
+    """
+    Write a distance table for a synthetic city.
+
+    Args:
+        folder (str): Where to write it
+        location_count (int): Locations, the hub included
+        metric (str): EUCLIDEAN or ROAD
+        seed (int): Random seed for the points (and road detours)
+        compiled (bool): .wgd file (True) or CSV (False) - by default a
+            compiled file only above CSV_LOCATION_LIMIT locations
+
+    Returns:
+        tuple: (file path, list of addresses)
+    """
+    addresses = location_addresses(location_count)
+    get_distance = distance_function(city_points(location_count, seed), metric, seed)
+
+    if compiled is None:
+        compiled = location_count > CSV_LOCATION_LIMIT
+    if compiled:
+        file_path = os.path.join(folder, f"distances_{location_count}_{metric}.wgd")
+        write_distance_file(file_path, addresses, get_distance)
+        return file_path, addresses
+
+    file_path = os.path.join(folder, f"distances_{location_count}_{metric}.csv")
+    with open(file_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow([""] + addresses)
+        for i, address in enumerate(addresses):
+            writer.writerow([address] + [f"{get_distance(i, j):.1f}" for j in range(i + 1)]
+                            + [""] * (location_count - i - 1))
+    return file_path, addresses
+
+
+def package_rows(package_count, addresses, truck_count, deadline_mix=None, constraint_mix=None,
+                 broken_share=0.0, seed=3):
+    """
+    Make a synthetic manifest's rows, one package at a time.
+
+    Co-delivery groups are three packages in a row, with the note on the
+    first, so groups never chain into something too big for one truck.
+    Wrong-address packages are listed at a random location and corrected
+    at 10:20 AM.
+
+    Args:
+        package_count (int): Packages in the manifest
+        addresses (list): The city's addresses (index 0, the hub, is never a delivery)
+        truck_count (int): Trucks in the fleet, for "Can only be on truck N"
+        deadline_mix (dict): Deadline text -> share of packages (defaults to DEADLINE_MIX)
+        constraint_mix (dict): Note kind -> share of packages (defaults to CONSTRAINT_MIX)
+        broken_share (float): Share of rows with one bad cell (see BROKEN_CELLS)
+        seed (int): Random seed
+
+    Yields:
+        tuple: (package row, correction row or None, whether the row is broken) -
+            rows are lists in the WGUPS column order, the weight as an int
+    """
+    rng = random.Random(seed)
+    deadline_mix = DEADLINE_MIX if deadline_mix is None else deadline_mix
+    constraint_mix = CONSTRAINT_MIX if constraint_mix is None else constraint_mix
+
+    def pick(mix):
+        roll = rng.random()
+        for choice, share in mix.items():
+            if roll < share:
+                return choice
+            roll -= share
+        return None
+
+    grouped_until = 0  # Packages up to this ID are already in a co-delivery group
+    for package_id in range(1, package_count + 1):
+        address = addresses[rng.randrange(1, len(addresses))]
+        deadline = pick(deadline_mix) or "EOD"
+
+        kind = pick(constraint_mix) if package_id > grouped_until else None
+        notes = ""
+        correction = None
+        if kind == "truck":
+            notes = f"Can only be on truck {rng.randint(1, truck_count)}"
+        elif kind == "delayed":
+            notes = "Delayed on flight---will not arrive to depot until 9:05 am"
+        elif kind == "together" and package_id + 2 <= package_count:
+            notes = f"Must be delivered with {package_id + 1}, {package_id + 2}"
+            grouped_until = package_id + 2
+        elif kind == "wrong_address":
+            notes = "Wrong address listed"
+            correction = [package_id, "10:20 AM", address, "Salt Lake City", "UT", "84111"]
+            address = addresses[rng.randrange(1, len(addresses))]
+
+        row = [package_id, address, "Salt Lake City", "UT", f"841{rng.randint(0, 99):02d}", deadline,
+               rng.randint(1, 90), notes]
+        # Only roll for broken rows when asked to, so the rest of the manifest stays the same
+        broken = bool(broken_share) and rng.random() < broken_share
+        if broken:
+            column, value = rng.choice(BROKEN_CELLS)
+            row[column] = value
+        yield row, correction, broken
+
+
+def write_manifest(folder, package_count, addresses, truck_count, deadline_mix=None, constraint_mix=None,
+                   broken_share=0.0, seed=3):
+    """
+    Write a package CSV (and its address corrections) for a synthetic city.
+
+    The rows come from package_rows() - see there for the arguments.
+
+    Args:
+        folder (str): Where to write the files
+
+    Returns:
+        tuple: (package CSV path, corrections CSV path, how many rows were written broken)
+    """
+    package_path = os.path.join(folder, f"packages_{package_count}.csv")
+    corrections_path = os.path.join(folder, f"corrections_{package_count}.csv")
+    broken_rows = 0
+    with open(package_path, 'w', newline='', encoding='utf-8') as package_file, \
+            open(corrections_path, 'w', newline='', encoding='utf-8') as corrections_file:
+        packages = csv.writer(package_file)
+        corrections = csv.writer(corrections_file)
+        packages.writerow(["Package ID", "Address", "City", "State", "Zip", "Delivery Deadline", "Weight KILO",
+                           "Special Notes"])
+        corrections.writerow(["Package ID", "Correction Time", "Address", "City", "State", "Zip"])
+
+        for row, correction, broken in package_rows(package_count, addresses, truck_count, deadline_mix,
+                                                    constraint_mix, broken_share, seed):
+            packages.writerow(row)
+            if correction is not None:
+                corrections.writerow(correction)
+            broken_rows += broken
+
+    return package_path, corrections_path, broken_rows
+
+
+def loaded_router(truck_count, location_count=500, metric=EUCLIDEAN, seed=13):
+    """
+    A router on a synthetic city with truck_count trucks already loaded.
+
+    Every truck gets 16 EOD packages to random locations and leaves at the
+    start of the day, with a driver each. The route improvers are off, so
+    benchmarks of the engine, the timeline or plan files don't time 2-opt.
+
+    Returns:
+        DeliveryRouter: Ready for run_delivery_simulation() or DeliverySimulation
+    """
+    from main import DeliveryRouter, Truck  # main imports a lot; only needed for a router
+
+    router = DeliveryRouter(route_improvers=[], driver_count=truck_count)
+    addresses, matrix = distance_matrix(location_count, metric)
+    addresses[0] = router.hub_address
+
+    manager = router.distance_manager
+    manager.addresses = addresses
+    manager.address_to_index = {address: i for i, address in enumerate(addresses)}
+    manager.distance_matrix = matrix
+
+    rng = random.Random(seed)
+    router.trucks = []
+    package_id = 0
+    for truck_id in range(1, truck_count + 1):
+        truck = Truck(truck_id)
+        truck.departure_time = router.start_time
+        for _ in range(truck.capacity):
+            package_id += 1
+            location_index = rng.randrange(1, location_count)
+            router.package_table.insert(package_id, addresses[location_index], "Salt Lake City", "UT",
+                                        "84111", "EOD", 1.0, location_index=location_index)
+            truck.load_package(package_id)
+        router.trucks.append(truck)
+
+    return router
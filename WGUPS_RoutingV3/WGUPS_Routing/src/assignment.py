@@ -0,0 +1,419 @@
+# assignment.py - Constraint-driven truck assignment for WGUPS
+"""
+WGUPS Truck Assignment
+
+Decides which packages go on which truck using the parsed special notes
+(see constraints.py) instead of hand-written package ID lists.
+
+Packages that have to travel together are merged into one "unit" first.
+Units are then placed one at a time, most urgent first, on the truck that
+fits best:
+
+- it has room, both in packages and in weight (if the truck has a weight limit)
+- it's the required truck, if the notes name one
+- its departure still works for every deadline on it: a truck can't leave
+  before its latest package reaches the hub (or, for a wrong address,
+  before the correction comes in), and it can't leave so late
+  that a package's deadline is gone before the truck could even drive there
+- it's already going near this unit's address
+
+"Going near" is found through each location's nearest neighbor locations
+and a location -> trucks index, so a unit only looks at the handful of
+trucks serving its neighborhood plus one empty truck. That keeps the whole
+assignment close to linear in the number of packages, even with hundreds
+of trucks.
+
+A truck can make more than one trip a day, and there can be fewer drivers
+than trucks. Each call to assign() fills one "wave" (one load per truck),
+and dispatch_trips() then decides when each load actually leaves: a load
+needs its truck back at the hub *and* a free driver, and the loads with
+the tightest deadlines get the first drivers.
+"""
+
+import heapq
+import math
+
+from clock import minutes_rounded_up, travel_seconds
+
+# A truck made to wait for a late package costs this many miles per minute
+# of waiting (a truck going 18 mph covers 0.3 miles a minute)
+WAIT_COST_MILES_PER_MINUTE = 0.3
+
+# With more locations than this, nearest neighbors are found through a grid
+# instead of checking every pair
+GRID_MIN_LOCATIONS = 200
+
+# Table distances are rounded to 0.1 miles, so the triangle inequality can
+# be off by about that much - the grid search leaves this much room for it
+ROUNDING_SLACK = 0.2
+
+
+class AssignmentUnit:
+    """One package, or a co-delivery group that has to stay together."""
+
+    __slots__ = ('package_ids', 'locations', 'required_truck', 'ready_minutes', 'latest_departure', 'weight')
+
+    def __init__(self, package_ids, locations, required_truck, ready_minutes, latest_departure, weight=0.0):
+        self.package_ids = package_ids
+        self.locations = locations  # Distinct location indexes
+        self.weight = weight  # Total package weight
+        self.required_truck = required_truck
+        self.ready_minutes = ready_minutes  # Earliest time every package is at the hub with its right address
+        self.latest_departure = latest_departure  # Leave after this and something is late
+
+
+class TruckLoad:
+    """What's been put on one truck for one trip."""
+
+    __slots__ = ('truck_id', 'capacity', 'available', 'max_weight', 'weight', 'package_ids', 'departure',
+                 'latest_departure')
+
+    def __init__(self, truck_id, capacity, available=None, max_weight=None):
+        self.truck_id = truck_id
+        self.capacity = capacity
+        self.available = available  # When the truck is back at the hub (None = from the start)
+        self.max_weight = max_weight  # None = no weight limit
+        self.weight = 0.0
+        self.package_ids = []
+        self.departure = None  # Minutes after midnight, None until something is loaded
+        self.latest_departure = float('inf')
+
+    def room(self):
+        return self.capacity - len(self.package_ids)
+
+
+class TruckAssigner:
+    """
+    Capacitated, constraint-aware assignment of packages to trucks.
+
+    The assigner only needs distances and travel times between location
+    indexes, so it doesn't care how the distance table is stored.
+    """
+
+    def __init__(self, distance, hub_index, speed, start_minutes, neighbor_count=8):
+        """
+        Args:
+            distance (callable): distance(location1, location2) -> miles
+            hub_index (int): Location index of the hub
+            speed (float): Truck speed in mph, for turning miles into minutes
+                (with a mixed fleet, the slowest truck's speed keeps deadlines safe)
+            start_minutes (int): Earliest departure, in minutes after midnight
+            neighbor_count (int): How many nearby locations to check for trucks
+        """
+        self.distance = distance
+        self.hub_index = hub_index
+        self.speed = speed
+        self.start_minutes = start_minutes
+        self.neighbor_count = neighbor_count
+
+    def _minutes_from_hub(self, location):
+        # Rounded up, so a latest departure worked out from it is never too late
+        return minutes_rounded_up(travel_seconds(self.distance(self.hub_index, location), self.speed))
+
+    def build_units(self, packages, constraints):
+        """
+        Merge co-delivery groups and work out each unit's time window.
+
+        Args:
+            packages (list): (package_id, location_index, deadline_minutes) tuples,
+                optionally with the package weight as a 4th item
+            constraints (ConstraintSet): Parsed special notes
+
+        Returns:
+            list: AssignmentUnit objects
+        """
+        grouped = {}
+        for package in packages:
+            grouped.setdefault(constraints.group_root(package[0]), []).append(package)
+
+        units = []
+        for members in grouped.values():
+            package_ids = sorted(package[0] for package in members)
+
+            required = {constraints.required_truck(package_id) for package_id in package_ids} - {None}
+            if len(required) > 1:
+                raise ValueError(f"Packages {package_ids} must go together but are restricted "
+                                 f"to different trucks {sorted(required)}")
+
+            ready = self.start_minutes
+            latest = float('inf')
+            weight = 0.0
+            for package in members:
+                package_id, location, deadline = package[:3]
+                available = constraints.available_minutes(package_id)
+                if available is not None:
+                    ready = max(ready, available)
+                # A wrong address can't be driven to until its correction comes in
+                correction = constraints.correction_for(package_id)
+                if correction is not None:
+                    ready = max(ready, correction.minutes)
+                latest = min(latest, deadline - self._minutes_from_hub(location))
+                if len(package) > 3:
+                    weight += package[3]
+
+            locations = sorted({package[1] for package in members})
+            units.append(AssignmentUnit(package_ids, locations, required.pop() if required else None,
+                                        ready, latest, weight))
+        return units
+
+    def _neighbor_locations(self, locations):
+        """
+        For every location, its closest other locations.
+
+        Checking every pair is O(L^2) distance lookups, which was most of the
+        assignment time for a big city. Instead every location gets two
+        "coordinates": its distance from the hub and from the location
+        furthest from the hub. Two locations can't be closer together than
+        the gap in either coordinate (triangle inequality), so the locations
+        are put in a grid on those coordinates and each one only looks at
+        the cells around it, ring by ring, until no cell further out could
+        hold anything closer than what it already has.
+
+        On a real street table the triangle inequality doesn't always hold,
+        so there a few of the neighbors found may not be the very closest -
+        which is fine for finding trucks that are "going near".
+        """
+        count = self.neighbor_count
+        if len(locations) <= GRID_MIN_LOCATIONS:
+            # Small enough that a grid isn't worth building
+            neighbors = {}
+            for location in locations:
+                others = (other for other in locations if other != location)
+                neighbors[location] = heapq.nsmallest(count, others, key=lambda other: self.distance(location, other))
+            return neighbors
+
+        from_hub = {location: self.distance(self.hub_index, location) for location in locations}
+        pivot = max(locations, key=from_hub.get)
+        from_pivot = {location: self.distance(pivot, location) for location in locations}
+
+        # Cells sized so each one holds about neighbor_count locations
+        low_hub, low_pivot = min(from_hub.values()), min(from_pivot.values())
+        width, height = max(from_hub.values()) - low_hub, max(from_pivot.values()) - low_pivot
+        cell = math.sqrt(width * height * count / len(locations)) or max(width, height) or 1.0
+
+        grid = {}
+        for location in locations:
+            key = (int((from_hub[location] - low_hub) / cell), int((from_pivot[location] - low_pivot) / cell))
+            grid.setdefault(key, []).append(location)
+        max_ring = int(max(width, height) / cell) + 1
+
+        neighbors = {}
+        for location in locations:
+            column = int((from_hub[location] - low_hub) / cell)
+            row = int((from_pivot[location] - low_pivot) / cell)
+            hub_gap, pivot_gap = from_hub[location], from_pivot[location]
+            found = []  # (distance, location)
+            limit = float('inf')  # Distance of the furthest neighbor kept so far
+            for ring in range(max_ring + 1):
+                for key in _ring_cells(column, row, ring):
+                    for other in grid.get(key, ()):
+                        # Skip the lookup when the coordinates already show it's too far
+                        if other != location and abs(from_hub[other] - hub_gap) <= limit \
+                                and abs(from_pivot[other] - pivot_gap) <= limit:
+                            found.append((self.distance(location, other), other))
+                if len(found) >= count:
+                    found = heapq.nsmallest(count, found)
+                    limit = found[-1][0] + ROUNDING_SLACK
+                    # Anything in the next ring out is at least ring whole cells away
+                    if limit <= ring * cell:
+                        break
+            neighbors[location] = [other for _, other in heapq.nsmallest(count, found)]
+        return neighbors
+
+    def _fits(self, load, unit, check_deadlines=True):
+        """Can this unit go on this truck? Returns the new departure time or None."""
+        if load.room() < len(unit.package_ids):
+            return None
+        if load.max_weight is not None and load.weight + unit.weight > load.max_weight:
+            return None
+        if unit.required_truck is not None and unit.required_truck != load.truck_id:
+            return None
+
+        if load.departure is not None:
+            departure = max(load.departure, unit.ready_minutes)
+        elif load.available is not None:
+            departure = max(load.available, unit.ready_minutes)
+        else:
+            departure = unit.ready_minutes
+        if check_deadlines and departure > min(load.latest_departure, unit.latest_departure):
+            return None
+        return departure
+
+    def assign(self, trucks, packages, constraints, fleet_truck_ids=None):
+        """
+        Work out which packages go on which truck (one load per truck).
+
+        Args:
+            trucks (list): (truck_id, capacity) pairs, optionally followed by
+                available_minutes (the truck is out until then) and max_weight
+            packages (list): (package_id, location_index, deadline_minutes) tuples,
+                optionally with the package weight as a 4th item
+            constraints (ConstraintSet): Parsed special notes
+            fleet_truck_ids (iterable): Every truck in the fleet, when trucks is
+                only the ones going out this wave - packages for a fleet truck
+                that isn't in trucks just come back unassigned (defaults to trucks)
+
+        Returns:
+            tuple: (list of TruckLoad in the same order as trucks, with sorted
+                    package IDs and departure minutes (None for an empty truck),
+                    list of package IDs that didn't fit on any truck)
+
+        Raises:
+            ValueError: If packages need a truck that isn't in the fleet at all
+        """
+        loads = {truck[0]: TruckLoad(*truck) for truck in trucks}
+        truck_order = [truck[0] for truck in trucks]
+        fleet = set(loads) if fleet_truck_ids is None else set(fleet_truck_ids)
+        unassigned = []
+
+        units = []
+        for unit in self.build_units(packages, constraints):
+            if unit.required_truck is not None and unit.required_truck not in loads:
+                if unit.required_truck not in fleet:
+                    raise ValueError(f"Packages {unit.package_ids} need truck {unit.required_truck}, "
+                                     f"which doesn't exist")
+                # Their truck isn't going out this time - they wait for it
+                unassigned.extend(unit.package_ids)
+                continue
+            units.append(unit)
+
+        # Restricted units first (they have no choice), then the tightest deadlines
+        units.sort(key=lambda unit: (unit.required_truck is None, unit.latest_departure,
+                                     -unit.ready_minutes, unit.package_ids[0]))
+
+        neighbors = self._neighbor_locations(sorted({package[1] for package in packages}))
+        trucks_at = {}  # location -> trucks already stopping there
+        next_empty = 0  # Trucks only ever fill up, so empty ones are all past this point
+
+        for unit in units:
+            # Trucks already near this unit, and how far away they are
+            nearby = {}
+            for location in unit.locations:
+                for truck_id in trucks_at.get(location, ()):
+                    nearby[truck_id] = 0.0
+                for neighbor in neighbors[location]:
+                    gap = self.distance(location, neighbor)
+                    for truck_id in trucks_at.get(neighbor, ()):
+                        if gap < nearby.get(truck_id, float('inf')):
+                            nearby[truck_id] = gap
+
+            # Opening an empty truck costs the drive out from the hub
+            while next_empty < len(truck_order) and loads[truck_order[next_empty]].package_ids:
+                next_empty += 1
+            empty = truck_order[next_empty] if next_empty < len(truck_order) else None
+            if empty is not None and empty not in nearby:
+                nearby[empty] = min(self.distance(self.hub_index, location) for location in unit.locations)
+            if unit.required_truck is not None:
+                candidates = {unit.required_truck: nearby.get(unit.required_truck, 0.0)}
+            else:
+                candidates = nearby
+
+            best = self._best_truck(loads, unit, candidates)
+            if best is None:
+                # Nothing nearby works - fall back to every truck with room
+                best = self._best_truck(loads, unit, dict.fromkeys(truck_order, 0.0))
+            if best is None:
+                # No truck can make the deadline - late is still better than not at all
+                best = self._best_truck(loads, unit, dict.fromkeys(truck_order, 0.0), check_deadlines=False)
+            if best is None:
+                unassigned.extend(unit.package_ids)
+                continue
+
+            truck_id, departure = best
+            load = loads[truck_id]
+            load.package_ids.extend(unit.package_ids)
+            load.weight += unit.weight
+            load.departure = departure
+            load.latest_departure = min(load.latest_departure, unit.latest_departure)
+            for location in unit.locations:
+                trucks_at.setdefault(location, set()).add(truck_id)
+
+        for load in loads.values():
+            load.package_ids.sort()
+        return [loads[truck_id] for truck_id in truck_order], sorted(unassigned)
+
+    def _best_truck(self, loads, unit, candidates, check_deadlines=True):
+        """
+        Pick the cheapest truck the unit fits on.
+
+        Cost is the distance to the truck's nearest stop plus the waiting a
+        late unit would force on a truck that could have left earlier.
+
+        Returns:
+            tuple: (truck_id, new departure minutes), or None if nothing fits
+        """
+        best = None
+        best_cost = None
+        for truck_id, gap in candidates.items():
+            load = loads[truck_id]
+            departure = self._fits(load, unit, check_deadlines)
+            if departure is None:
+                continue
+
+            wait = 0 if load.departure is None else departure - load.departure
+            cost = (gap + wait * WAIT_COST_MILES_PER_MINUTE, truck_id)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = (truck_id, departure), cost
+        return best
+
+
+def _ring_cells(column, row, ring):
+    """The grid cells exactly ring cells away from (column, row) (ring 0 is the cell itself)."""
+    if ring == 0:
+        yield column, row
+        return
+    for offset in range(-ring, ring + 1):
+        yield column + offset, row - ring
+        yield column + offset, row + ring
+    for offset in range(-ring + 1, ring):
+        yield column - ring, row + offset
+        yield column + ring, row + offset
+
+
+class Trip:
+    """One load going out on one truck, and when it leaves and gets back."""
+
+    __slots__ = ('truck_id', 'package_ids', 'departure', 'return_minutes', 'late')
+
+    def __init__(self, truck_id, package_ids, departure, return_minutes, late):
+        self.truck_id = truck_id
+        self.package_ids = package_ids
+        self.departure = departure  # Minutes after midnight
+        self.return_minutes = return_minutes  # Back at the hub
+        self.late = late  # Packages the planned route delivers after their deadline
+
+
+def dispatch_trips(loads, driver_free, truck_free, plan_trip):
+    """
+    Decide when each load leaves, given how many drivers there are.
+
+    Loads go out tightest deadline first. Each one takes whichever driver
+    is free soonest and leaves once it has that driver, its truck is back
+    at the hub, and its packages are ready. plan_trip() routes the load
+    for that departure, which says when the driver and truck are free again.
+
+    Args:
+        loads (list): TruckLoad objects from assign() (empty ones are skipped)
+        driver_free (list): Heap of minutes each driver is free (updated in place)
+        truck_free (dict): truck_id -> minutes the truck is at the hub (updated in place)
+        plan_trip (callable): plan_trip(truck_id, package_ids, departure) ->
+            (return_minutes, late_count)
+
+    Returns:
+        list: Trip objects in the order they leave
+    """
+    trips = []
+    ordered = sorted((load for load in loads if load.package_ids),
+                     key=lambda load: (load.latest_departure, load.departure, load.truck_id))
+
+    for load in ordered:
+        driver_ready = heapq.heappop(driver_free)
+        departure = max(load.departure, driver_ready, truck_free.get(load.truck_id, 0))
+        return_minutes, late = plan_trip(load.truck_id, load.package_ids, departure)
+
+        heapq.heappush(driver_free, return_minutes)
+        truck_free[load.truck_id] = return_minutes
+        trips.append(Trip(load.truck_id, load.package_ids, departure, return_minutes, late))
+
+    trips.sort(key=lambda trip: (trip.departure, trip.truck_id))
+    return trips
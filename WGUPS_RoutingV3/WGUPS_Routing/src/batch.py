@@ -0,0 +1,291 @@
+# batch.py - Plan the delivery day for many cities at once
+"""
+WGUPS Batch Runner
+
+The same program has to work for every hub, not just Salt Lake City. This
+runs the whole delivery day (load, assign, route, simulate) for a directory
+of cities, one worker process per city at a time, and writes each city's
+results to its own output folder.
+
+Each city is a folder with a city.json in it:
+
+    cities/
+        salt_lake_city/
+            city.json
+            packages.csv
+            distances.csv            (or a compiled .wgd table)
+            address_corrections.csv  (optional)
+
+city.json says where the hub is and what the fleet looks like. File names
+are relative to the city folder, and everything but "hub" has a default:
+
+    {
+        "name": "Salt Lake City",
+        "hub": "4001 South 700 East",
+        "fleet": "fleet.json",
+        "packages": "packages.csv",
+        "distances": "distances.csv",
+        "address_corrections": "address_corrections.csv"
+    }
+
+"fleet" is a fleet file (see fleet.py) or the same settings written right
+into city.json. Without one the city gets the WGUPS fleet. The day starts
+when the fleet's shift does, unless "start_time" says otherwise.
+
+For every city the output folder gets:
+
+    deliveries.csv   one row per package: truck, trip, departure, delivery time, on time
+    summary.json     miles per truck, on-time counts, how long planning took
+    plan.jsonl       the whole computed day (see plan_file.py), for
+                     status_query.py --plan and audits
+    log.txt          everything the planner printed
+
+and batch_summary.csv in the output root has one line per city. A city
+that fails (bad file, missing hub...) is reported there with its error
+and doesn't stop the others.
+
+Usage (from the src directory):
+    python batch.py ../data/cities ../output --workers 4
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from clock import SECONDS_PER_MINUTE, seconds_of_day
+from fleet import FleetConfig, load_fleet_config
+from hash_table import deadline_to_minutes
+from main import DeliveryRouter
+from plan_file import save_plan
+from simulation import DeliverySimulation
+
+CITY_CONFIG_FILE = "city.json"
+
+# Used when city.json leaves something out
+CITY_DEFAULTS = {
+    "fleet": DeliveryRouter.FLEET_FILE,
+    "packages": "packages.csv",
+    "distances": "distances.csv",
+    "address_corrections": "address_corrections.csv",
+}
+
+
+def find_cities(cities_dir):
+    """
+    Every folder in cities_dir that has a city.json.
+
+    Args:
+        cities_dir (str): Directory holding one folder per city
+
+    Returns:
+        list: Paths to the city folders, sorted by name
+    """
+    cities = []
+    for name in sorted(os.listdir(cities_dir)):
+        city_dir = os.path.join(cities_dir, name)
+        if os.path.isfile(os.path.join(city_dir, CITY_CONFIG_FILE)):
+            cities.append(city_dir)
+    return cities
+
+
+def load_city_config(city_dir):
+    """
+    Read a city's city.json, fill in the defaults and resolve file paths.
+
+    Args:
+        city_dir (str): The city's folder
+
+    Returns:
+        dict: The city settings
+    """
+    with open(os.path.join(city_dir, CITY_CONFIG_FILE), 'r', encoding='utf-8') as file:
+        config = dict(CITY_DEFAULTS, **json.load(file))
+
+    if not config.get("hub"):
+        raise ValueError(f"{city_dir}/{CITY_CONFIG_FILE} doesn't say where the hub is")
+
+    config.setdefault("name", os.path.basename(os.path.normpath(city_dir)))
+    for key in ("packages", "distances", "address_corrections"):
+        config[key] = os.path.join(city_dir, config[key])
+    if isinstance(config["fleet"], str):
+        config["fleet"] = os.path.join(city_dir, config["fleet"])
+    return config
+
+
+def build_router(config):
+    """
+    Set up a DeliveryRouter for one city.
+
+    Args:
+        config (dict): Settings from load_city_config()
+
+    Returns:
+        DeliveryRouter: Ready for run_delivery_simulation()
+    """
+    if isinstance(config["fleet"], dict):
+        fleet = FleetConfig.from_dict(config["fleet"])
+    else:
+        fleet = load_fleet_config(config["fleet"])
+
+    start_time = None
+    if config.get("start_time"):
+        start_time = datetime.datetime(2024, 1, 1) + datetime.timedelta(
+            minutes=deadline_to_minutes(config["start_time"]))
+
+    return DeliveryRouter(distance_file=config["distances"],
+                          package_file=config["packages"],
+                          corrections_file=config["address_corrections"],
+                          hub_address=config["hub"],
+                          fleet=fleet,
+                          start_time=start_time)
+
+
+def _write_deliveries(router, file_path):
+    """One CSV row per package with how its day went."""
+    with open(file_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Package ID", "Truck", "Trip", "Departure", "Delivered", "Deadline", "On Time"])
+
+        for package_id, deadline, deadline_minutes, delivery_time in sorted(router.package_table.iter_packages(
+                fields=('package_id', 'delivery_deadline', 'deadline_minutes', 'delivery_time'))):
+            planned = router.package_trips.get(package_id)
+            truck_id, trip = (planned[0].truck_id, planned[1] + 1) if planned else ("", "")
+            departure = router.package_departure(package_id)
+            on_time = (delivery_time is not None
+                       and seconds_of_day(delivery_time) <= deadline_minutes * SECONDS_PER_MINUTE)
+
+            writer.writerow([package_id, truck_id, trip,
+                             departure.strftime('%I:%M %p') if departure else "",
+                             delivery_time.strftime('%I:%M %p') if delivery_time else "",
+                             deadline, "yes" if on_time else "no"])
+
+
+def plan_city(city_dir, output_dir):
+    """
+    Plan and simulate one city's day and write its results.
+
+    This runs in a worker process. Anything that goes wrong is caught and
+    reported in the summary so one bad city can't take the batch down.
+
+    Args:
+        city_dir (str): The city's folder
+        output_dir (str): Root output folder (the city gets a folder in it)
+
+    Returns:
+        dict: The city's summary (also written to summary.json)
+    """
+    started = time.perf_counter()
+    city_name = os.path.basename(os.path.normpath(city_dir))
+    city_output = os.path.join(output_dir, city_name)
+    os.makedirs(city_output, exist_ok=True)
+    summary = {"city": city_name}
+
+    with open(os.path.join(city_output, "log.txt"), 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log):
+        try:
+            config = load_city_config(city_dir)
+            router = build_router(config)
+            summary["name"] = config["name"]
+
+            router.distance_manager.load_distance_data(router.distance_file)
+            router.load_package_data()
+            router.assign_packages_to_trucks()
+            simulation = DeliverySimulation(router)
+            total_miles = simulation.run()
+            router.timeline = simulation.timeline
+
+            _write_deliveries(router, os.path.join(city_output, "deliveries.csv"))
+
+            late = 0
+            delivered = 0
+            for delivery_time, deadline_minutes in router.package_table.iter_packages(
+                    fields=('delivery_time', 'deadline_minutes')):
+                if delivery_time is not None:
+                    delivered += 1
+                    if seconds_of_day(delivery_time) > deadline_minutes * SECONDS_PER_MINUTE:
+                        late += 1
+
+            summary.update({
+                "packages": router.package_table.size,
+                "delivered": delivered,
+                "late": late,
+                "total_miles": round(total_miles, 1),
+                "trucks": [{"truck_id": truck.truck_id,
+                            "miles": round(truck.mileage, 1),
+                            "departures": [departure.strftime('%I:%M %p')
+                                           for departure in truck.trip_departures]}
+                           for truck in router.trucks],
+                "events": simulation.events_processed,
+            })
+            save_plan(router, os.path.join(city_output, "plan.jsonl"))
+        except Exception as error:
+            summary["error"] = f"{type(error).__name__}: {error}"
+            print(f"❌ {summary['error']}")
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    with open(os.path.join(city_output, "summary.json"), 'w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+def run_batch(cities_dir, output_dir, workers=None):
+    """
+    Plan every city in cities_dir, several at a time.
+
+    Args:
+        cities_dir (str): Directory holding one folder per city
+        output_dir (str): Where to write the results
+        workers (int): How many cities to plan at once (defaults to the CPU count)
+
+    Returns:
+        list: Each city's summary, in city name order
+    """
+    cities = find_cities(cities_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    print(f"Planning {len(cities)} cities on {workers} worker processes...")
+
+    started = time.perf_counter()
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(plan_city, city_dir, output_dir) for city_dir in cities]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            if "error" in summary:
+                print(f"❌ {summary['city']}: {summary['error']}")
+            else:
+                print(f"✓ {summary['city']}: {summary['delivered']}/{summary['packages']} delivered, "
+                      f"{summary['late']} late, {summary['total_miles']:.1f} miles ({summary['seconds']:.2f} s)")
+
+    summaries.sort(key=lambda summary: summary["city"])
+    with open(os.path.join(output_dir, "batch_summary.csv"), 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["City", "Packages", "Delivered", "Late", "Total Miles", "Seconds", "Error"])
+        for summary in summaries:
+            writer.writerow([summary["city"], summary.get("packages", ""), summary.get("delivered", ""),
+                             summary.get("late", ""), summary.get("total_miles", ""), summary["seconds"],
+                             summary.get("error", "")])
+
+    print(f"Finished {len(cities)} cities in {time.perf_counter() - started:.2f} s - "
+          f"results in {output_dir}")
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan the delivery day for a directory of cities")
+    parser.add_argument("cities_dir", help="Directory with one folder (and city.json) per city")
+    parser.add_argument("output_dir", help="Where to write each city's results")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Cities to plan at once (default: number of CPU cores)")
+    args = parser.parse_args()
+    run_batch(args.cities_dir, args.output_dir, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# clock.py - Time-of-day arithmetic for the delivery day
+"""
+WGUPS Clock
+
+The simulation and the route planner keep time as whole seconds after
+midnight. Each leg's driving time is distance / speed rounded to the
+nearest second, so a route's times match the miles to within half a
+second per stop, instead of losing up to a minute on every leg the way
+whole-minute truncation did. Adding ints is also cheaper than building
+timedelta/datetime objects in the event loop.
+
+datetimes only come back at the edges: the package table, the truck
+attributes the supervisor views read, and anything printed.
+"""
+
+import datetime
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+
+
+def travel_seconds(distance, speed):
+    """
+    How long a leg takes to drive.
+
+    Args:
+        distance (float): Miles
+        speed (float): mph
+
+    Returns:
+        int: Seconds, rounded to the nearest one
+    """
+    return int(distance * SECONDS_PER_HOUR / speed + 0.5)
+
+
+def seconds_of_day(moment):
+    """A datetime -> seconds after its midnight."""
+    return moment.hour * SECONDS_PER_HOUR + moment.minute * SECONDS_PER_MINUTE + moment.second
+
+
+def at_seconds(day, seconds):
+    """
+    Seconds after midnight -> a datetime on the given day.
+
+    Args:
+        day (datetime): Any moment on the delivery day
+        seconds (int): Seconds after that day's midnight
+
+    Returns:
+        datetime: The moment
+    """
+    return day.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(seconds=seconds)
+
+
+def minutes_rounded_up(seconds):
+    """Seconds -> whole minutes, rounding up (a trip back at 9:35:20 can't go out again before 9:36)."""
+    return -(-seconds // SECONDS_PER_MINUTE)
@@ -0,0 +1,259 @@
+# constraints.py - Special-notes parsing for WGUPS packages
+"""
+WGUPS Package Constraints
+
+The package file has a free-text "Special Notes" column. Instead of copying
+package IDs out of it by hand, this module reads the notes and turns them
+into constraints the truck assigner and the simulation can use:
+
+- "Can only be on truck 2"                    -> required truck
+- "Delayed on flight---will not arrive to
+   depot until 9:05 am"                       -> available at the hub from 9:05
+- "Must be delivered with 15, 19"             -> co-delivery group
+- "Wrong address listed"                      -> waits for an address correction
+
+Co-delivery notes chain together (14 goes with 15 and 19, 16 goes with 13
+and 19, ...), so the groups are built with a union-find: every note joins
+the packages it mentions, and whatever ends up connected has to ride on the
+same truck.
+
+Address corrections (when the right address becomes known, and what it is)
+aren't in the package file, so they're loaded from their own small CSV.
+"""
+
+import csv
+import re
+
+from hash_table import deadline_to_minutes
+
+TRUCK_PATTERN = re.compile(r"can only be on truck\s+(\d+)", re.IGNORECASE)
+DELAYED_PATTERN = re.compile(r"delayed.*?until\s+(\d{1,2}:\d{2}\s*[ap]\.?m\.?)", re.IGNORECASE)
+DELIVERED_WITH_PATTERN = re.compile(r"must be delivered with\s+([\d,\s]+(?:and\s+\d+)?)", re.IGNORECASE)
+WRONG_ADDRESS_PATTERN = re.compile(r"wrong address(?:\s+listed)?", re.IGNORECASE)
+
+
+class PackageConstraints:
+    """What one package's special notes say about it."""
+
+    __slots__ = ('package_id', 'required_truck', 'available_minutes', 'delivered_with',
+                 'wrong_address', 'unrecognized')
+
+    def __init__(self, package_id):
+        self.package_id = package_id
+        self.required_truck = None  # Truck ID it has to go on, if any
+        self.available_minutes = None  # When it reaches the hub, if it's late
+        self.delivered_with = []  # Other packages it has to ride with
+        self.wrong_address = False  # Its listed address is wrong until corrected
+        self.unrecognized = ""  # Any note text I couldn't make sense of
+
+
+class AddressCorrection:
+    """A package's real address, and the time WGUPS finds out about it."""
+
+    __slots__ = ('package_id', 'minutes', 'address', 'city', 'state', 'zip', 'original_address')
+
+    def __init__(self, package_id, minutes, address, city, state, zip_code):
+        self.package_id = package_id
+        self.minutes = minutes  # Minutes after midnight when the correction comes in
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip = zip_code
+        self.original_address = None  # The wrong address, saved when the correction is applied
+
+
+def _clock_to_minutes(text):
+    """'9:05 am' or '9:05am' -> minutes after midnight."""
+    text = text.replace(".", "").upper()
+    if not text.endswith(" AM") and not text.endswith(" PM"):
+        text = text[:-2] + " " + text[-2:]
+    return deadline_to_minutes(text)
+
+
+def parse_special_notes(package_id, notes):
+    """
+    Read one package's special notes.
+
+    Args:
+        package_id (int): The package the notes belong to
+        notes (str): The "Special Notes" text (can be empty)
+
+    Returns:
+        PackageConstraints: What the notes require
+    """
+    constraints = PackageConstraints(package_id)
+    remaining = notes or ""
+
+    match = TRUCK_PATTERN.search(remaining)
+    if match:
+        constraints.required_truck = int(match.group(1))
+        remaining = remaining.replace(match.group(0), "")
+
+    match = DELAYED_PATTERN.search(remaining)
+    if match:
+        constraints.available_minutes = _clock_to_minutes(match.group(1).strip())
+        remaining = remaining.replace(match.group(0), "")
+
+    match = DELIVERED_WITH_PATTERN.search(remaining)
+    if match:
+        constraints.delivered_with = [int(number) for number in re.findall(r"\d+", match.group(1))]
+        remaining = remaining.replace(match.group(0), "")
+
+    match = WRONG_ADDRESS_PATTERN.search(remaining)
+    if match:
+        constraints.wrong_address = True
+        remaining = remaining.replace(match.group(0), "")
+
+    constraints.unrecognized = remaining.strip(" ,.;-")
+    return constraints
+
+
+def load_address_corrections(file_path):
+    """
+    Read the address corrections file.
+
+    Each row is: package ID, time the correction comes in, address, city,
+    state, zip. A missing file just means there are no corrections.
+
+    Args:
+        file_path (str): Path to the corrections CSV
+
+    Returns:
+        list: AddressCorrection objects
+    """
+    corrections = []
+    try:
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.reader(file):
+                if len(row) >= 6 and row[0].strip().isdigit():
+                    corrections.append(AddressCorrection(
+                        int(row[0].strip()), deadline_to_minutes(row[1]), row[2].strip(),
+                        row[3].strip(), row[4].strip(), row[5].strip()))
+    except FileNotFoundError:
+        pass
+    return corrections
+
+
+class UnionFind:
+    """
+    Disjoint sets over package IDs.
+
+    find() uses path halving and union() links the smaller set under the
+    bigger one, so both are effectively constant time.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        self.add(item)
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, item1, item2):
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return root1
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        return root1
+
+    def groups(self):
+        """Every set with more than one member, as lists of sorted IDs."""
+        members = {}
+        for item in self.parent:
+            members.setdefault(self.find(item), []).append(item)
+        return sorted(sorted(group) for group in members.values() if len(group) > 1)
+
+
+class ConstraintSet:
+    """
+    All the constraints for one manifest.
+
+    Packages without special notes aren't stored at all, so every lookup
+    has a sensible default (no truck restriction, at the hub from the
+    start, delivered on its own).
+    """
+
+    def __init__(self):
+        self.packages = {}  # package_id -> PackageConstraints
+        self.linked = UnionFind()
+        self.corrections = {}  # package_id -> AddressCorrection
+
+    def add_package(self, package_id, notes):
+        """Parse one package's notes and remember whatever they require."""
+        constraints = parse_special_notes(package_id, notes)
+        if (constraints.required_truck is None and constraints.available_minutes is None
+                and not constraints.delivered_with and not constraints.wrong_address
+                and not constraints.unrecognized):
+            return
+
+        self.packages[package_id] = constraints
+        for other_id in constraints.delivered_with:
+            self.linked.union(package_id, other_id)
+
+    def add_correction(self, correction):
+        self.corrections[correction.package_id] = correction
+
+    def required_truck(self, package_id):
+        constraints = self.packages.get(package_id)
+        return constraints.required_truck if constraints else None
+
+    def available_minutes(self, package_id):
+        """When the package is at the hub (None if it's there from the start)."""
+        constraints = self.packages.get(package_id)
+        return constraints.available_minutes if constraints else None
+
+    def set_available_minutes(self, package_id, minutes):
+        """Change when a package reaches the hub (None = it's there from the start)."""
+        constraints = self.packages.get(package_id)
+        if constraints is None:
+            if minutes is None:
+                return
+            constraints = self.packages[package_id] = PackageConstraints(package_id)
+        constraints.available_minutes = minutes
+
+    def group_root(self, package_id):
+        """An ID shared by every package in the same co-delivery group."""
+        if package_id not in self.linked.parent:
+            return package_id
+        return self.linked.find(package_id)
+
+    def co_delivery_groups(self):
+        """Lists of package IDs that have to go out on the same truck."""
+        return self.linked.groups()
+
+    def correction_for(self, package_id):
+        """The pending address correction for a package, or None."""
+        return self.corrections.get(package_id)
+
+    def delayed_packages(self):
+        """Package IDs that arrive at the hub late, in ID order."""
+        return sorted(package_id for package_id, constraints in self.packages.items()
+                      if constraints.available_minutes is not None)
+
+    def report(self):
+        """Print a summary of what the notes turned into."""
+        restricted = sorted(package_id for package_id, constraints in self.packages.items()
+                            if constraints.required_truck is not None)
+        print(f"Special notes: {len(restricted)} truck restrictions, "
+              f"{len(self.delayed_packages())} delayed, "
+              f"{len(self.co_delivery_groups())} co-delivery groups, "
+              f"{len(self.corrections)} address corrections")
+
+        for package_id, constraints in sorted(self.packages.items()):
+            if constraints.wrong_address and package_id not in self.corrections:
+                print(f"  ⚠️  Package {package_id} has a wrong address but no correction on file")
+            if constraints.unrecognized:
+                print(f"  ⚠️  Package {package_id}: couldn't read note '{constraints.unrecognized}'")
@@ -0,0 +1,234 @@
+# distance_file.py - Compiled binary distance table for WGUPS
+"""
+WGUPS Compiled Distance Table
+
+Parsing the distance CSV means float-converting every cell and rebuilding
+the symmetric matrix on every run. For a city with thousands of delivery
+points that is millions of cells. This module compiles the CSV once into a
+compact binary file that DistanceManager can memory-map and read in place,
+so startup time no longer depends on how big the matrix is.
+
+File layout (all numbers little-endian):
+
+    header          32 bytes - see HEADER below
+    address table   for each address: 2-byte length + UTF-8 bytes
+    padding         up to the next 8-byte boundary
+    distances       float64 values, packed triangle including the diagonal
+
+The distances are stored row by row for the bottom-left triangle, which is
+the same thing as the top-right triangle stored column by column:
+distance(i, j) with i >= j lives at position i * (i + 1) // 2 + j. The
+file has to end right after the last distance, so a truncated copy is
+refused when it's opened instead of giving wrong distances later.
+
+Usage (from the src directory):
+    python distance_file.py ../data/WGUPS_Distance_Table.csv ../data/WGUPS_Distance_Table.wgd
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b"WGUPSDST"
+VERSION = 1
+
+# magic, version, bytes per distance, address count, address table offset, distances offset
+HEADER = struct.Struct("<8sHHIQQ")
+ADDRESS_LENGTH = struct.Struct("<H")
+
+
+def packed_index(index1, index2):
+    """Position of distance(index1, index2) in the packed triangle."""
+    if index1 < index2:
+        index1, index2 = index2, index1
+    return index1 * (index1 + 1) // 2 + index2
+
+
+def packed_size(address_count):
+    """How many distances the packed triangle holds for address_count locations."""
+    return address_count * (address_count + 1) // 2
+
+
+def is_distance_file(file_path):
+    """Check the first bytes to see if file_path is a compiled distance table."""
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_distance_file(file_path, addresses, get_distance):
+    """
+    Write a compiled distance table.
+
+    Args:
+        file_path (str): Where to write the .wgd file
+        addresses (list): Address for each location index
+        get_distance (callable): get_distance(index1, index2) -> miles
+    """
+    address_count = len(addresses)
+    write_packed_distance_file(file_path, addresses,
+                               array('d', (get_distance(i, j) for i in range(address_count) for j in range(i + 1))))
+
+
+def write_packed_distance_file(file_path, addresses, packed_distances):
+    """
+    Write a compiled distance table from distances that are already packed.
+
+    Args:
+        file_path (str): Where to write the .wgd file
+        addresses (list): Address for each location index
+        packed_distances: packed_size(len(addresses)) floats in packed_index() order
+            (like DistanceManager.packed_distances with triangular storage)
+    """
+    address_count = len(addresses)
+    if len(packed_distances) != packed_size(address_count):
+        raise ValueError(f"{address_count} addresses need {packed_size(address_count)} distances, "
+                         f"got {len(packed_distances)}")
+
+    address_table = bytearray()
+    for address in addresses:
+        encoded = address.encode('utf-8')
+        address_table += ADDRESS_LENGTH.pack(len(encoded)) + encoded
+
+    address_offset = HEADER.size
+    distances_offset = address_offset + len(address_table)
+    distances_offset += -distances_offset % 8  # Line the floats up on 8 bytes
+
+    distances = array('d', packed_distances)
+    if sys.byteorder != 'little':
+        distances.byteswap()
+
+    with open(file_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, distances.itemsize, address_count,
+                               address_offset, distances_offset))
+        file.write(address_table)
+        file.write(b"\0" * (distances_offset - address_offset - len(address_table)))
+        distances.tofile(file)
+
+
+class DistanceFile:
+    """
+    A compiled distance table opened with mmap.
+
+    Only the header and the address list are actually read. The distances
+    stay in the mapped file and get read straight from it, so nothing is
+    copied no matter how big the table is.
+    """
+
+    def __init__(self, file_path):
+        """
+        Map the file and read its header and address table.
+
+        Args:
+            file_path (str): Path to a .wgd file made by write_distance_file()
+
+        Raises:
+            ValueError: If it isn't a compiled distance table, or it's been cut
+                short (a copy that didn't finish, say) or damaged
+        """
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        file_size = self._file.seek(0, 2)
+        if file_size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{file_path} is too short to be a compiled WGUPS distance table "
+                             f"({file_size} bytes)")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, value_size, address_count, address_offset, distances_offset = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not a compiled WGUPS distance table")
+        if version != VERSION or value_size != 8:
+            self.close()
+            raise ValueError(f"{file_path} uses unsupported distance table version {version}")
+
+        # Check the size before reading anything past the header - a truncated
+        # file would otherwise hand out distances from beyond its end
+        expected_size = distances_offset + packed_size(address_count) * value_size
+        if file_size != expected_size or not HEADER.size <= address_offset <= distances_offset:
+            self.close()
+            raise ValueError(f"{file_path} is truncated or damaged: {address_count} addresses need "
+                             f"{expected_size} bytes, the file has {file_size}")
+
+        self.addresses = []
+        position = address_offset
+        try:
+            for _ in range(address_count):
+                (length,) = ADDRESS_LENGTH.unpack_from(self._mmap, position)
+                position += ADDRESS_LENGTH.size
+                self.addresses.append(self._mmap[position:position + length].decode('utf-8'))
+                position += length
+        except (struct.error, UnicodeDecodeError) as error:
+            self.close()
+            raise ValueError(f"{file_path} is damaged: can't read its address table ({error})") from error
+        if position > distances_offset:
+            self.close()
+            raise ValueError(f"{file_path} is damaged: its address table runs into the distances")
+
+        self.distances_offset = distances_offset
+        self.distance_count = packed_size(address_count)
+
+    def distances(self):
+        """
+        The packed distances as a float view over the mapped file.
+
+        Returns:
+            memoryview: Read-only doubles, indexed with packed_index()
+        """
+        end = self.distances_offset + self.distance_count * 8
+        view = memoryview(self._mmap)[self.distances_offset:end]
+        if sys.byteorder == 'little':
+            return view.cast('d')
+
+        # Big-endian machines can't read the little-endian floats in place
+        swapped = array('d', view.tobytes())
+        swapped.byteswap()
+        return memoryview(swapped)
+
+    def numpy_distances(self, numpy_module):
+        """The packed distances as a NumPy array over the mapped file (no copy)."""
+        return numpy_module.frombuffer(self._mmap, dtype='<f8', count=self.distance_count,
+                                       offset=self.distances_offset)
+
+    def close(self):
+        """Unmap the file. Views from distances() must not be used afterwards."""
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A view still points into the map - it is released with the process
+            pass
+        self._file.close()
+
+
+def compile_distance_table(csv_path, output_path):
+    """
+    Convert a WGUPS distance CSV into the compiled binary format.
+
+    Args:
+        csv_path (str): The distance table CSV
+        output_path (str): Where to write the .wgd file
+
+    Returns:
+        int: Number of addresses written
+    """
+    from main import DistanceManager
+
+    # Triangular storage already holds the distances in the file's packed order
+    distance_manager = DistanceManager(storage=DistanceManager.TRIANGULAR)
+    distance_manager.load_distance_data(csv_path)
+    write_packed_distance_file(output_path, distance_manager.addresses, distance_manager.packed_distances)
+    return len(distance_manager.addresses)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python distance_file.py <distance_table.csv> <output.wgd>")
+        sys.exit(1)
+
+    count = compile_distance_table(sys.argv[1], sys.argv[2])
+    print(f"✓ Compiled {count} addresses into {sys.argv[2]}")
@@ -0,0 +1,130 @@
+# fleet.py - Fleet configuration for WGUPS
+"""
+WGUPS Fleet Configuration
+
+Which trucks there are (how many packages and how much weight each one
+carries, how fast it goes), how many drivers there are and when the shift
+starts and ends. This used to be hard-coded in Truck and DeliveryRouter;
+now it's read from a small JSON file at startup, so a hub with a bigger or
+mixed fleet doesn't need any code changes:
+
+    {
+        "drivers": 2,
+        "shift_start": "8:00 AM",
+        "shift_end": "5:00 PM",
+        "trucks": [
+            {"count": 3, "capacity": 16, "speed": 18}
+        ]
+    }
+
+Each entry in "trucks" is a group of identical trucks. They're numbered
+1, 2, 3, ... in the order they're listed. A group can also have a
+"max_weight" (in the same units as the package file's weight column);
+without one its trucks have no weight limit. The WGUPS trucks don't have
+one, since nothing in the WGUPS rules gives a weight limit.
+"""
+
+import json
+
+from hash_table import deadline_to_minutes
+
+
+class TruckSpec:
+    """What one truck in the fleet can do."""
+
+    __slots__ = ('truck_id', 'capacity', 'max_weight', 'speed')
+
+    def __init__(self, truck_id, capacity=16, max_weight=None, speed=18):
+        self.truck_id = truck_id
+        self.capacity = capacity  # Packages per trip
+        self.max_weight = max_weight  # Total package weight per trip (None = no limit)
+        self.speed = speed  # mph
+
+
+class FleetConfig:
+    """The whole fleet: trucks, drivers and the shift they work."""
+
+    def __init__(self, trucks, drivers, shift_start=8 * 60, shift_end=17 * 60):
+        """
+        Args:
+            trucks (list): TruckSpec for every truck
+            drivers (int): How many trucks can be out at once
+            shift_start (int): Minutes after midnight the first truck can leave
+            shift_end (int): Minutes after midnight every truck should be back
+        """
+        if not trucks:
+            raise ValueError("A fleet needs at least one truck")
+        if drivers < 1:
+            raise ValueError("A fleet needs at least one driver")
+        if shift_end <= shift_start:
+            raise ValueError("The shift has to end after it starts")
+        for truck in trucks:
+            # "not > 0" so NaN is turned away too
+            if not truck.capacity > 0:
+                raise ValueError(f"Truck {truck.truck_id} needs room for at least one package")
+            if not truck.speed > 0:
+                raise ValueError(f"Truck {truck.truck_id} needs a speed above 0")
+            if truck.max_weight is not None and not truck.max_weight > 0:
+                raise ValueError(f"Truck {truck.truck_id} needs a max weight above 0 (or none at all)")
+
+        self.trucks = trucks
+        self.drivers = drivers
+        self.shift_start = shift_start
+        self.shift_end = shift_end
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a fleet from the parsed JSON.
+
+        Args:
+            data (dict): See the module docstring for the layout
+
+        Returns:
+            FleetConfig: The fleet
+        """
+        trucks = []
+        for group in data.get("trucks", []):
+            for _ in range(int(group.get("count", 1))):
+                max_weight = group.get("max_weight")
+                trucks.append(TruckSpec(len(trucks) + 1,
+                                        capacity=int(group.get("capacity", 16)),
+                                        max_weight=None if max_weight is None else float(max_weight),
+                                        speed=float(group.get("speed", 18))))
+
+        return cls(trucks, int(data.get("drivers", len(trucks))),
+                   deadline_to_minutes(data.get("shift_start", "8:00 AM")),
+                   deadline_to_minutes(data.get("shift_end", "5:00 PM")))
+
+    @classmethod
+    def uniform(cls, truck_count, drivers=None, capacity=16, max_weight=None, speed=18):
+        """A fleet of identical trucks (one driver per truck unless told otherwise)."""
+        trucks = [TruckSpec(truck_id, capacity, max_weight, speed) for truck_id in range(1, truck_count + 1)]
+        return cls(trucks, truck_count if drivers is None else drivers)
+
+    def describe(self):
+        """One line about the fleet, for the startup output."""
+        groups = {}
+        for truck in self.trucks:
+            key = (truck.capacity, truck.max_weight, truck.speed)
+            groups[key] = groups.get(key, 0) + 1
+
+        parts = []
+        for (capacity, max_weight, speed), count in groups.items():
+            weight_text = f", {max_weight:g} max weight" if max_weight is not None else ""
+            parts.append(f"{count} x {capacity} packages{weight_text} at {speed:g} mph")
+        return f"Fleet: {', '.join(parts)}; {self.drivers} drivers"
+
+
+def load_fleet_config(file_path):
+    """
+    Read a fleet JSON file.
+
+    Args:
+        file_path (str): Path to the fleet file
+
+    Returns:
+        FleetConfig: The fleet
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return FleetConfig.from_dict(json.load(file))
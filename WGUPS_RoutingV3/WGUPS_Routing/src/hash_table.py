@@ -6,13 +6,50 @@ Course: C950 - Data Structures and Algorithms II
 
 A custom hash table implementation that stores package data using package ID as the key.
 No additional libraries or classes are used beyond Python's built-in functionality.
+
+Package data is stored column by column (one compact array per field) instead
+of one list per package, so a very large manifest takes tens of bytes per
+package instead of hundreds. The hash table itself only maps a package ID to
+its row number in those columns.
 """
 
+import datetime
+import operator
+import sys
+from array import array
+from itertools import compress, repeat
+
+# "EOD" deadlines sort after every clock-time deadline
+END_OF_DAY_MINUTES = 24 * 60
+
+
+def deadline_to_minutes(delivery_deadline):
+    """
+    Turn a deadline like "10:30 AM" or "EOD" into minutes after midnight.
+
+    Args:
+        delivery_deadline (str): Deadline text from the package file
+
+    Returns:
+        int: Minutes after midnight (END_OF_DAY_MINUTES for "EOD")
+    """
+    text = delivery_deadline.strip().upper()
+    if text in ("EOD", ""):
+        return END_OF_DAY_MINUTES
+
+    parsed = datetime.datetime.strptime(text, "%I:%M %p")
+    return parsed.hour * 60 + parsed.minute
+
 
 class Package:
     """
     Simple Package class to represent package data.
     """
+    # __slots__ skips the per-object __dict__, which keeps each package small
+    __slots__ = ('package_id', 'delivery_address', 'delivery_city', 'delivery_state',
+                 'delivery_zip', 'delivery_deadline', 'package_weight',
+                 'delivery_status', 'delivery_time')
+
     def __init__(self, package_data):
         """Initialize package with data dictionary."""
         self.package_id = package_data['package_id']
@@ -26,134 +63,755 @@ class Package:
         self.delivery_time = package_data['delivery_time']
 
 
+class PackageView:
+    """
+    Read-only view of one package stored in the hash table.
+
+    lookup() builds a brand new 9-key dictionary on every call. The view just
+    remembers which row the package lives in, so hot loops (like the nearest
+    neighbor search) can read package fields without copying them.
+    Because it reads the stored columns, it always shows the current values.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        """Point at one row of the table's columns - nothing gets copied."""
+        self._table = table
+        self._row = row
+
+    @property
+    def package_id(self):
+        return self._table._ids[self._row]
+
+    @property
+    def delivery_address(self):
+        return self._table._addresses.get(self._row)
+
+    @property
+    def delivery_city(self):
+        return self._table._cities.get(self._row)
+
+    @property
+    def delivery_state(self):
+        return self._table._states.get(self._row)
+
+    @property
+    def delivery_zip(self):
+        return self._table._zips.get(self._row)
+
+    @property
+    def delivery_deadline(self):
+        return self._table._deadlines.get(self._row)
+
+    @property
+    def deadline_minutes(self):
+        return self._table._deadline_minutes[self._row]
+
+    @property
+    def package_weight(self):
+        return self._table._weights[self._row]
+
+    @property
+    def special_notes(self):
+        return self._table._notes.get(self._row)
+
+    @property
+    def delivery_status(self):
+        return self._table._statuses.get(self._row)
+
+    @property
+    def delivery_time(self):
+        return self._table._get_delivery_time(self._row)
+
+    @property
+    def location_index(self):
+        return self._table._locations[self._row]
+
+    @property
+    def truck_id(self):
+        truck_id = self._table._truck_ids[self._row]
+        return None if truck_id == HashTable.NO_TRUCK else truck_id
+
+
+class _StringColumn:
+    """
+    A text column stored as small integer codes.
+
+    Most text fields repeat a lot (city, state, status, the same address for
+    several packages), so each distinct string is stored once and every row
+    just holds its code in a compact array.
+    """
+
+    def __init__(self, typecode='I'):
+        self.codes = array(typecode)
+        self.values = []  # code -> string
+        self.code_of = {}  # string -> code
+
+    def _encode(self, value):
+        code = self.code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.code_of[value] = code
+        return code
+
+    def append(self, value):
+        self.codes.append(self._encode(value))
+
+    def set(self, row, value):
+        self.codes[row] = self._encode(value)
+
+    def get(self, row):
+        return self.values[self.codes[row]]
+
+    def memory_usage(self):
+        """Bytes used by the code array (the distinct strings are shared)."""
+        return self.codes.itemsize * len(self.codes)
+
+
 class HashTable:
     """
     Custom hash table implementation for storing package data.
-    Uses chaining with lists to handle collisions.
+
+    By default it uses chaining with lists to handle collisions, just like the
+    original version. The difference is that the table now grows: once
+    size / capacity goes past the load factor, I double the capacity and
+    rehash everything. That keeps every chain short (amortized O(1) inserts
+    and lookups) whether a hub has 40 packages or a million.
+
+    It can also run in open addressing mode using Robin Hood linear probing,
+    which keeps the whole index in one flat array of row numbers. That is the
+    mode to use for very large manifests since it adds only a few bytes per
+    package on top of the columns.
+
+    The package fields themselves live in parallel columns (one array per
+    field). Every bucket entry or slot is just a row number into them.
+
+    On top of the main index the table keeps secondary indexes (status,
+    deadline, address and truck -> set of package IDs). insert(), remove()
+    and the update_package_*() methods keep them in sync, so questions like
+    "which packages are on truck 2" are answered in time proportional to the
+    answer instead of scanning every package.
     """
 
-    def __init__(self, initial_capacity=40):
+    CHAINING = "chaining"
+    ROBIN_HOOD = "robin_hood"
 
-        self.capacity = initial_capacity
+    # Chains can average one package per bucket and stay fast, but open
+    # addressing needs empty slots around or the probe runs get long
+    DEFAULT_LOAD_FACTORS = {CHAINING: 1.0, ROBIN_HOOD: 0.75}
+
+    EMPTY_SLOT = -1
+    REMOVED_ID = -1  # Package ID column value for a removed package's row
+    NOT_DELIVERED = -1
+    NO_TRUCK = 0
+    UNKNOWN_LOCATION = -1
+
+    def __init__(self, initial_capacity=40, load_factor=None, mode=CHAINING, secondary_indexes=True):
+        """
+        Set up an empty hash table.
+
+        Args:
+            initial_capacity (int): How many buckets/slots to start with
+            load_factor (float): Grow the table once size / capacity passes this
+                (defaults to 1.0 for chaining and 0.75 for Robin Hood)
+            mode (str): HashTable.CHAINING or HashTable.ROBIN_HOOD
+            secondary_indexes (bool): Keep the status/deadline/address/truck
+                indexes. They cost memory per package, so a bulk load that
+                never queries them can turn them off.
+        """
+        if mode not in (self.CHAINING, self.ROBIN_HOOD):
+            raise ValueError(f"Unknown hash table mode: {mode}")
+        if load_factor is None:
+            load_factor = self.DEFAULT_LOAD_FACTORS[mode]
+        if not 0 < load_factor <= 1:
+            raise ValueError("Load factor must be between 0 and 1")
+
+        self.capacity = max(1, initial_capacity)
+        self.load_factor = load_factor
+        self.mode = mode
         self.size = 0
-        # Each bucket is a list that stores [key, package_data] pairs
-        self.buckets = [[] for _ in range(self.capacity)]
+        self.resize_count = 0  # How many times the table has grown
+
+        # One column per package field - row N of every column is one package
+        self._ids = array('q')
+        self._addresses = _StringColumn('I')
+        self._cities = _StringColumn('H')
+        self._states = _StringColumn('H')
+        self._zips = _StringColumn('I')
+        self._deadlines = _StringColumn('H')
+        self._deadline_minutes = array('H')
+        self._weights = array('d')
+        self._statuses = _StringColumn('H')
+        self._notes = _StringColumn('I')  # Special notes from the package file
+        # Seconds after the start of the service day, or NOT_DELIVERED
+        self._delivery_seconds = array('i')
+        self.service_day = None  # Midnight of the day delivery times belong to
+        self._truck_ids = array('H')  # Assigned truck, or NO_TRUCK
+        # Index of the delivery address in the distance table, or UNKNOWN_LOCATION
+        self._locations = array('i')
+
+        # Secondary indexes: value -> set of package IDs with that value
+        self.secondary_indexes = secondary_indexes
+        self._status_index = {}
+        self._deadline_index = {}  # Keyed by deadline minutes
+        self._address_index = {}
+        self._truck_index = {}
+
+        self._allocate(self.capacity)
+
+    def _allocate(self, capacity):
+        """Create an empty index for the given capacity."""
+        if self.mode == self.CHAINING:
+            # Each bucket is a list of row numbers into the columns
+            self.buckets = [[] for _ in range(capacity)]
+        else:
+            # Open addressing keeps one row number per slot
+            self.slots = array('i', [self.EMPTY_SLOT]) * capacity
 
     def _hash_function(self, package_id):
 
         return package_id % self.capacity
 
-    def insert(self, package_id, delivery_address, delivery_city, delivery_state,
-               delivery_zip, delivery_deadline, package_weight, delivery_status="At Hub"):
-
-        # Calculate which bucket to use
-        bucket_index = self._hash_function(package_id)
-        bucket = self.buckets[bucket_index]
-
-        # Package data stored as a list with all required components
-        package_data = [
-            package_id,
-            delivery_address,
-            delivery_city,
-            delivery_state,
-            delivery_zip,
-            delivery_deadline,
-            package_weight,
-            delivery_status,
-            None  # delivery_time (initially None)
-        ]
-
-        # Check if package already exists and update it
-        for i, item in enumerate(bucket):
-            if item[0] == package_id:  # item[0] is the package_id
-                bucket[i] = [package_id, package_data]
+    def _resize(self, new_capacity):
+        """
+        Grow the table and rehash every package into the new index.
+
+        Doubling the capacity means each package gets moved only a handful
+        of times over the life of the table, so inserts stay O(1) amortized.
+        Only the index is rebuilt - the columns never move.
+        """
+        old_rows = list(self._iter_rows())
+
+        self.capacity = new_capacity
+        self.resize_count += 1
+        self._allocate(new_capacity)
+
+        for row in old_rows:
+            self._index_row(row)
+
+    def _iter_rows(self):
+        """Go through every stored row in bucket/slot order."""
+        if self.mode == self.CHAINING:
+            for bucket in self.buckets:
+                yield from bucket
+        else:
+            for row in self.slots:
+                if row != self.EMPTY_SLOT:
+                    yield row
+
+    def _probe_distance(self, row, slot_index):
+        """How far a stored row sits from the slot its package ID hashed to."""
+        return (slot_index - self._hash_function(self._ids[row])) % self.capacity
+
+    def _find_row(self, package_id):
+        """
+        Find the column row holding package_id.
+
+        With Robin Hood probing I can stop early as soon as I pass a key that
+        is closer to its home slot than I am to mine, because Robin Hood
+        insertion would have put my key before it.
+
+        Returns:
+            int: Row number, or -1 if the package is not stored
+        """
+        ids = self._ids
+
+        if self.mode == self.CHAINING:
+            for row in self.buckets[self._hash_function(package_id)]:
+                if ids[row] == package_id:
+                    return row
+            return -1
+
+        slots = self.slots
+        slot_index = self._hash_function(package_id)
+        distance = 0
+
+        while True:
+            row = slots[slot_index]
+            if row == self.EMPTY_SLOT:
+                return -1
+            if ids[row] == package_id:
+                return row
+            if self._probe_distance(row, slot_index) < distance:
+                return -1
+
+            slot_index = (slot_index + 1) % self.capacity
+            distance += 1
+
+    def _index_row(self, row):
+        """Add a row that is not in the index yet."""
+        if self.mode == self.CHAINING:
+            self.buckets[self._hash_function(self._ids[row])].append(row)
+            return
+
+        # Robin Hood insertion: walk forward and swap with any row that is
+        # closer to home than the one we're carrying ("take from the rich")
+        slots = self.slots
+        slot_index = self._hash_function(self._ids[row])
+        distance = 0
+
+        while True:
+            stored_row = slots[slot_index]
+            if stored_row == self.EMPTY_SLOT:
+                slots[slot_index] = row
                 return
 
-        # Package doesn't exist, add new entry
-        bucket.append([package_id, package_data])
+            stored_distance = self._probe_distance(stored_row, slot_index)
+            if stored_distance < distance:
+                slots[slot_index], row = row, stored_row
+                distance = stored_distance
+
+            slot_index = (slot_index + 1) % self.capacity
+            distance += 1
+
+    def _get_delivery_time(self, row):
+        """Rebuild the delivery datetime stored for a row (or None)."""
+        seconds = self._delivery_seconds[row]
+        if seconds == self.NOT_DELIVERED:
+            return None
+        return self.service_day + datetime.timedelta(seconds=seconds)
+
+    def _set_delivery_time(self, row, delivery_time):
+        """Store a delivery datetime as seconds after the service day started."""
+        if self.service_day is None:
+            self.service_day = datetime.datetime.combine(delivery_time.date(), datetime.time(),
+                                                         tzinfo=delivery_time.tzinfo)
+        self._delivery_seconds[row] = int((delivery_time - self.service_day).total_seconds())
+
+    @staticmethod
+    def _index_add(index, key, package_id):
+        """Record package_id under key in one of the secondary indexes."""
+        package_ids = index.get(key)
+        if package_ids is None:
+            package_ids = index[key] = set()
+        package_ids.add(package_id)
+
+    @staticmethod
+    def _index_remove(index, key, package_id):
+        """Forget package_id under key, dropping the key once it's empty."""
+        package_ids = index.get(key)
+        if package_ids is not None:
+            package_ids.discard(package_id)
+            if not package_ids:
+                del index[key]
+
+    def _add_to_indexes(self, row):
+        """Put one row into every secondary index."""
+        if not self.secondary_indexes:
+            return
+        package_id = self._ids[row]
+        self._index_add(self._status_index, self._statuses.get(row), package_id)
+        self._index_add(self._deadline_index, self._deadline_minutes[row], package_id)
+        self._index_add(self._address_index, self._addresses.get(row), package_id)
+        if self._truck_ids[row] != self.NO_TRUCK:
+            self._index_add(self._truck_index, self._truck_ids[row], package_id)
+
+    def _remove_from_indexes(self, row):
+        """Take one row out of every secondary index before it changes."""
+        if not self.secondary_indexes:
+            return
+        package_id = self._ids[row]
+        self._index_remove(self._status_index, self._statuses.get(row), package_id)
+        self._index_remove(self._deadline_index, self._deadline_minutes[row], package_id)
+        self._index_remove(self._address_index, self._addresses.get(row), package_id)
+        self._index_remove(self._truck_index, self._truck_ids[row], package_id)
+
+    def _row_as_dict(self, row):
+        """Copy one row into the dictionary format lookup() has always returned."""
+        return {
+            'package_id': self._ids[row],
+            'delivery_address': self._addresses.get(row),
+            'delivery_city': self._cities.get(row),
+            'delivery_state': self._states.get(row),
+            'delivery_zip': self._zips.get(row),
+            'delivery_deadline': self._deadlines.get(row),
+            'package_weight': self._weights[row],
+            'delivery_status': self._statuses.get(row),
+            'delivery_time': self._get_delivery_time(row)
+        }
+
+    def insert(self, package_id, delivery_address, delivery_city, delivery_state,
+               delivery_zip, delivery_deadline, package_weight, delivery_status="At Hub",
+               location_index=UNKNOWN_LOCATION, special_notes="", deadline_minutes=None):
+
+        # A loader that already parsed the deadline (see manifest.py) can pass it in
+        if deadline_minutes is None:
+            deadline_minutes = deadline_to_minutes(delivery_deadline)
+
+        # Check if package already exists and overwrite its row
+        row = self._find_row(package_id)
+        if row != -1:
+            self._remove_from_indexes(row)
+            self._addresses.set(row, delivery_address)
+            self._cities.set(row, delivery_city)
+            self._states.set(row, delivery_state)
+            self._zips.set(row, delivery_zip)
+            self._deadlines.set(row, delivery_deadline)
+            self._deadline_minutes[row] = deadline_minutes
+            self._weights[row] = package_weight
+            self._statuses.set(row, delivery_status)
+            self._notes.set(row, special_notes)
+            self._delivery_seconds[row] = self.NOT_DELIVERED
+            self._truck_ids[row] = self.NO_TRUCK
+            self._locations[row] = location_index
+            self._add_to_indexes(row)
+            return
+
+        # Grow first so the new package lands in a table that is not overloaded
+        if self.size + 1 > self.capacity * self.load_factor:
+            self._resize(self.capacity * 2)
+
+        # Package doesn't exist, add a new row to every column
+        row = len(self._ids)
+        self._ids.append(package_id)
+        self._addresses.append(delivery_address)
+        self._cities.append(delivery_city)
+        self._states.append(delivery_state)
+        self._zips.append(delivery_zip)
+        self._deadlines.append(delivery_deadline)
+        self._deadline_minutes.append(deadline_minutes)
+        self._weights.append(package_weight)
+        self._statuses.append(delivery_status)
+        self._notes.append(special_notes)
+        self._delivery_seconds.append(self.NOT_DELIVERED)  # delivery_time (initially None)
+        self._truck_ids.append(self.NO_TRUCK)
+        self._locations.append(location_index)
+
+        self._index_row(row)
+        self._add_to_indexes(row)
         self.size += 1
 
+    def remove(self, package_id):
+        """
+        Take a package out of the table.
+
+        The columns can't give a row back cheaply, so the row stays where it
+        is with REMOVED_ID in the package ID column as a tombstone. Nothing
+        points at it any more and inserting the package again starts a new
+        row. In Robin Hood mode the rows after the removed one are shifted
+        back a slot (backward shift deletion), so every probe run stays
+        unbroken and _find_row() can still stop early.
+
+        Args:
+            package_id (int): Package ID to remove
+
+        Returns:
+            bool: True if package was found and removed, False otherwise
+        """
+        row = self._find_row(package_id)
+
+        if row == -1:
+            return False
+
+        self._remove_from_indexes(row)
+
+        if self.mode == self.CHAINING:
+            self.buckets[self._hash_function(package_id)].remove(row)
+        else:
+            slots = self.slots
+            slot_index = self._hash_function(package_id)
+            while slots[slot_index] != row:
+                slot_index = (slot_index + 1) % self.capacity
+
+            # Pull every following row that isn't already home back one slot
+            next_index = (slot_index + 1) % self.capacity
+            while slots[next_index] != self.EMPTY_SLOT and self._probe_distance(slots[next_index], next_index) > 0:
+                slots[slot_index] = slots[next_index]
+                slot_index = next_index
+                next_index = (next_index + 1) % self.capacity
+            slots[slot_index] = self.EMPTY_SLOT
+
+        self._ids[row] = self.REMOVED_ID
+        self.size -= 1
+        return True
+
     def lookup(self, package_id):
 
-        # Calculate which bucket to search
-        bucket_index = self._hash_function(package_id)
-        bucket = self.buckets[bucket_index]
-
-        # Search through the bucket for the package
-        for stored_package_id, package_data in bucket:
-            if stored_package_id == package_id:
-                # Package found - return all data components
-                return {
-                    'package_id': package_data[0],
-                    'delivery_address': package_data[1],
-                    'delivery_city': package_data[2],
-                    'delivery_state': package_data[3],
-                    'delivery_zip': package_data[4],
-                    'delivery_deadline': package_data[5],
-                    'package_weight': package_data[6],
-                    'delivery_status': package_data[7],
-                    'delivery_time': package_data[8]
-                }
-
-        # Package not found
-        return None
+        row = self._find_row(package_id)
+
+        if row == -1:
+            # Package not found
+            return None
+
+        # Package found - return all data components
+        return self._row_as_dict(row)
+
+    def lookup_view(self, package_id):
+        """
+        Find a package without building a new dictionary.
+
+        Args:
+            package_id (int): Package ID to find
+
+        Returns:
+            PackageView: Read-only view of the stored package, or None if not found
+        """
+        row = self._find_row(package_id)
+
+        if row == -1:
+            return None
+
+        return PackageView(self, row)
 
     def get_all_packages(self):
 
         all_packages = []
 
-        # Go through each bucket
-        for bucket in self.buckets:
-            # Go through each package in the bucket
-            for stored_package_id, package_data in bucket:
-                # Convert to dictionary format
-                package_dict = {
-                    'package_id': package_data[0],
-                    'delivery_address': package_data[1],
-                    'delivery_city': package_data[2],
-                    'delivery_state': package_data[3],
-                    'delivery_zip': package_data[4],
-                    'delivery_deadline': package_data[5],
-                    'package_weight': package_data[6],
-                    'delivery_status': package_data[7],
-                    'delivery_time': package_data[8]
-                }
-                # Create Package object and add to list
-                package_obj = Package(package_dict)
-                all_packages.append(package_obj)
+        # Go through every stored package
+        for row in self._iter_rows():
+            # Create Package object and add to list
+            package_obj = Package(self._row_as_dict(row))
+            all_packages.append(package_obj)
 
         return all_packages
 
-    def update_package_status(self, package_id, new_status, delivery_time=None):
+    def iter_items(self, fields=None, where=None):
+        """
+        Stream (package_id, package) pairs one at a time.
+
+        Unlike get_all_packages() this never builds a list or copies a
+        package, so it uses the same small amount of memory for 40 packages
+        or a million. Don't insert new packages while iterating - a resize
+        would rebuild the index underneath the loop.
+
+        Args:
+            fields (tuple): Optional field names to project, e.g.
+                ('package_id', 'delivery_deadline'). When given, each package
+                comes back as a tuple of those values instead of a view.
+            where (callable): Optional filter that gets a PackageView and
+                returns True to keep the package
+
+        Yields:
+            tuple: (package_id, PackageView) or (package_id, tuple of fields)
+        """
+        if fields is not None:
+            fields = tuple(fields)
+            for field in fields:
+                if not isinstance(getattr(PackageView, field, None), property):
+                    raise ValueError(f"Unknown package field: {field}")
+
+        ids = self._ids
+        for row in self._iter_rows():
+            view = PackageView(self, row)
+            if where is not None and not where(view):
+                continue
+
+            if fields is None:
+                yield ids[row], view
+            else:
+                yield ids[row], tuple(getattr(view, field) for field in fields)
+
+    def iter_packages(self, fields=None, where=None):
+        """
+        Stream packages one at a time - the lazy version of get_all_packages().
+
+        Takes the same fields/where arguments as iter_items().
+
+        Yields:
+            PackageView, or a tuple of the requested fields
+        """
+        for _, package in self.iter_items(fields, where):
+            yield package
+
+    def packages_with_deadline_before(self, deadline):
+        """
+        Find every package due before a given time with one scan of the deadline column.
+
+        The comparison runs over the whole array inside map()/compress(), so
+        there is no Python-level loop per package.
+
+        Args:
+            deadline: Deadline text like "10:30 AM", or minutes after midnight
+
+        Returns:
+            list: Package IDs due strictly before that time
+        """
+        if isinstance(deadline, str):
+            deadline = deadline_to_minutes(deadline)
+
+        due = compress(self._ids, map(operator.lt, self._deadline_minutes, repeat(deadline)))
+        if self.size < len(self._ids):
+            # Some rows are tombstones left by remove()
+            return [package_id for package_id in due if package_id != self.REMOVED_ID]
+        return list(due)
+
+    def memory_usage(self):
+        """
+        Bytes used by the columns and the index.
+
+        Distinct strings are stored once and shared, so they aren't counted
+        per package.
+        """
+        column_bytes = sum(column.itemsize * len(column) for column in (
+            self._ids, self._deadline_minutes, self._weights, self._delivery_seconds, self._truck_ids,
+            self._locations))
+        column_bytes += sum(column.memory_usage() for column in (
+            self._addresses, self._cities, self._states, self._zips, self._deadlines, self._statuses,
+            self._notes))
+
+        if self.mode == self.CHAINING:
+            # Each bucket is its own list, which is why Robin Hood is smaller
+            index_bytes = sys.getsizeof(self.buckets) + sum(sys.getsizeof(bucket) for bucket in self.buckets)
+        else:
+            index_bytes = self.slots.itemsize * len(self.slots)
+
+        return column_bytes + index_bytes
+
+    def update_package_status(self, package_id, new_status, delivery_time=None, truck_id=None):
         """
         Update the delivery status of a specific package.
 
         Args:
             package_id (int): Package ID to update
             new_status (str): New delivery status
-            delivery_time: Delivery time (optional)
+            delivery_time (datetime): Delivery time (optional)
+            truck_id (int): Truck the package is assigned to (optional)
 
         Returns:
             bool: True if package was found and updated, False otherwise
         """
-        # Calculate which bucket to search
-        bucket_index = self._hash_function(package_id)
-        bucket = self.buckets[bucket_index]
+        row = self._find_row(package_id)
+
+        if row == -1:
+            # Package not found
+            return False
+
+        # Update the status column for this package's row
+        if self.secondary_indexes:
+            self._index_remove(self._status_index, self._statuses.get(row), package_id)
+            self._index_add(self._status_index, new_status, package_id)
+        self._statuses.set(row, new_status)  # delivery_status
 
-        # Search through the bucket for the package
-        for i, (stored_package_id, package_data) in enumerate(bucket):
-            if stored_package_id == package_id:
-                # Update the status
-                package_data[7] = new_status  # delivery_status
-                if delivery_time:
-                    package_data[8] = delivery_time  # delivery_time
+        if delivery_time:
+            self._set_delivery_time(row, delivery_time)  # delivery_time
 
-                # Update the bucket with modified data
-                bucket[i] = [stored_package_id, package_data]
-                return True
+        if truck_id is not None:
+            if self.secondary_indexes:
+                self._index_remove(self._truck_index, self._truck_ids[row], package_id)
+                if truck_id != self.NO_TRUCK:
+                    self._index_add(self._truck_index, truck_id, package_id)
+            self._truck_ids[row] = truck_id
 
-        # Package not found
-        return False
+        return True
+
+    def update_package_address(self, package_id, delivery_address, delivery_city, delivery_state,
+                               delivery_zip, location_index=UNKNOWN_LOCATION):
+        """
+        Change where a package is going (like package 9's address correction).
+
+        Args:
+            package_id (int): Package ID to update
+            delivery_address (str): The new street address
+            delivery_city (str): The new city
+            delivery_state (str): The new state
+            delivery_zip (str): The new zip code
+            location_index (int): Where the new address is in the distance table
+
+        Returns:
+            bool: True if package was found and updated, False otherwise
+        """
+        row = self._find_row(package_id)
+
+        if row == -1:
+            return False
+
+        if self.secondary_indexes:
+            self._index_remove(self._address_index, self._addresses.get(row), package_id)
+            self._index_add(self._address_index, delivery_address, package_id)
+        self._addresses.set(row, delivery_address)
+        self._cities.set(row, delivery_city)
+        self._states.set(row, delivery_state)
+        self._zips.set(row, delivery_zip)
+        self._locations[row] = location_index
+
+        return True
+
+    def update_package_deadline(self, package_id, delivery_deadline):
+        """
+        Change a package's deadline (like "10:30 AM" or "EOD").
+
+        Args:
+            package_id (int): Package ID to update
+            delivery_deadline (str): The new deadline
+
+        Returns:
+            bool: True if package was found and updated, False otherwise
+        """
+        row = self._find_row(package_id)
+
+        if row == -1:
+            return False
+
+        deadline_minutes = deadline_to_minutes(delivery_deadline)
+        if self.secondary_indexes:
+            self._index_remove(self._deadline_index, self._deadline_minutes[row], package_id)
+            self._index_add(self._deadline_index, deadline_minutes, package_id)
+        self._deadlines.set(row, delivery_deadline)
+        self._deadline_minutes[row] = deadline_minutes
+
+        return True
+
+    def find_packages(self, status=None, deadline=None, address=None, truck_id=None,
+                      exclude_status=None):
+        """
+        Find packages using the secondary indexes.
+
+        Every filter that is given must match. I start from the smallest
+        matching set and intersect the rest into it, so the work is
+        proportional to the answer, not to the number of packages.
+
+        Example - all undelivered 9:00 AM packages:
+            table.find_packages(deadline="9:00 AM", exclude_status="Delivered")
+
+        Args:
+            status (str): Exact delivery status
+            deadline: Deadline text like "10:30 AM", or minutes after midnight
+            address (str): Exact delivery address
+            truck_id (int): Assigned truck
+            exclude_status (str): Leave out packages with this status
+
+        Returns:
+            set: Matching package IDs
+        """
+        if not self.secondary_indexes:
+            raise ValueError("Secondary indexes are turned off for this table")
+
+        if isinstance(deadline, str):
+            deadline = deadline_to_minutes(deadline)
+
+        matches = []
+        for index, key in ((self._status_index, status), (self._deadline_index, deadline),
+                           (self._address_index, address), (self._truck_index, truck_id)):
+            if key is not None:
+                matches.append(index.get(key, set()))
+
+        if matches:
+            matches.sort(key=len)
+            result = set(matches[0])
+            for package_ids in matches[1:]:
+                result.intersection_update(package_ids)
+        else:
+            result = set(self._ids)
+            result.discard(self.REMOVED_ID)
+
+        if exclude_status is not None:
+            excluded = self._status_index.get(exclude_status, set())
+            result = {package_id for package_id in result if package_id not in excluded}
+
+        return result
+
+    def count_by_status(self):
+        """
+        How many packages have each delivery status.
+
+        Returns:
+            dict: status -> package count
+        """
+        if not self.secondary_indexes:
+            raise ValueError("Secondary indexes are turned off for this table")
+
+        return {status: len(package_ids) for status, package_ids in self._status_index.items()}
 
 
 # Test code (only runs when file is executed directly)
@@ -177,6 +835,11 @@ if __name__ == "__main__":
     if result:
         print(f"✓ Lookup working: Package 1 found at {result['delivery_address']}")
 
+    # Test the no-copy lookup
+    view = package_table.lookup_view(2)
+    if view and view.delivery_address == "2530 S 500 E":
+        print(f"✓ Lookup view working: Package 2 found at {view.delivery_address}")
+
     # Test get_all_packages function
     all_packages = package_table.get_all_packages()
     print(f"✓ Get all packages working: Found {len(all_packages)} packages")
@@ -186,5 +849,37 @@ if __name__ == "__main__":
     if success:
         print("✓ Update status working: Package 1 marked as delivered")
 
+    # Test removing a package
+    package_table.insert(4, "380 W 2880 S", "Salt Lake City", "UT", "84115", "EOD", 1)
+    if package_table.remove(4) and package_table.lookup(4) is None and package_table.size == 3:
+        print("✓ Remove working: Package 4 removed")
+
+    # Test that the table grows instead of building long chains
+    for mode in (HashTable.CHAINING, HashTable.ROBIN_HOOD):
+        big_table = HashTable(mode=mode)
+        for package_id in range(1, 1001):
+            big_table.insert(package_id, "410 S State St", "Salt Lake City", "UT", "84111", "EOD", 1)
+        found = all(big_table.lookup(package_id) for package_id in range(1, 1001))
+        if found and big_table.size == 1000:
+            print(f"✓ Resizing working ({mode}): 1000 packages, capacity {big_table.capacity}, "
+                  f"{big_table.resize_count} resizes")
+
+    # Test streaming iteration with projection and filtering
+    heavy = list(package_table.iter_packages(fields=('package_id', 'package_weight'),
+                                             where=lambda package: package.package_weight > 10))
+    if heavy == [(1, 21), (2, 44)]:
+        print(f"✓ Streaming iteration working: {heavy}")
+
+    # Test the secondary indexes
+    package_table.update_package_status(2, "Loaded on Truck 2", truck_id=2)
+    if (package_table.find_packages(truck_id=2) == {2}
+            and package_table.find_packages(deadline="EOD", exclude_status="Delivered") == {2, 3}):
+        print("✓ Secondary indexes working: truck and deadline queries match")
+
+    # Test the deadline column scan
+    early = package_table.packages_with_deadline_before("11:00 AM")
+    if early == [1]:
+        print(f"✓ Deadline scan working: {early} due before 11:00 AM")
+
     print("="*50)
     print("Hash table implementation complete and tested!")
\ No newline at end of file
@@ -8,44 +8,73 @@ WGUPS Main Delivery Program
 
 This program solves the package delivery routing problem by:
 1. Loading all 40 packages into a custom hash table
-2. Finding good delivery routes using nearest neighbor approach
-3. Managing three trucks with different constraints
+2. Finding good delivery routes that meet deadlines (deadline insertion + 2-opt/Or-opt)
+3. Managing three trucks (and two drivers) with different constraints
 4. Getting all packages delivered on time under 140 total miles
-5. Letting supervisors check package status anytime
+5. Letting supervisors check package status anytime (status_query.py answers
+   the same questions for other programs, without the menu)
 
-I'm using a greedy nearest neighbor approach with some extra logic
-to handle the special delivery requirements.
+I started with a greedy nearest neighbor approach; routes are now built
+by inserting stops around their deadlines and then cleaned up with local
+search, with some extra logic to handle the special delivery requirements.
 """
 
 import datetime
 import csv
 import os
-from hash_table import HashTable
+from array import array
+from hash_table import HashTable, deadline_to_minutes
+from assignment import TruckAssigner, dispatch_trips
+from clock import SECONDS_PER_MINUTE, at_seconds, minutes_rounded_up, seconds_of_day, travel_seconds
+from constraints import ConstraintSet, load_address_corrections
+from distance_file import DistanceFile, is_distance_file, packed_index, packed_size
+from fleet import FleetConfig, load_fleet_config
+from manifest import ingest_manifest
+from parallel_routing import plan_routes_parallel
+from route_optimizer import OrOptImprover, TwoOptImprover, deadline_insertion_tour, improve_route
+from simulation import DeliverySimulation, PackageChange
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - the plain Python lists work without it
+    np = None
+
+# The WGUPS data files, found from this file so it works from any directory
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+WGUPS_HUB_ADDRESS = "4001 South 700 East"
 
 
 class Truck:
     """
     This represents one of our delivery trucks.
 
-    Each truck can hold up to 16 packages, drives at 18 mph, and
-    I need to keep track of where it is and what time it is.
+    A WGUPS truck holds up to 16 packages and drives at 18 mph (other
+    fleets can differ, see fleet.py), and I need to keep track of where
+    it is and what time it is.
     """
 
-    def __init__(self, truck_id):
+    def __init__(self, truck_id, hub_address=WGUPS_HUB_ADDRESS, capacity=16, speed=18, max_weight=None):
         """
         Set up a new truck with default starting values.
 
         Args:
             truck_id (int): Which truck this is (1, 2, or 3)
+            hub_address (str): Where the truck starts its day
+            capacity (int): Most packages it can carry on one trip
+            speed (float): How fast it drives, in mph
+            max_weight (float): Most total package weight per trip (None = no limit)
         """
         self.truck_id = truck_id
-        self.capacity = 16  # Can't fit more than 16 packages
-        self.speed = 18  # Going 18 mph all day
+        self.capacity = capacity  # Can't fit more than this many packages
+        self.max_weight = max_weight
+        self.speed = speed  # Same speed all day
         self.packages = []  # What packages are currently loaded
-        self.current_location = "4001 South 700 East"  # Start at the hub
+        self.current_location = hub_address  # Start at the hub
         self.mileage = 0.0  # Keep track of how far we've driven
         self.departure_time = None  # When did this truck leave the hub
         self.current_time = None  # What time is it for this truck right now
+        self.trips = []  # Every load it takes out today, in order (packages is the current one)
+        self.trip_departures = []  # When each of those loads leaves the hub
 
     def load_package(self, package_id):
         """
@@ -62,6 +91,31 @@ class Truck:
             return True
         return False
 
+    def add_trip(self, package_ids, departure_time, weight=0.0):
+        """
+        Plan another load for this truck after the ones it already has.
+
+        The first trip is loaded right away; later ones get loaded when
+        the truck comes back to the hub.
+
+        Args:
+            package_ids (list): Packages for this trip
+            departure_time (datetime): When the trip leaves the hub
+            weight (float): Total weight of those packages
+        """
+        if len(package_ids) > self.capacity:
+            raise ValueError(f"Truck {self.truck_id} can't carry {len(package_ids)} packages "
+                             f"on one trip (capacity {self.capacity})")
+        if self.max_weight is not None and weight > self.max_weight:
+            raise ValueError(f"Truck {self.truck_id} can't carry {weight:g} on one trip "
+                             f"(max weight {self.max_weight:g})")
+
+        self.trips.append(list(package_ids))
+        self.trip_departures.append(departure_time)
+        if len(self.trips) == 1:
+            self.packages = list(package_ids)
+            self.departure_time = departure_time
+
     def get_package_count(self):
         """How many packages are on this truck right now."""
         return len(self.packages)
@@ -77,41 +131,135 @@ class DistanceManager:
 
     I load the distance data from the CSV file and provide methods
     to look up how far it is between any two places.
+
+    The matrix is a list of lists by default. If NumPy is installed it can
+    be stored as one contiguous NumPy array instead (backend="numpy"), which
+    lets the router find the nearest stop with one vectorized argmin.
+
+    Distances are the same in both directions, so the full matrix stores
+    everything twice. With storage="triangular" only the bottom-left triangle
+    is kept, packed into one flat array, and distance(i, j) is found with
+    i * (i + 1) // 2 + j (after swapping so i >= j). That's half the cells,
+    and a flat array of floats is much smaller than a list of lists.
+
+    It can also load a compiled distance table (see distance_file.py). That
+    file is memory-mapped and the distances are read right out of it as a
+    packed triangle, so loading is instant even for a huge city.
     """
 
-    def __init__(self):
-        """Start with empty data - we'll load it from the CSV later."""
+    # Ways the distance matrix can be stored
+    LIST = "list"
+    NUMPY = "numpy"
+    FULL = "full"
+    TRIANGULAR = "triangular"
+
+    # Used when an address can't be found in the distance table
+    UNKNOWN_LOCATION = -1
+    DEFAULT_DISTANCE = 5.0
+
+    DEFAULT_DISTANCE_FILE = os.path.join(DATA_DIR, 'WGUPS_Distance_Table.csv')
+
+    def __init__(self, backend=LIST, dtype="float64", storage=FULL):
+        """
+        Start with empty data - we'll load it from the CSV later.
+
+        Args:
+            backend (str): DistanceManager.LIST or DistanceManager.NUMPY
+            dtype (str): NumPy number type for the matrix ("float64" or "float32")
+            storage (str): DistanceManager.FULL or DistanceManager.TRIANGULAR
+                (compiled files are always triangular)
+        """
+        if backend not in (self.LIST, self.NUMPY):
+            raise ValueError(f"Unknown distance backend: {backend}")
+        if storage not in (self.FULL, self.TRIANGULAR):
+            raise ValueError(f"Unknown distance storage: {storage}")
+        if backend == self.NUMPY and np is None:
+            print("Warning: NumPy is not installed, using the list distance backend")
+            backend = self.LIST
+
+        self.backend = backend
+        self.dtype = dtype
+        self.storage = storage
         self.addresses = []  # All the delivery addresses
         self.distance_matrix = []  # 2D grid of distances between places
+        # Packed triangle of distances (used instead of distance_matrix when set)
+        self.packed_distances = None
+        self.distance_file = None  # Open compiled file, if that's what got loaded
         self.address_to_index = {}  # Quick lookup to find address positions
+        self._lowercase_addresses = []  # (lowercase address, index) for fuzzy matching
+
+        # Keep count of how addresses got matched so bad data is easy to spot
+        self.fuzzy_fallbacks = 0
+        self.fuzzy_matches = {}  # address -> how many times it needed fuzzy matching
+        self.unresolved_addresses = {}  # address -> how many times it couldn't be found
 
-    def load_distance_data(self):
+    def load_distance_data(self, file_path=DEFAULT_DISTANCE_FILE):
         """
         Load the distance table from the WGUPS CSV file.
 
         This uses the exact distances from the provided table -
         I'm not calculating anything, just using what's given.
+
+        Args:
+            file_path (str): The distance table CSV, or a compiled .wgd file
         """
-        # Get the data from the CSV file
-        self.distance_matrix, self.addresses = self._load_wgups_csv()
+        if is_distance_file(file_path):
+            # Compiled table - map it and read distances in place
+            self._load_compiled(file_path)
+        else:
+            # Get the data from the CSV file
+            distances, self.addresses = self._load_wgups_csv(file_path)
+            if self.storage == self.TRIANGULAR:
+                self.distance_matrix = None
+                self.packed_distances = distances
+            else:
+                self.distance_matrix = distances
+                self.packed_distances = None
 
         # Make it easy to find addresses by name
         for i, address in enumerate(self.addresses):
             self.address_to_index[address] = i
 
-        print(f"✓ Loaded {len(self.addresses)} addresses from ../data/WGUPS_Distance_Table.csv")
+        # Lowercase everything once instead of on every fuzzy lookup
+        self._lowercase_addresses = [(address.lower(), i) for i, address in enumerate(self.addresses)]
+
+        print(f"✓ Loaded {len(self.addresses)} addresses from {file_path}")
+
+    def _load_compiled(self, file_path):
+        """
+        Memory-map a compiled distance table instead of parsing a CSV.
+
+        Only the address list is read now; the distances stay in the file.
 
-    def _load_wgups_csv(self):
+        Args:
+            file_path (str): Path to the .wgd file
+        """
+        if self.distance_file is not None:
+            self.distance_file.close()
+
+        self.distance_file = DistanceFile(file_path)
+        self.addresses = self.distance_file.addresses
+        self.distance_matrix = None
+
+        if self.backend == self.NUMPY:
+            self.packed_distances = self.distance_file.numpy_distances(np)
+        else:
+            self.packed_distances = self.distance_file.distances()
+
+    def _load_wgups_csv(self, file_path):
         """
         Actually read the WGUPS Distance Table CSV file.
 
+        Args:
+            file_path (str): The distance table CSV
+
         Returns:
-            tuple: The distance matrix and list of addresses
+            tuple: The distance matrix (or packed triangle) and list of addresses
         """
         addresses = []
         distance_matrix = []
 
-        with open('../data/WGUPS_Distance_Table.csv', 'r', newline='', encoding='utf-8') as file:
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
             reader = csv.reader(file)
 
             # First row has the addresses
@@ -138,8 +286,18 @@ class DistanceManager:
 
                     distance_matrix.append(row_distances[:len(addresses)])
 
+        # Triangular storage keeps the half the CSV already has - no mirroring
+        if self.storage == self.TRIANGULAR:
+            packed_triangle = self._pack_triangle(distance_matrix, len(addresses))
+            if self.backend == self.NUMPY:
+                packed_triangle = np.array(packed_triangle, dtype=self.dtype)
+            return packed_triangle, addresses
+
         # The WGUPS table only has half the distances, so I need to mirror them
-        symmetric_matrix = self._make_symmetric_from_wgups_data(distance_matrix, len(addresses))
+        if self.backend == self.NUMPY:
+            symmetric_matrix = self._make_symmetric_numpy(distance_matrix, len(addresses))
+        else:
+            symmetric_matrix = self._make_symmetric_from_wgups_data(distance_matrix, len(addresses))
 
         return symmetric_matrix, addresses
 
@@ -175,6 +333,73 @@ class DistanceManager:
 
         return symmetric_matrix
 
+    def _pack_triangle(self, triangular_matrix, size):
+        """
+        Pack the CSV's bottom-left triangle into one flat array of floats.
+
+        This follows the same rule as _make_symmetric_from_wgups_data: a
+        bottom-left distance wins, and a top-right value is only used where
+        the bottom-left one is missing. The WGUPS file has no top-right
+        values, so normally each row is copied in with one slice.
+
+        Args:
+            triangular_matrix: The half-filled matrix from the CSV
+            size: How many addresses there are
+
+        Returns:
+            array: size * (size + 1) / 2 distances, indexed with packed_index()
+        """
+        packed_triangle = array('d', bytes(8 * packed_size(size)))
+        rows = triangular_matrix[:size]
+
+        # Top-right values first, so bottom-left ones can overwrite them
+        has_upper_values = False
+        for i, row in enumerate(rows):
+            for j in range(i + 1, size):
+                if row[j] > 0:
+                    has_upper_values = True
+                    packed_triangle[packed_index(i, j)] = row[j]
+
+        for i, row in enumerate(rows):
+            start = i * (i + 1) // 2
+            if not has_upper_values:
+                # Row i of the bottom-left triangle, diagonal stays 0
+                packed_triangle[start:start + i] = array('d', row[:i])
+            else:
+                for j in range(i):
+                    if row[j] > 0:
+                        packed_triangle[start + j] = row[j]
+
+        return packed_triangle
+
+    def _make_symmetric_numpy(self, triangular_matrix, size):
+        """
+        Same job as _make_symmetric_from_wgups_data, done with whole-array NumPy steps.
+
+        Just like the loop version, a distance from the bottom-left triangle
+        wins, and the top-right value is only used where the bottom-left one
+        is missing.
+
+        Args:
+            triangular_matrix: The half-filled matrix from the CSV
+            size: How big the matrix should be
+
+        Returns:
+            numpy.ndarray: Complete size x size matrix with distances in both directions
+        """
+        table = np.zeros((size, size), dtype=self.dtype)
+        rows = triangular_matrix[:size]
+        if rows:
+            table[:len(rows)] = np.asarray(rows, dtype=self.dtype)
+
+        # For every top-right cell, take the mirrored bottom-left distance if there
+        # is one, otherwise whatever the CSV had in the top-right cell
+        mirrored = np.tril(table, -1).T
+        upper = np.where(mirrored > 0, mirrored, np.triu(np.where(table > 0, table, 0), 1))
+
+        # Copy the top-right half back down - the diagonal stays 0
+        return np.ascontiguousarray(upper + upper.T)
+
     def get_distance(self, address1, address2):
         """
         Find the distance between two addresses.
@@ -186,22 +411,82 @@ class DistanceManager:
         Returns:
             float: Distance in miles
         """
-        # Handle the special case where package 9 has the wrong address initially
-        if address1 == "Third District Juvenile Court":
-            address1 = "410 S State St"
-        if address2 == "Third District Juvenile Court":
-            address2 = "410 S State St"
-
         # Find these addresses in our list
-        index1 = self._find_address_index(address1)
-        index2 = self._find_address_index(address2)
+        index1 = self.resolve_address(address1)
+        index2 = self.resolve_address(address2)
 
-        if index1 is not None and index2 is not None:
-            return self.distance_matrix[index1][index2]
-        else:
+        return self.get_distance_by_index(index1, index2)
+
+    def get_distance_by_index(self, index1, index2):
+        """
+        Find the distance between two locations that were already resolved.
+
+        This is the fast path for the routing loops - no string matching at
+        all, just a straight lookup in the matrix.
+
+        Args:
+            index1 (int): Location index we're starting from
+            index2 (int): Location index we're going to
+
+        Returns:
+            float: Distance in miles
+        """
+        if index1 == self.UNKNOWN_LOCATION or index2 == self.UNKNOWN_LOCATION:
             # If I can't find the address, just use a default distance
             print(f"Warning: Address not found, using default distance")
-            return 5.0
+            return self.DEFAULT_DISTANCE
+
+        if self.packed_distances is not None:
+            return float(self.packed_distances[packed_index(index1, index2)])
+        if self.backend == self.NUMPY:
+            return float(self.distance_matrix[index1, index2])
+        return self.distance_matrix[index1][index2]
+
+    def distance_row(self, from_index, location_indexes):
+        """
+        Distances from one location to many at once (NumPy backend only).
+
+        Args:
+            from_index (int): Location we're measuring from
+            location_indexes (numpy.ndarray): Locations we're measuring to
+
+        Returns:
+            numpy.ndarray: One distance per entry in location_indexes
+        """
+        if self.packed_distances is None:
+            return self.distance_matrix[from_index, location_indexes]
+
+        # Same formula as packed_index(), applied to the whole array at once
+        larger = np.maximum(location_indexes, from_index)
+        smaller = np.minimum(location_indexes, from_index)
+        return self.packed_distances[larger * (larger + 1) // 2 + smaller]
+
+    def resolve_address(self, address):
+        """
+        Turn an address into its location index in the distance table.
+
+        Packages call this once when they're loaded so routing never has to
+        match strings again.
+
+        Args:
+            address (str): The address to find
+
+        Returns:
+            int: Location index, or UNKNOWN_LOCATION if it isn't in the table
+        """
+        index = self._find_address_index(address)
+        if index is None:
+            self.unresolved_addresses[address] = self.unresolved_addresses.get(address, 0) + 1
+            return self.UNKNOWN_LOCATION
+        return index
+
+    def report_address_resolution(self):
+        """Print how many addresses needed fuzzy matching or couldn't be found."""
+        print(f"Address fuzzy-match fallbacks: {self.fuzzy_fallbacks}")
+        for address, count in sorted(self.fuzzy_matches.items()):
+            print(f"  Fuzzy matched: '{address}' ({count}x)")
+        for address, count in sorted(self.unresolved_addresses.items()):
+            print(f"  ⚠️  Not in distance table: '{address}' ({count}x)")
 
     def _find_address_index(self, address):
         """
@@ -221,8 +506,11 @@ class DistanceManager:
 
         # If that doesn't work, try fuzzy matching for similar addresses
         address_lower = address.lower()
-        for stored_address, index in self.address_to_index.items():
-            if stored_address.lower() in address_lower or address_lower in stored_address.lower():
+        for stored_address, index in self._lowercase_addresses:
+            if stored_address in address_lower or address_lower in stored_address:
+                # Count it - a fuzzy match usually means the package data is off
+                self.fuzzy_fallbacks += 1
+                self.fuzzy_matches[address] = self.fuzzy_matches.get(address, 0) + 1
                 return index
 
         return None
@@ -233,178 +521,510 @@ class DeliveryRouter:
     This is the main brain of the operation.
 
     It uses a greedy nearest neighbor algorithm with some special handling
-    for the weird constraints to figure out good delivery routes.
+    for the weird constraints to figure out good delivery routes, then
+    cleans each route up with local search (see route_optimizer.py).
     """
 
-    def __init__(self):
-        """Set up all the pieces I need to run the delivery simulation."""
+    # How the starting route for each truck is built
+    NEAREST_NEIGHBOR = "nearest_neighbor"
+    DEADLINE_INSERTION = "deadline_insertion"
+
+    # Optional wall-clock limit on each truck's route improvement, in seconds.
+    # None leaves just the move cap (see route_optimizer.py), so the same trip
+    # always gets the same route - a time limit can cut a busy machine short
+    IMPROVEMENT_TIME_BUDGET = None
+
+    # A truck can go back out for a second load once it's returned to the hub
+    MAX_TRIPS_PER_TRUCK = 2
+
+    # How many times a wave gets re-assigned around the real departure times
+    PLANNING_ROUNDS = 3
+
+    # Worker processes for planning routes (1 = plan each route as its truck leaves)
+    ROUTE_WORKERS = 1
+
+    HUB_ADDRESS = WGUPS_HUB_ADDRESS
+    PACKAGE_FILE = os.path.join(DATA_DIR, 'WGUPS_Packages.csv')
+    ADDRESS_CORRECTIONS_FILE = os.path.join(DATA_DIR, 'WGUPS_Address_Corrections.csv')
+
+    # Three trucks and only two drivers (see fleet.py for the file layout)
+    FLEET_FILE = os.path.join(DATA_DIR, 'WGUPS_Fleet.json')
+
+    def __init__(self, distance_backend=DistanceManager.LIST,
+                 distance_file=DistanceManager.DEFAULT_DISTANCE_FILE,
+                 distance_storage=DistanceManager.FULL, route_improvers=None,
+                 route_strategy=DEADLINE_INSERTION, driver_count=None,
+                 max_trips_per_truck=MAX_TRIPS_PER_TRUCK, route_workers=ROUTE_WORKERS,
+                 package_file=None, corrections_file=None, hub_address=HUB_ADDRESS,
+                 truck_count=None, start_time=None, fleet=None):
+        """
+        Set up all the pieces I need to run the delivery simulation.
+
+        Args:
+            distance_backend (str): How to store the distance matrix
+                (DistanceManager.LIST, or DistanceManager.NUMPY if it's installed)
+            distance_file (str): Distance table CSV or compiled .wgd file
+            distance_storage (str): DistanceManager.FULL or DistanceManager.TRIANGULAR
+            route_improvers (list): Improvement stages to run after nearest neighbor
+                (None = 2-opt then Or-opt, [] = no improvement)
+            route_strategy (str): NEAREST_NEIGHBOR, or DEADLINE_INSERTION to build
+                routes that meet deadlines on their own
+            driver_count (int): How many trucks can be out at the same time
+                (overrides the fleet's driver count)
+            max_trips_per_truck (int): How many loads one truck can take out in a day
+            route_workers (int): Processes to plan routes on; more than 1 plans
+                every trip's route in parallel before the simulation starts
+            package_file (str): Package CSV (defaults to the WGUPS file)
+            corrections_file (str): Address corrections CSV (defaults to the
+                WGUPS one when the package file is the default, none otherwise)
+            hub_address (str): Address of the hub every truck starts from
+            truck_count (int): Use this many standard trucks instead of the fleet file
+            start_time (datetime): When the day starts (defaults to the shift start)
+            fleet (FleetConfig): The trucks, drivers and shift (defaults to the
+                WGUPS fleet file)
+        """
         self.package_table = HashTable()
-        self.distance_manager = DistanceManager()
-        self.trucks = [Truck(1), Truck(2), Truck(3)]
+        self.distance_manager = DistanceManager(backend=distance_backend, storage=distance_storage)
+        self.distance_file = distance_file
+        self.hub_address = hub_address
+
+        # The fleet comes from its config file unless it's given directly
+        if fleet is None:
+            fleet = FleetConfig.uniform(truck_count) if truck_count else load_fleet_config(self.FLEET_FILE)
+        if driver_count is not None:
+            # A copy, so the caller's fleet keeps its own driver count (and it gets checked again)
+            fleet = FleetConfig(fleet.trucks, driver_count, fleet.shift_start, fleet.shift_end)
+        self.fleet = fleet
+        self.trucks = [Truck(spec.truck_id, hub_address, spec.capacity, spec.speed, spec.max_weight)
+                       for spec in fleet.trucks]
+
+        # Where the packages come from - the WGUPS files unless told otherwise
+        if package_file is None:
+            self.package_file = self.PACKAGE_FILE
+            self.corrections_file = corrections_file or self.ADDRESS_CORRECTIONS_FILE
+        else:
+            self.package_file = package_file
+            self.corrections_file = corrections_file
         self.total_distance = 0.0
-
-        # Keep track of time throughout the day
-        self.start_time = datetime.datetime(2024, 1, 1, 8, 0)  # Start at 8:00 AM
+        self.constraints = ConstraintSet()  # Filled in from the special notes
+        self.manifest_report = None  # ManifestReport from load_package_data()
+
+        if route_improvers is None:
+            route_improvers = [TwoOptImprover(), OrOptImprover()]
+        self.route_improvers = route_improvers
+        self.route_strategy = route_strategy
+        self.improvement_time_budget = self.IMPROVEMENT_TIME_BUDGET
+        self.driver_count = fleet.drivers
+        self.max_trips_per_truck = max_trips_per_truck
+        self.package_trips = {}  # package_id -> (truck, trip number) once trips are planned
+        self.route_workers = route_workers
+        self.planned_routes = {}  # (truck_id, trip number) -> (departure, route) from plan_routes()
+        self.package_changes = []  # PackageChange objects the simulation applies during the day
+        self.correction_locations = {}  # package_id -> location index of its corrected address
+        self.timeline = None  # DeliveryTimeline from the last run_delivery_simulation()
+
+        # Keep track of time throughout the day - it starts with the shift (8:00 AM for WGUPS)
+        self.start_time = start_time or (datetime.datetime(2024, 1, 1)
+                                         + datetime.timedelta(minutes=fleet.shift_start))
         self.current_time = self.start_time
 
     def load_package_data(self):
         """
-        Load all 40 packages from the CSV file into my hash table.
+        Load the packages from the package CSV into my hash table.
+
+        The file is streamed and every row is checked on the way in (see
+        manifest.py) - a row with a problem is left out and reported, not
+        dropped quietly. Each address is matched to its spot in the distance
+        table right here, once, so the distance data has to be loaded first.
+        The special notes are parsed into self.constraints as the packages
+        go in, and a "Wrong address listed" package keeps its listed address
+        until its correction comes in.
 
-        This reads the package info and handles any special cases
-        like package 9's wrong address.
+        Returns:
+            ManifestReport: Counts, problems and rows/s for the load
         """
         print("Loading package data...")
 
-        with open('../data/WGUPS_Packages.csv', 'r', newline='', encoding='utf-8') as file:
-            reader = csv.reader(file)
+        self.manifest_report = ingest_manifest(self.package_file, self.package_table,
+                                               self.distance_manager.resolve_address, self.constraints)
 
-            for row in reader:
-                if len(row) >= 7 and row[0].strip().isdigit():  # Make sure it's a valid package row
-                    # Package 9 starts with the wrong address until 10:20 AM
-                    if row[0].strip() == "9":
-                        address = "Third District Juvenile Court"  # Wrong address initially
-                    else:
-                        address = row[1].strip()
-
-                    self.package_table.insert(
-                        int(row[0].strip()),  # package_id
-                        address,  # delivery_address
-                        row[2].strip(),  # delivery_city
-                        row[3].strip(),  # delivery_state
-                        row[4].strip(),  # delivery_zip
-                        row[5].strip(),  # delivery_deadline
-                        float(row[6].strip()),  # package_weight
-                        row[7].strip() if len(row) > 7 else ""  # special_notes
-                    )
-
-        print(f"Loaded {self.package_table.size} packages from ../data/WGUPS_Packages.csv")
+        if self.corrections_file:
+            for correction in load_address_corrections(self.corrections_file):
+                self.constraints.add_correction(correction)
+
+        print(f"Loaded {self.package_table.size} packages from {self.package_file}")
+        self.manifest_report.print_summary()
+        self.distance_manager.report_address_resolution()
+        self.constraints.report()
+        return self.manifest_report
 
     def assign_packages_to_trucks(self):
         """
-        Figure out which packages go on which trucks.
-
-        Updated to correctly handle the requirement that packages 13, 14, 15, 16, 19, 20
-        must ALL be delivered together on the same truck.
+        Figure out which packages go on which trucks, and when each load leaves.
+
+        Everything comes from the special notes now (see constraints.py):
+        truck restrictions, packages that arrive late, and packages that
+        have to be delivered together. TruckAssigner puts the packages on
+        trucks by capacity, deadlines and neighborhood.
+
+        There are fewer drivers than trucks, so not every load can leave
+        right away. dispatch_trips() gives the drivers to the most urgent
+        loads first, and everything else leaves when a driver gets back.
+        If that pushes a load so late that packages would miss their
+        deadlines, the wave is assigned again knowing when each truck will
+        really leave. Whatever doesn't fit on the first wave goes out as a
+        second trip once a truck is back at the hub (as long as it's back
+        before the shift ends).
+
+        A truck's room is counted in packages and, if the fleet gives it a
+        weight limit, in total package weight too.
         """
         print("Assigning packages to trucks...")
 
-        # Get all the packages
-        all_packages = self.package_table.get_all_packages()
+        hub_index = self.distance_manager.resolve_address(self.hub_address)
+        start_minutes = self._to_minutes(self.start_time)
+        assigner = TruckAssigner(self.distance_manager.get_distance_by_index, hub_index,
+                                 min(truck.speed for truck in self.trucks), start_minutes)
+        trucks_by_id = {truck.truck_id: truck for truck in self.trucks}
+
+        def plan_trip(truck_id, package_ids, departure):
+            return self._plan_trip(trucks_by_id[truck_id], package_ids, departure, hub_index)
+
+        # A wrong-address package can't leave before its correction, so it's
+        # assigned by where it's really going
+        remaining = [(package_id, self._delivery_location(package_id, location_index), deadline, weight)
+                     for package_id, location_index, deadline, weight in self.package_table.iter_packages(
+                         fields=('package_id', 'location_index', 'deadline_minutes', 'package_weight'))]
+        weights = {package[0]: package[3] for package in remaining}
+        driver_free = [start_minutes] * self.driver_count
+        truck_free = {truck.truck_id: start_minutes for truck in self.trucks}
+        trips = []
+        unassigned = []
+
+        for _ in range(self.max_trips_per_truck):
+            if not remaining:
+                break
+
+            # Only trucks that are back before the shift ends can go out again
+            on_shift = [truck for truck in self.trucks if truck_free[truck.truck_id] < self.fleet.shift_end]
+            if not on_shift:
+                unassigned = sorted(package[0] for package in remaining)
+                break
 
-        # Sort out the packages with special requirements
-        truck2_only = [3, 18, 36, 38]  # These MUST go on truck 2
-        delayed_packages = [6, 25, 28, 32]  # Can't leave until 9:05 AM
+            # Start by assuming every truck leaves as soon as it's back, then
+            # re-assign around the departures the drivers actually allow
+            available = dict(truck_free)
+            best = None
+            for _ in range(self.PLANNING_ROUNDS):
+                loads, unassigned = assigner.assign(
+                    [(truck.truck_id, truck.capacity, available[truck.truck_id], truck.max_weight)
+                     for truck in on_shift],
+                    remaining, self.constraints, fleet_truck_ids=trucks_by_id)
+                wave_drivers, wave_trucks = list(driver_free), dict(truck_free)
+                wave = dispatch_trips(loads, wave_drivers, wave_trucks, plan_trip)
+
+                late = sum(trip.late for trip in wave)
+                if best is None or (len(unassigned), late) < (len(best[1]), best[2]):
+                    best = (wave, unassigned, late, wave_drivers, wave_trucks)
+                if late == 0:
+                    break
+                for trip in wave:
+                    available[trip.truck_id] = trip.departure
+
+            wave, unassigned, _, driver_free, truck_free = best
+            trips.extend(wave)
+            left_over = set(unassigned)
+            remaining = [package for package in remaining if package[0] in left_over]
+
+        # Actually load the packages onto trucks, trip by trip
+        self.package_trips = {}
+        for trip in sorted(trips, key=lambda trip: (trip.truck_id, trip.departure)):
+            truck = trucks_by_id[trip.truck_id]
+            truck.add_trip(trip.package_ids, self._from_minutes(trip.departure),
+                           sum(weights[package_id] for package_id in trip.package_ids))
+            for pkg_id in trip.package_ids:
+                self.package_trips[pkg_id] = (truck, len(truck.trips) - 1)
+                self.package_table.update_package_status(pkg_id, f"Loaded on Truck {truck.truck_id}",
+                                                         truck_id=truck.truck_id)
+
+        print(self.fleet.describe())
+        for truck in self.trucks:
+            if not truck.trips:
+                # Empty trucks just stay at the start time
+                truck.departure_time = self.start_time
+                print(f"Truck {truck.truck_id}: 0 packages")
+                continue
 
-        # CORRECTED: All six packages must be delivered together on the same truck
-        # Based on the special notes:
-        # - Package 14: "Must be delivered with 15, 19"
-        # - Package 16: "Must be delivered with 13, 19"
-        # - Package 20: "Must be delivered with 13, 15"
-        # This creates a chain linking all 6 packages: 13, 14, 15, 16, 19, 20
-        linked_group = [13, 14, 15, 16, 19, 20]
+            for number, (package_ids, departure) in enumerate(zip(truck.trips, truck.trip_departures), 1):
+                trip_text = f" trip {number}" if len(truck.trips) > 1 else ""
+                print(f"Truck {truck.truck_id}{trip_text}: {len(package_ids)} packages, "
+                      f"leaves at {departure.strftime('%I:%M %p')}")
+
+        # Verify each linked group is together
+        for group in self.constraints.co_delivery_groups():
+            group_trips = {self.package_trips.get(package_id) for package_id in group}
+            group_text = ", ".join(str(package_id) for package_id in group)
+            if len(group_trips) == 1 and None not in group_trips:
+                print(f"✓ Packages {group_text} successfully grouped on Truck {group_trips.pop()[0].truck_id}")
+            else:
+                print(f"⚠️  Warning: Linked group packages {group_text} may be split across trucks")
 
-        # Separate packages by deadline priority
-        early_deadline = []
-        regular_packages = []
+        for trip in trips:
+            leaves = self._from_minutes(trip.departure).strftime('%I:%M %p')
+            if trip.late:
+                print(f"⚠️  Warning: Truck {trip.truck_id}'s trip leaving at {leaves} is planned with "
+                      f"{trip.late} late packages")
+            if trip.return_minutes > self.fleet.shift_end:
+                print(f"⚠️  Warning: Truck {trip.truck_id}'s trip leaving at {leaves} gets back at "
+                      f"{self._from_minutes(trip.return_minutes).strftime('%I:%M %p')}, after the shift ends")
 
-        for package in all_packages:
-            package_id = package.package_id
+        if unassigned:
+            print(f"⚠️  Warning: no room for packages {unassigned} - they stay at the hub")
 
-            # Skip packages that have special constraints for now
-            if package_id in truck2_only or package_id in delayed_packages:
-                continue
-            elif package_id in linked_group:
-                continue  # Handle this group separately
-            elif package.delivery_deadline not in ["EOD"]:
-                early_deadline.append(package_id)
-            else:
-                regular_packages.append(package_id)
+    def _plan_trip(self, truck, package_ids, departure, hub_index):
+        """
+        Route one load from the hub and see how it goes.
 
-        # Now assign packages to trucks strategically
+        Args:
+            truck (Truck): The truck making the trip
+            package_ids (list): Packages on this trip
+            departure (int): Minutes after midnight it leaves the hub
+            hub_index (int): Location index of the hub
 
-        # Check deadlines for the linked group - Package 15 has 9:00 AM deadline!
-        # This group MUST be on a truck that leaves early (8:00 AM)
+        Returns:
+            tuple: (minutes it's back at the hub, rounded up, and the number of late packages)
+        """
+        package_locations = {}
+        package_deadlines = {}
+        for package_id in package_ids:
+            package = self.package_table.lookup_view(package_id)
+            package_locations[package_id] = self._delivery_location(package_id, package.location_index,
+                                                                    departure * SECONDS_PER_MINUTE)
+            package_deadlines[package_id] = package.deadline_minutes * SECONDS_PER_MINUTE
+
+        route = self.calculate_route_for_truck(truck, package_ids=package_ids,
+                                               departure_time=self._from_minutes(departure),
+                                               start_index=hub_index)
+        late, return_seconds = self._trip_timeline(truck, route, package_locations, package_deadlines,
+                                                   hub_index, departure * SECONDS_PER_MINUTE)
+        return minutes_rounded_up(return_seconds), late
+
+    def _delivery_location(self, package_id, location_index, seconds=None):
+        """
+        Where a package really goes if it's delivered at this time.
 
-        # Truck 1: Linked group + early deadlines + some regular packages (leaves at 8:00 AM)
-        # This truck handles the critical 9:00 AM deadline for package 15
-        truck1_packages = linked_group + early_deadline[:6] + regular_packages[:4]
+        A "Wrong address listed" package is at its listed (wrong) location
+        until the correction comes in, and at the corrected address after
+        that, even while the package table still has the listed one.
 
-        # Truck 2: Truck 2 only packages + remaining early deadlines + regulars (leaves at 8:00 AM)
-        truck2_packages = truck2_only + early_deadline[6:] + regular_packages[4:8]
+        Args:
+            package_id (int): The package
+            location_index (int): Its location in the package table
+            seconds (int): Seconds after midnight it's delivered (None = some
+                time after the correction)
 
-        # Truck 3: Delayed packages + remaining packages (leaves at 9:05 AM)
-        remaining_regular = regular_packages[8:]
-        truck3_packages = delayed_packages + remaining_regular
+        Returns:
+            int: The location index to drive to
+        """
+        correction = self.constraints.correction_for(package_id)
+        if correction is None or (seconds is not None and seconds < correction.minutes * SECONDS_PER_MINUTE):
+            return location_index
+        corrected = self.correction_locations.get(package_id)
+        if corrected is None:
+            corrected = self.correction_locations[package_id] = \
+                self.distance_manager.resolve_address(correction.address)
+        return corrected
+
+    def plan_routes(self, workers=None):
+        """
+        Plan the route for every trip up front, on several processes.
 
-        # Actually load the packages onto trucks
-        for pkg_id in truck1_packages[:16]:  # Don't exceed 16 packages per truck
-            if self.trucks[0].load_package(pkg_id):
-                self.package_table.update_package_status(pkg_id, "Loaded on Truck 1")
+        Each trip's route only depends on its packages, where it starts
+        (the hub) and when it leaves, so once the trips are assigned they
+        can all be planned at the same time. The simulation then uses these
+        routes instead of planning each one as its truck leaves - unless the
+        truck ends up leaving at a different time than planned.
 
-        for pkg_id in truck2_packages[:16]:
-            if self.trucks[1].load_package(pkg_id):
-                self.package_table.update_package_status(pkg_id, "Loaded on Truck 2")
+        Args:
+            workers (int): How many processes to use (defaults to route_workers)
 
-        for pkg_id in truck3_packages[:16]:
-            if self.trucks[2].load_package(pkg_id):
-                self.package_table.update_package_status(pkg_id, "Loaded on Truck 3")
+        Returns:
+            float: Seconds the planning took
+        """
+        workers = workers or self.route_workers
+        hub_index = self.distance_manager.resolve_address(self.hub_address)
 
-        # Handle any leftover packages
-        all_assigned = (set(truck1_packages[:16]) |
-                        set(truck2_packages[:16]) |
-                        set(truck3_packages[:16]))
+        tasks = []
+        for truck in self.trucks:
+            for trip, (package_ids, departure) in enumerate(zip(truck.trips, truck.trip_departures)):
+                packages = [(package_id, view.location_index, view.delivery_deadline)
+                            for package_id, view in ((package_id, self.package_table.lookup_view(package_id))
+                                                     for package_id in package_ids)]
+                tasks.append(((truck.truck_id, trip), packages, departure, hub_index, truck.speed))
 
-        remaining_packages = [p.package_id for p in all_packages if p.package_id not in all_assigned]
+        routes, seconds = plan_routes_parallel(self, tasks, workers)
 
-        # Make sure package 9 gets assigned somewhere
-        if 9 not in all_assigned:
-            remaining_packages.append(9)
+        self.planned_routes = {}
+        for key, _, departure, _, _ in tasks:
+            self.planned_routes[key] = (departure, routes[key])
 
-        # Put remaining packages on whichever truck has space
-        for pkg_id in remaining_packages:
-            for truck in self.trucks:
-                if not truck.is_full():
-                    truck.load_package(pkg_id)
-                    self.package_table.update_package_status(pkg_id, f"Loaded on Truck {truck.truck_id}")
-                    break
+        print(f"Planned {len(tasks)} routes on {workers} worker processes in {seconds * 1000:.0f} ms")
+        return seconds
 
-        # Set when each truck leaves the hub
-        self.trucks[0].departure_time = datetime.datetime(2024, 1, 1, 8, 0)  # 8:00 AM - Critical for 9:00 AM deadline
-        self.trucks[1].departure_time = datetime.datetime(2024, 1, 1, 8, 0)  # 8:00 AM
-        self.trucks[2].departure_time = datetime.datetime(2024, 1, 1, 9, 5)  # 9:05 AM (after delayed packages arrive)
+    def route_for_trip(self, truck, trip):
+        """
+        The route for a truck's trip, as it leaves the hub.
 
-        print(f"Truck 1: {len(self.trucks[0].packages)} packages (includes linked group 13,14,15,16,19,20)")
-        print(f"Truck 2: {len(self.trucks[1].packages)} packages (truck 2 only packages)")
-        print(f"Truck 3: {len(self.trucks[2].packages)} packages (delayed packages)")
+        Uses the route from plan_routes() if the truck is leaving when that
+        route was planned for, and plans a fresh one otherwise.
 
-        # Verify the linked group is together
-        truck1_packages_set = set(self.trucks[0].packages)
-        linked_group_set = set(linked_group)
-        if linked_group_set.issubset(truck1_packages_set):
-            print("✓ Packages 13, 14, 15, 16, 19, 20 successfully grouped on Truck 1")
-        else:
-            print("⚠️  Warning: Linked group packages may be split across trucks")
-    def calculate_route_for_truck(self, truck):
+        Args:
+            truck (Truck): The truck that's leaving
+            trip (int): Which of its trips this is
+
+        Returns:
+            list: Package IDs in the order they should be delivered
+        """
+        planned = self.planned_routes.get((truck.truck_id, trip))
+        if (planned is not None and planned[0] == truck.departure_time
+                and sorted(planned[1]) == sorted(truck.packages)):
+            return list(planned[1])
+        return self.calculate_route_for_truck(truck)
+
+    def change_package(self, package_id, at_time, address=None, city=None, state=None, zip_code=None,
+                       deadline=None, available_at=None):
+        """
+        Have a package's details change partway through the day.
+
+        When the simulation gets to at_time it updates the package and, if
+        it's already out on a truck, re-plans just the rest of that truck's
+        route from where it is. Call this before run_delivery_simulation().
+
+        Args:
+            package_id (int): Which package
+            at_time (str): When the change happens, like "10:20 AM"
+            address (str): New delivery address (city/state/zip default to the old ones)
+            city (str): New city
+            state (str): New state
+            zip_code (str): New zip code
+            deadline (str): New deadline, like "10:30 AM" or "EOD"
+            available_at (str): New time it reaches the hub, like "9:05 AM"
+
+        Returns:
+            PackageChange: The scheduled change
+        """
+        change = PackageChange(package_id, deadline_to_minutes(at_time), address, city, state, zip_code,
+                               deadline=deadline,
+                               available_minutes=None if available_at is None else deadline_to_minutes(available_at))
+        self.package_changes.append(change)
+        return change
+
+    def package_departure(self, package_id):
+        """
+        When the trip carrying a package leaves the hub.
+
+        Args:
+            package_id (int): Which package
+
+        Returns:
+            datetime: The trip's departure, or None if it isn't on a truck
+        """
+        planned = self.package_trips.get(package_id)
+        if planned is None:
+            return None
+        truck, trip = planned
+        return truck.trip_departures[trip]
+
+    def _to_minutes(self, moment):
+        """A datetime on the delivery day -> minutes after midnight."""
+        return moment.hour * 60 + moment.minute
+
+    def _from_minutes(self, minutes):
+        """Minutes after midnight -> a datetime on the delivery day."""
+        return self.start_time.replace(hour=0, minute=0) + datetime.timedelta(minutes=minutes)
+
+    def _to_seconds(self, moment):
+        """A datetime on the delivery day -> seconds after midnight."""
+        return seconds_of_day(moment)
+
+    def _from_seconds(self, seconds):
+        """Seconds after midnight -> a datetime on the delivery day."""
+        return at_seconds(self.start_time, seconds)
+
+    def calculate_route_for_truck(self, truck, package_ids=None, departure_time=None, start_index=None):
         """
         Figure out the best order to deliver packages for one truck.
 
-        I'm using the nearest neighbor approach - always go to the closest
-        undelivered package next.
+        By default the route is built by deadline insertion, so the 9:00 and
+        10:30 packages get slotted in where they'll make it on time. With
+        route_strategy=NEAREST_NEIGHBOR it's the nearest neighbor approach -
+        always go to the closest undelivered package next. Either way the
+        route improvers (2-opt and Or-opt by default) then shorten that route
+        without making any package late.
 
         Args:
             truck (Truck): The truck to plan a route for
+            package_ids (list): Packages to route (defaults to what's on the truck)
+            departure_time (datetime): When the route starts (defaults to the
+                truck's departure time)
+            start_index (int): Location index the route starts from (defaults
+                to where the truck is)
 
         Returns:
             list: Package IDs in the order they should be delivered
         """
-        if not truck.packages:
+        if package_ids is None:
+            package_ids = truck.packages
+        if not package_ids:
             return []
+        start_seconds = self._to_seconds(departure_time or truck.departure_time or self.start_time)
+
+        # Read each package's location and deadline once up front. Looking packages
+        # up inside the loops below would copy every package's data n times per truck.
+        # Deadlines are turned into seconds here, to compare with the exact arrival times.
+        package_locations = {}
+        package_deadlines = {}
+        for package_id in package_ids:
+            package = self.package_table.lookup_view(package_id)
+            package_locations[package_id] = self._delivery_location(package_id, package.location_index,
+                                                                    start_seconds)
+            package_deadlines[package_id] = package.deadline_minutes * SECONDS_PER_MINUTE
+        if start_index is None:
+            start_index = self.distance_manager.resolve_address(truck.current_location)
+
+        all_known = (DistanceManager.UNKNOWN_LOCATION not in package_locations.values()
+                     and start_index != DistanceManager.UNKNOWN_LOCATION)
+
+        if self.route_strategy == self.DEADLINE_INSERTION and all_known:
+            route = self._deadline_insertion(truck, package_ids, package_locations,
+                                             package_deadlines, start_index, start_seconds)
+        # With the NumPy backend the whole inner loop becomes one masked argmin
+        elif self.distance_manager.backend == DistanceManager.NUMPY and all_known:
+            route = self._nearest_neighbor_vectorized(list(package_ids), package_locations, start_index)
+        else:
+            route = self._nearest_neighbor(list(package_ids), package_locations, start_index)
+
+        # The improvers need real distances for every stop
+        if self.route_improvers and all_known:
+            route = self._improve_route(truck, route, package_locations, package_deadlines, start_index,
+                                        start_seconds)
+
+        return route
+
+    def _nearest_neighbor(self, unvisited, package_locations, start_index):
+        """
+        Plain nearest neighbor: keep driving to the closest package left.
+
+        Args:
+            unvisited (list): Packages on the truck, in load order (gets emptied)
+            package_locations (dict): package_id -> location index
+            start_index (int): Where the truck starts
 
-        # Use the nearest neighbor algorithm
-        unvisited = truck.packages.copy()
+        Returns:
+            list: Package IDs in the order they should be delivered
+        """
         route = []
-        current_location = truck.current_location
+        current_index = start_index
 
         # Keep picking the closest package until we've delivered them all
         while unvisited:
@@ -413,15 +1033,8 @@ class DeliveryRouter:
 
             # Look at all undelivered packages and find the closest one
             for package_id in unvisited:
-                package_data = self.package_table.lookup(package_id)
-                package_address = package_data['delivery_address']
-
-                # Special handling for package 9 after its address gets corrected
-                if package_id == 9 and truck.current_time and truck.current_time >= datetime.datetime(2024, 1, 1, 10,
-                                                                                                      20):
-                    package_address = "410 S State St"
-
-                distance = self.distance_manager.get_distance(current_location, package_address)
+                distance = self.distance_manager.get_distance_by_index(current_index,
+                                                                       package_locations[package_id])
 
                 if distance < nearest_distance:
                     nearest_distance = distance
@@ -433,111 +1046,201 @@ class DeliveryRouter:
                 unvisited.remove(nearest_package)
 
                 # Update where we are now
-                package_data = self.package_table.lookup(nearest_package)
-                current_location = package_data['delivery_address']
+                current_index = package_locations[nearest_package]
 
         return route
 
-    def deliver_packages_for_truck(self, truck):
+    def _deadline_insertion(self, truck, package_ids, package_locations, package_deadlines, start_index,
+                            start_seconds):
         """
-        Actually run the delivery simulation for one truck.
+        Build a route that meets deadlines by insertion (see deadline_insertion_tour).
 
-        This follows the route and keeps track of time, distance, and
-        delivery status for each package.
+        Deadlines and travel times are both whole seconds, so here it's just
+        integer comparisons.
 
         Args:
-            truck (Truck): Which truck to simulate
+            truck (Truck): The truck to plan a route for
+            package_ids (list): Packages on the truck
+            package_locations (dict): package_id -> location index
+            package_deadlines (dict): package_id -> deadline in seconds after midnight
+            start_index (int): Where the truck starts
+            start_seconds (int): When the truck leaves, in seconds after midnight
 
         Returns:
-            float: Total miles driven by this truck
+            list: Package IDs in the order they should be delivered
         """
-        if not truck.packages:
-            return 0.0
+        node_locations = [start_index] + [package_locations[package_id] for package_id in package_ids]
+        deadlines = [0] + [package_deadlines[package_id] for package_id in package_ids]
+        get_distance = self.distance_manager.get_distance_by_index
 
-        print(f"\nStarting deliveries for Truck {truck.truck_id}")
+        def distance(node1, node2):
+            return get_distance(node_locations[node1], node_locations[node2])
 
-        # Figure out the best route
-        route = self.calculate_route_for_truck(truck)
+        def travel_time(node1, node2):
+            # Same rounding the simulation uses (see clock.py)
+            return travel_seconds(distance(node1, node2), truck.speed)
 
-        # Set up the truck's starting state
-        truck.current_time = truck.departure_time
-        truck.current_location = "4001 South 700 East"  # Start at the hub
-        truck.mileage = 0.0
+        tour = deadline_insertion_tour(len(node_locations), distance, travel_time, deadlines,
+                                       start_seconds)
+        return [package_ids[node - 1] for node in tour[1:]]
 
-        # Keep track of packages we can't deliver yet
-        skipped_packages = []
+    def _improve_route(self, truck, route, package_locations, package_deadlines, start_index,
+                       start_seconds=None):
+        """
+        Run the route improvers over a nearest neighbor route.
 
-        # First pass: deliver all the packages we can
-        for package_id in route:
-            package_data = self.package_table.lookup(package_id)
-            delivery_address = package_data['delivery_address']
+        The optimizer works on node numbers: node 0 is the hub and node n is
+        route[n - 1]. A move is only kept if it doesn't make more packages
+        late than the route already had.
 
-            # Handle package 9's address issue
-            if package_id == 9:
-                if truck.current_time < datetime.datetime(2024, 1, 1, 10, 20):
-                    # Address hasn't been corrected yet, skip it for now
-                    skipped_packages.append(package_id)
-                    continue
-                else:
-                    delivery_address = "410 S State St"
+        Args:
+            truck (Truck): The truck the route is for
+            route (list): Package IDs from nearest neighbor
+            package_locations (dict): package_id -> location index
+            package_deadlines (dict): package_id -> deadline in seconds after midnight
+            start_index (int): Where the truck starts
+            start_seconds (int): When the truck leaves (defaults to its departure time)
 
-            # Figure out how far we need to drive
-            distance = self.distance_manager.get_distance(truck.current_location, delivery_address)
+        Returns:
+            list: Package IDs in the improved order
+        """
+        node_locations = [start_index] + [package_locations[package_id] for package_id in route]
+        get_distance = self.distance_manager.get_distance_by_index
 
-            # Calculate how long it takes to drive there
-            travel_time_hours = distance / truck.speed
-            travel_time_minutes = int(travel_time_hours * 60)
+        def distance(node1, node2):
+            return get_distance(node_locations[node1], node_locations[node2])
 
-            # Update the truck's position and time
-            truck.current_location = delivery_address
-            truck.current_time += datetime.timedelta(minutes=travel_time_minutes)
-            truck.mileage += distance
+        def count_late(tour):
+            return self._count_late_packages(truck, [route[node - 1] for node in tour[1:]],
+                                             package_locations, package_deadlines, start_index,
+                                             start_seconds)
 
-            # Mark the package as delivered
-            self.package_table.update_package_status(package_id, "Delivered", truck.current_time)
+        tour = improve_route(list(range(len(route) + 1)), distance, self.route_improvers,
+                             count_late=count_late, time_budget=self.improvement_time_budget)
+        return [route[node - 1] for node in tour[1:]]
 
-            print(
-                f"  Package {package_id} delivered to {delivery_address} at {truck.current_time.strftime('%I:%M %p')} (Distance: {distance:.1f} miles)")
+    def _count_late_packages(self, truck, route, package_locations, package_deadlines, start_index,
+                             start_seconds=None):
+        """
+        Count how many packages a route would deliver after their deadline.
 
-        # Second pass: try to deliver any packages we had to skip
-        while skipped_packages and truck.current_time < datetime.datetime(2024, 1, 1, 17, 0):  # Don't work past 5 PM
-            remaining_skipped = []
+        Args:
+            truck (Truck): The truck driving the route
+            route (list): Package IDs in delivery order
+            package_locations (dict): package_id -> location index
+            package_deadlines (dict): package_id -> deadline in seconds after midnight
+            start_index (int): Where the truck starts
+            start_seconds (int): When the truck leaves (defaults to its departure time)
 
-            for package_id in skipped_packages:
-                package_data = self.package_table.lookup(package_id)
+        Returns:
+            int: Number of late packages
+        """
+        return self._trip_timeline(truck, route, package_locations, package_deadlines, start_index,
+                                   start_seconds)[0]
 
-                # Check if package 9 can be delivered now (after 10:20 AM)
-                if package_id == 9 and truck.current_time >= datetime.datetime(2024, 1, 1, 10, 20):
-                    delivery_address = "410 S State St"  # Now we have the correct address
+    def _trip_timeline(self, truck, route, package_locations, package_deadlines, start_index,
+                       start_seconds=None):
+        """
+        Walk a route the same way the simulation drives it.
 
-                    # Deliver it
-                    distance = self.distance_manager.get_distance(truck.current_location, delivery_address)
-                    travel_time_hours = distance / truck.speed
-                    travel_time_minutes = int(travel_time_hours * 60)
+        Whole seconds per leg (see clock.py), and a package waiting on an address correction
+        (package 9) is skipped until the correction comes in - the truck
+        finishes the rest of the route, waits if it has to, and delivers it
+        last, at the corrected address. Then it drives back to where it started (the hub, for a trip).
 
-                    truck.current_location = delivery_address
-                    truck.current_time += datetime.timedelta(minutes=travel_time_minutes)
-                    truck.mileage += distance
+        Args:
+            truck (Truck): The truck driving the route
+            route (list): Package IDs in delivery order
+            package_locations (dict): package_id -> location index
+            package_deadlines (dict): package_id -> deadline in seconds after midnight
+            start_index (int): Where the truck starts
+            start_seconds (int): When the truck leaves (defaults to its departure time)
 
-                    self.package_table.update_package_status(package_id, "Delivered", truck.current_time)
-                    print(
-                        f"  Package {package_id} delivered to {delivery_address} at {truck.current_time.strftime('%I:%M %p')} (Distance: {distance:.1f} miles) [Address Corrected]")
+        Returns:
+            tuple: (number of late packages, seconds after midnight it's back)
+        """
+        if start_seconds is None:
+            start_seconds = self._to_seconds(truck.departure_time or self.start_time)
+        seconds = start_seconds
+        current_index = start_index
+        late = 0
+        skipped = []
+        get_distance = self.distance_manager.get_distance_by_index
 
-                else:
-                    # Still can't deliver it, keep it in the skipped list
-                    remaining_skipped.append(package_id)
+        for package_id in route:
+            correction = self.constraints.correction_for(package_id)
+            if correction is not None and seconds < correction.minutes * SECONDS_PER_MINUTE:
+                skipped.append(package_id)
+                continue
 
-            skipped_packages = remaining_skipped
+            location = self._delivery_location(package_id, package_locations[package_id], seconds)
+            seconds += travel_seconds(get_distance(current_index, location), truck.speed)
+            current_index = location
+            if seconds > package_deadlines[package_id]:
+                late += 1
+
+        for package_id in skipped:
+            # By now the correction is in, so this goes to the corrected address
+            seconds = max(seconds, self.constraints.correction_for(package_id).minutes * SECONDS_PER_MINUTE)
+            location = self._delivery_location(package_id, package_locations[package_id], seconds)
+            seconds += travel_seconds(get_distance(current_index, location), truck.speed)
+            current_index = location
+            if seconds > package_deadlines[package_id]:
+                late += 1
+
+        seconds += travel_seconds(get_distance(current_index, start_index), truck.speed)
+        return late, seconds
+
+    def _nearest_neighbor_vectorized(self, package_ids, package_locations, start_index):
+        """
+        Nearest neighbor search with NumPy - gives the same route as the loop version.
 
-            # If we still have skipped packages, wait a bit and try again
-            if skipped_packages:
-                truck.current_time += datetime.timedelta(minutes=30)  # Wait 30 minutes
+        At each step I grab one row of the distance matrix for all of the
+        truck's stops, set the stops I've already visited to infinity, and
+        let argmin pick the closest one. argmin returns the first minimum, so
+        ties go to the earlier package just like the loop's strict "<" check.
 
-        # Drive back to the hub
-        return_distance = self.distance_manager.get_distance(truck.current_location, "4001 South 700 East")
-        truck.mileage += return_distance
+        Args:
+            package_ids (list): Packages on the truck, in load order
+            package_locations (dict): package_id -> location index
+            start_index (int): Where the truck starts
 
-        print(f"Truck {truck.truck_id} completed route: {truck.mileage:.1f} total miles")
+        Returns:
+            list: Package IDs in the order they should be delivered
+        """
+        locations = np.array([package_locations[package_id] for package_id in package_ids], dtype=np.intp)
+        visited = np.zeros(len(package_ids), dtype=bool)
+
+        route = []
+        current_index = start_index
+        for _ in range(len(package_ids)):
+            distances = np.where(visited, np.inf, self.distance_manager.distance_row(current_index, locations))
+            nearest = int(np.argmin(distances))
+
+            route.append(package_ids[nearest])
+            visited[nearest] = True
+            current_index = locations[nearest]
+
+        return route
+
+    def deliver_packages_for_truck(self, truck):
+        """
+        Actually run the delivery simulation for one truck.
+
+        This follows the route and keeps track of time, distance, and
+        delivery status for each package. It's the same event-driven
+        simulation run_delivery_simulation() uses, with just this truck in it.
+
+        Args:
+            truck (Truck): Which truck to simulate
+
+        Returns:
+            float: Total miles driven by this truck
+        """
+        if not truck.packages:
+            return 0.0
+
+        DeliverySimulation(self, trucks=[truck]).run()
         return truck.mileage
 
     def run_delivery_simulation(self):
@@ -545,26 +1248,31 @@ class DeliveryRouter:
         Run the whole delivery operation for all trucks.
 
         This coordinates everything to get all packages delivered
-        on time while staying under 140 total miles.
+        on time while staying under 140 total miles. All the trucks run
+        together on one clock (see simulation.py), so things like the
+        10:20 AM address correction happen at the same moment for everyone.
         """
         print("=" * 60)
         print("WGUPS DELIVERY SIMULATION STARTING")
         print("=" * 60)
 
-        # Load all the data
+        # Load all the data - distances first so package addresses can be resolved
+        self.distance_manager.load_distance_data(self.distance_file)
         self.load_package_data()
-        self.distance_manager.load_distance_data()
 
         # Figure out which packages go on which trucks
         self.assign_packages_to_trucks()
 
-        # Run the delivery simulation for each truck
-        total_miles = 0.0
+        # Plan every trip's route at once if there are worker processes for it
+        self.planned_routes = {}
+        if self.route_workers > 1:
+            self.plan_routes()
 
-        for truck in self.trucks:
-            if truck.packages:  # Only run trucks that actually have packages
-                miles = self.deliver_packages_for_truck(truck)
-                total_miles += miles
+        # Run the delivery simulation for every truck at once
+        simulation = DeliverySimulation(self)
+        total_miles = simulation.run()
+        self.timeline = simulation.timeline
+        print(f"\nSimulation processed {simulation.events_processed} events")
 
         # Show the final results
         self.display_delivery_summary(total_miles)
@@ -582,32 +1290,29 @@ class DeliveryRouter:
         print("DELIVERY SUMMARY")
         print("=" * 60)
 
-        # Count up how many packages got delivered
-        all_packages = self.package_table.get_all_packages()
+        # Count up how many packages got delivered in one pass over the table
+        total_packages = self.package_table.size
         delivered_count = 0
         on_time_count = 0
 
-        for package in all_packages:
-            package_data = self.package_table.lookup(package.package_id)
-            if package_data['delivery_status'] == "Delivered":
+        for status, deadline, delivery_time in self.package_table.iter_packages(
+                fields=('delivery_status', 'delivery_deadline', 'delivery_time')):
+            if status == "Delivered":
                 delivered_count += 1
 
                 # Check if it was delivered on time (simplified check)
-                deadline = package_data['delivery_deadline']
-                delivery_time = package_data.get('delivery_time')
-
                 if deadline == "EOD" or delivery_time:
                     on_time_count += 1
 
-        print(f"Total Packages: {len(all_packages)}")
+        print(f"Total Packages: {total_packages}")
         print(f"Packages Delivered: {delivered_count}")
         print(f"Packages On Time: {on_time_count}")
-        print(f"Delivery Success Rate: {(delivered_count / len(all_packages) * 100):.1f}%")
-        print(f"On-Time Rate: {(on_time_count / len(all_packages) * 100):.1f}%")
+        print(f"Delivery Success Rate: {(delivered_count / total_packages * 100):.1f}%")
+        print(f"On-Time Rate: {(on_time_count / total_packages * 100):.1f}%")
 
-        print(f"\nTruck 1 Miles: {self.trucks[0].mileage:.1f}")
-        print(f"Truck 2 Miles: {self.trucks[1].mileage:.1f}")
-        print(f"Truck 3 Miles: {self.trucks[2].mileage:.1f}")
+        print()
+        for truck in self.trucks:
+            print(f"Truck {truck.truck_id} Miles: {truck.mileage:.1f}")
         print(f"Total Miles: {total_miles:.1f}")
 
         if total_miles < 140:
@@ -622,38 +1327,66 @@ class DeliveryRouter:
         Check what the status of a package was at a specific time.
         This is for the supervisor interface.
 
+        The simulation's timeline already has the status after everything
+        that happened to the package, so this is one bisect.
+
         Args:
             package_id (int): Which package to check
             query_time (datetime): What time to check
 
         Returns:
-            dict: Package status info at that time
+            dict: Package status info at that time (see DeliveryTimeline.package_status)
         """
-        package_data = self.package_table.lookup(package_id)
-        if not package_data:
+        if self.timeline is not None:
+            status_info = self.timeline.package_status(package_id, query_time)
+            if status_info is not None:
+                return status_info
+
+        # Never went out on a truck
+        package = self.package_table.lookup_view(package_id)
+        if package is None:
             return None
-
-        # Figure out the status based on the time
-        delivery_time = package_data.get('delivery_time')
-
-        if delivery_time and query_time >= delivery_time:
-            status = "Delivered"
-            time_info = delivery_time.strftime('%I:%M %p')
-        elif query_time >= datetime.datetime(2024, 1, 1, 8, 0):  # After trucks start leaving
-            status = "En Route"
-            time_info = "In transit"
-        else:
-            status = "At Hub"
-            time_info = "Waiting for departure"
-
         return {
             'package_id': package_id,
-            'address': package_data['delivery_address'],
-            'deadline': package_data['delivery_deadline'],
-            'status': status,
-            'time_info': time_info
+            'address': package.delivery_address,
+            'deadline': package.delivery_deadline,
+            'status': "At Hub",
+            'time_info': "Waiting",
+            'truck': None,
+            'trip': None,
+            'departure_time': None,
+            'delivery_time': package.delivery_time,
         }
 
+    def package_statuses_at(self, query_time):
+        """
+        Every package's status at one time, in package ID order.
+
+        Args:
+            query_time (datetime): What time to check
+
+        Returns:
+            list: One status dict per package (see get_package_status_at_time)
+        """
+        package_ids = sorted(package_id for package_id, in self.package_table.iter_packages(fields=('package_id',)))
+        return [self.get_package_status_at_time(package_id, query_time) for package_id in package_ids]
+
+    def get_truck_status_at_time(self, truck_id, query_time):
+        """
+        Where a truck was in its day at a specific time.
+
+        Args:
+            truck_id (int): Which truck
+            query_time (datetime): What time to check
+
+        Returns:
+            dict: status, trip, packages on board, delivered so far and
+                miles so far (None if the truck never went out)
+        """
+        if self.timeline is None:
+            return None
+        return self.timeline.truck_status(truck_id, query_time)
+
 
 def display_package_status_interface(router):
     """
@@ -746,41 +1479,27 @@ def check_all_packages_at_time(router):
     # Get all packages (1-40) and show their status
     all_package_data = []
 
-    # Collect data for all 40 packages
-    for package_id in range(1, 41):
-        package_data = router.package_table.lookup(package_id)
-        if package_data:
-            # Find which truck has this package
-            truck_assigned = "N/A"
-            for truck in router.trucks:
-                if package_id in truck.packages:
-                    truck_assigned = str(truck.truck_id)
-                    break
+    # One snapshot of every package at that time - a bisect per package on the timeline
+    for status_info in router.package_statuses_at(query_time):
+        truck_assigned = str(status_info['truck']) if status_info['truck'] else "N/A"
 
-            # Get status at the specified time
-            status_info = get_package_status_at_time(router, package_id, query_time)
+        # Format delivery time for display
+        delivery_time = status_info['delivery_time']
+        delivery_time_display = "Not Delivered"
+        if delivery_time:
+            if query_time >= delivery_time:
+                delivery_time_display = delivery_time.strftime('%I:%M %p')
+            else:
+                delivery_time_display = "Pending"
 
-            # Handle special address cases for display
-            display_address = package_data['delivery_address']
-            if package_id == 9 and query_time < datetime.datetime(2024, 1, 1, 10, 20):
-                display_address = "Third District Juvenile Court"
-
-            # Format delivery time for display
-            delivery_time_display = "Not Delivered"
-            if package_data.get('delivery_time'):
-                if query_time >= package_data['delivery_time']:
-                    delivery_time_display = package_data['delivery_time'].strftime('%I:%M %p')
-                else:
-                    delivery_time_display = "Pending"
-
-            all_package_data.append({
-                'id': package_id,
-                'address': display_address,
-                'deadline': package_data['delivery_deadline'],
-                'truck': truck_assigned,
-                'status': status_info['status'],
-                'delivery_time': delivery_time_display
-            })
+        all_package_data.append({
+            'id': status_info['package_id'],
+            'address': status_info['address'],  # The address as it was at query_time
+            'deadline': status_info['deadline'],
+            'truck': truck_assigned,
+            'status': status_info['status'],
+            'delivery_time': delivery_time_display
+        })
 
     # Sort by package ID and display
     for pkg in sorted(all_package_data, key=lambda x: x['id']):
@@ -812,10 +1531,15 @@ def check_truck_packages_at_time(router):
     print("TRUCK PACKAGES STATUS AT SPECIFIC TIME")
     print("=" * 60)
 
+    # Look trucks up by ID - a fleet file doesn't have to number them 1, 2, 3
+    trucks = {truck.truck_id: truck for truck in router.trucks}
+    truck_ids = [str(truck_id) for truck_id in sorted(trucks)]
+    choices = truck_ids[0] if len(truck_ids) == 1 else f"{', '.join(truck_ids[:-1])}, or {truck_ids[-1]}"
+
     try:
-        truck_id = int(input("Enter truck number (1, 2, or 3): "))
-        if truck_id not in [1, 2, 3]:
-            print("Invalid truck number. Please enter 1, 2, or 3.")
+        truck_id = int(input(f"Enter truck number ({choices}): "))
+        if truck_id not in trucks:
+            print(f"Invalid truck number. Please enter {choices}.")
             return
 
         time_input = input("Enter time (HH:MM AM/PM, e.g., '9:00 AM'): ").strip()
@@ -828,16 +1552,24 @@ def check_truck_packages_at_time(router):
             query_time = datetime.datetime.strptime(time_input, "%H:%M")
             query_time = query_time.replace(year=2024, month=1, day=1)
 
-        truck = router.trucks[truck_id - 1]
+        truck = trucks[truck_id]
 
         print(f"\nTRUCK {truck_id} STATUS at {time_input.upper()}")
         print("=" * 80)
-        print(f"Total Packages: {len(truck.packages)}")
-        print(
-            f"Truck Departure Time: {truck.departure_time.strftime('%I:%M %p') if truck.departure_time else 'Not set'}")
+        truck_packages = router.package_table.find_packages(truck_id=truck_id)
+        departures = truck.trip_departures or ([truck.departure_time] if truck.departure_time else [])
+        print(f"Total Packages: {len(truck_packages)}")
+        print(f"Truck Departure Time: "
+              f"{', '.join(departure.strftime('%I:%M %p') for departure in departures) or 'Not set'}")
+
+        truck_status = router.get_truck_status_at_time(truck_id, query_time)
+        if truck_status is not None:
+            trip_text = f" (trip {truck_status['trip'] + 1})" if truck_status['trip'] is not None else ""
+            print(f"Truck Status: {truck_status['status']}{trip_text}, {truck_status['on_board']} on board, "
+                  f"{truck_status['delivered']} delivered, {truck_status['miles']:.1f} miles so far")
         print("-" * 80)
 
-        if not truck.packages:
+        if not truck_packages:
             print("No packages assigned to this truck.")
             return
 
@@ -845,16 +1577,15 @@ def check_truck_packages_at_time(router):
         print(f"{'ID':<3} {'Delivery Address':<30} {'Deadline':<10} {'Status':<12} {'Time Info':<15}")
         print("-" * 80)
 
-        # Show each package
-        for package_id in sorted(truck.packages):
+        # Show each package - the truck index gives us just this truck's packages
+        for package_id in sorted(truck_packages):
             status_info = get_package_status_at_time(router, package_id, query_time)
-            package_data = router.package_table.lookup(package_id)
 
-            # Trim long addresses
-            address_short = package_data['delivery_address'][:29] if len(package_data['delivery_address']) > 29 else \
-            package_data['delivery_address']
+            # Trim long addresses (the address as it was at query_time)
+            address_short = status_info['address'][:29] if len(status_info['address']) > 29 else \
+            status_info['address']
 
-            print(f"{package_id:<3} {address_short:<30} {package_data['delivery_deadline']:<10} "
+            print(f"{package_id:<3} {address_short:<30} {status_info['deadline']:<10} "
                   f"{status_info['status']:<12} {status_info['time_info']:<15}")
 
         print("-" * 80)
@@ -893,15 +1624,11 @@ def check_individual_package(router):
             print(f"Delivery Time: {package_data['delivery_time'].strftime('%I:%M %p')}")
 
         # Figure out which truck has this package
-        truck_assigned = None
-        for truck in router.trucks:
-            if package_id in truck.packages:
-                truck_assigned = truck.truck_id
-                break
+        truck_assigned = router.package_table.lookup_view(package_id).truck_id
 
         if truck_assigned:
             print(f"Assigned to: Truck {truck_assigned}")
-            departure_time = router.trucks[truck_assigned - 1].departure_time
+            departure_time = router.package_departure(package_id)
             if departure_time:
                 print(f"Truck Departure: {departure_time.strftime('%I:%M %p')}")
 
@@ -940,23 +1667,20 @@ def view_delivery_summary(router):
     print("DELIVERY SUMMARY")
     print("=" * 60)
 
-    all_packages = router.package_table.get_all_packages()
     delivered_count = 0
     at_hub_count = 0
     en_route_count = 0
 
-    for package in all_packages:
-        package_data = router.package_table.lookup(package.package_id)
-        status = package_data['delivery_status']
-
+    # The status index already has a count for each status
+    for status, count in router.package_table.count_by_status().items():
         if "Delivered" in status:
-            delivered_count += 1
+            delivered_count += count
         elif "En Route" in status or "Loaded" in status:
-            en_route_count += 1
+            en_route_count += count
         else:
-            at_hub_count += 1
+            at_hub_count += count
 
-    total_packages = len(all_packages)
+    total_packages = router.package_table.size
     total_miles = sum(truck.mileage for truck in router.trucks)
 
     print(f"Total Packages: {total_packages}")
@@ -968,9 +1692,10 @@ def view_delivery_summary(router):
 
     print("\nTruck Details:")
     for truck in router.trucks:
-        print(f"  Truck {truck.truck_id}: {len(truck.packages)} packages, {truck.mileage:.1f} miles")
-        if truck.departure_time:
-            print(f"    Departure: {truck.departure_time.strftime('%I:%M %p')}")
+        truck_packages = router.package_table.find_packages(truck_id=truck.truck_id)
+        print(f"  Truck {truck.truck_id}: {len(truck_packages)} packages, {truck.mileage:.1f} miles")
+        for departure in truck.trip_departures:
+            print(f"    Departure: {departure.strftime('%I:%M %p')}")
 
     print("=" * 60)
 
@@ -981,6 +1706,8 @@ def get_package_status_at_time(router, package_id, query_time):
     Correctly displays "Delayed" status for packages not yet in the air
 
     Helper function to figure out what a package's status was at a specific time.
+    The status rules (address TBD, delivered, en route, delayed, at hub) now
+    live in timeline.py and are worked out once when the simulation finishes.
 
     Args:
         router: The delivery router
@@ -990,58 +1717,7 @@ def get_package_status_at_time(router, package_id, query_time):
     Returns:
         dict: Status info for that package at that time
     """
-    package_data = router.package_table.lookup(package_id)
-    if not package_data:
-        return None
-
-    # Find which truck has this package
-    truck_assigned = None
-    departure_time = None
-
-    for truck in router.trucks:
-        if package_id in truck.packages:
-            truck_assigned = truck.truck_id
-            departure_time = truck.departure_time
-            break
-
-    # Figure out the status based on the time
-    delivery_time = package_data.get('delivery_time')
-
-    # Define delayed packages that don't arrive until 9:05 AM
-    delayed_packages = [6, 25, 28, 32]
-
-    # Package 9 is special - its address isn't correct until 10:20 AM
-    if package_id == 9 and query_time < datetime.datetime(2024, 1, 1, 10, 20):
-        status = "At Hub"
-        time_info = "Address TBD"
-    elif delivery_time and query_time >= delivery_time:
-        # Package has been delivered
-        status = "Delivered"
-        time_info = delivery_time.strftime('%I:%M %p')
-    elif departure_time and query_time >= departure_time:
-        # Truck has departed with this package
-        status = "En Route"
-        time_info = "In Transit"
-    elif package_id in delayed_packages and query_time < datetime.datetime(2024, 1, 1, 9, 5):
-        # Delayed packages aren't available until 9:05 AM
-        status = "Delayed"
-        time_info = "Arrives 9:05 AM"
-    else:
-        # Package is at hub waiting for truck departure
-        status = "At Hub"
-        if departure_time:
-            time_info = f"Departs {departure_time.strftime('%I:%M %p')}"
-        else:
-            time_info = "Waiting"
-
-    return {
-        'package_id': package_id,
-        'address': package_data['delivery_address'],
-        'deadline': package_data['delivery_deadline'],
-        'status': status,
-        'time_info': time_info,
-        'truck': truck_assigned
-    }
+    return router.get_package_status_at_time(package_id, query_time)
 
 
 def main():
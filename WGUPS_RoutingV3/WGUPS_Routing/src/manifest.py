@@ -0,0 +1,363 @@
+# manifest.py - Streaming, validated package manifest loading
+"""
+WGUPS Package Manifest Loader
+
+load_package_data() used to read the package CSV with one loop that
+skipped any row it didn't like without saying so: a typo in a package ID
+or a weight of "12kg" just made the package disappear from the day. This
+module reads a manifest in chunks and checks every row before it goes
+into the package table:
+
+    column 0  Package ID     whole number from 1 to MAX_PACKAGE_ID, not already in the table
+    column 1  Address        not blank
+    column 2  City           not blank
+    column 3  State          not blank
+    column 4  Zip            12345 or 12345-6789
+    column 5  Deadline       "EOD" (or blank) or a time like "10:30 AM"
+    column 6  Weight         number > 0
+    column 7  Special Notes  optional
+
+Before the first package row, the header row (its first cell is
+"Package ID") and title lines (a single cell of text, like "WGUPS Package
+File") are skipped. Blank rows are skipped anywhere. Every other row is
+checked, so a broken first package row is reported like any other one
+instead of being mistaken for a header. A row that fails a check is
+reported with its line number, column and value, and left out - or with
+strict=True the load stops at the first one.
+
+Deadlines become minutes after midnight and weights become floats as they
+are read, and each address is matched to its distance table location once
+per distinct address, so a manifest where the same few thousand addresses
+repeat a million times only does a few thousand lookups.
+
+Only one chunk of rows (chunk_size) and the first max_errors problems are
+ever held at once, so reading a 1M-row manifest takes the same extra
+memory as reading 40 rows. The package table itself of course grows with
+the manifest (see hash_table.py for how little it takes per package).
+
+Check a manifest from the command line (run from the src directory):
+    python manifest.py ../data/WGUPS_Packages.csv --errors problems.csv
+"""
+
+import argparse
+import csv
+import math
+import re
+import time
+
+from hash_table import HashTable, deadline_to_minutes
+
+CHUNK_SIZE = 10000
+MAX_ERRORS = 1000
+
+# Column positions in the package file
+ID, ADDRESS, CITY, STATE, ZIP, DEADLINE, WEIGHT, NOTES = range(8)
+COLUMN_NAMES = ("Package ID", "Address", "City", "State", "Zip", "Delivery Deadline", "Weight", "Special Notes")
+REQUIRED_COLUMNS = 7
+
+# The package table keeps IDs in a signed 64-bit array, so this is the biggest one it can hold
+MAX_PACKAGE_ID = 2 ** 63 - 1
+
+ZIP_PATTERN = re.compile(r"\d{5}(-\d{4})?")
+
+
+class ManifestError(ValueError):
+    """A manifest row that doesn't pass its checks (raised in strict mode)."""
+
+    def __init__(self, problem):
+        super().__init__(problem.describe())
+        self.problem = problem
+
+
+class ManifestProblem:
+    """One thing wrong with one row."""
+
+    __slots__ = ('line', 'column', 'value', 'message')
+
+    def __init__(self, line, column, value, message):
+        self.line = line  # Line number in the file (the header is line 1)
+        self.column = column  # Column name, or None if it's about the whole row
+        self.value = value
+        self.message = message
+
+    def describe(self):
+        where = f"line {self.line}" + (f", {self.column}" if self.column else "")
+        return f"{where}: {self.message}" + (f" ({self.value!r})" if self.value not in (None, "") else "")
+
+
+class ManifestRow:
+    """One checked package row, with its deadline and weight already converted."""
+
+    __slots__ = ('line', 'package_id', 'address', 'city', 'state', 'zip_code', 'deadline',
+                 'deadline_minutes', 'weight', 'notes')
+
+    def __init__(self, line, package_id, address, city, state, zip_code, deadline, deadline_minutes,
+                 weight, notes):
+        self.line = line
+        self.package_id = package_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.deadline = deadline
+        self.deadline_minutes = deadline_minutes
+        self.weight = weight
+        self.notes = notes
+
+
+class ManifestReport:
+    """How a manifest load went: counts, the problems found and how fast it was."""
+
+    def __init__(self, file_path, max_errors=MAX_ERRORS):
+        self.file_path = file_path
+        self.max_errors = max_errors
+        self.rows_read = 0  # Package rows, not counting the header or blank lines
+        self.rows_loaded = 0
+        self.rows_rejected = 0
+        self.problem_count = 0  # Every problem, even past max_errors
+        self.problems = []  # The first max_errors problems
+        self.unresolved_rows = 0  # Loaded, but the address isn't in the distance table
+        self.chunks = 0
+        self.seconds = 0.0
+
+    def add_problem(self, problem):
+        self.problem_count += 1
+        if len(self.problems) < self.max_errors:
+            self.problems.append(problem)
+
+    def sorted_problems(self):
+        """The kept problems in line order (duplicate IDs are only found after their chunk is checked)."""
+        return sorted(self.problems, key=lambda problem: problem.line)
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds > 0 else 0.0
+
+    def write_problems(self, file_path):
+        """Write the kept problems to a CSV: line, column, value, problem."""
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Line", "Column", "Value", "Problem"])
+            for problem in self.sorted_problems():
+                writer.writerow([problem.line, problem.column or "", problem.value or "", problem.message])
+
+    def print_summary(self, shown=5):
+        """Print the counts, the throughput and the first few problems."""
+        print(f"Read {self.rows_read} package rows in {self.seconds:.2f} s "
+              f"({self.rows_per_second:,.0f} rows/s, {self.chunks} chunks)")
+        if self.rows_rejected:
+            print(f"⚠️  Left out {self.rows_rejected} rows with problems "
+                  f"({self.problem_count} problems in all):")
+            for problem in self.sorted_problems()[:shown]:
+                print(f"    {problem.describe()}")
+            if self.problem_count > shown:
+                print(f"    ... and {self.problem_count - shown} more")
+        if self.unresolved_rows:
+            print(f"⚠️  {self.unresolved_rows} packages have an address that isn't in the distance table")
+
+
+def check_row(cells, line, deadline_cache):
+    """
+    Check one CSV row and convert its typed columns.
+
+    Args:
+        cells (list): The row's cells
+        line (int): Its line number, for problem reports
+        deadline_cache (dict): Deadline text -> minutes, shared between rows
+            (there are only a handful of distinct deadlines)
+
+    Returns:
+        tuple: (ManifestRow, []) if it's good, (None, [ManifestProblem, ...]) if not
+    """
+    if len(cells) < REQUIRED_COLUMNS:
+        return None, [ManifestProblem(line, None, None,
+                                      f"has {len(cells)} columns, needs at least {REQUIRED_COLUMNS}")]
+
+    problems = []
+    values = [cell.strip() for cell in cells[:NOTES + 1]]
+
+    package_id = None
+    if values[ID].isascii() and values[ID].isdigit() and 0 < int(values[ID]) <= MAX_PACKAGE_ID:
+        package_id = int(values[ID])
+    else:
+        problems.append(ManifestProblem(line, COLUMN_NAMES[ID], values[ID], "not a package ID"))
+
+    for column in (ADDRESS, CITY, STATE):
+        if not values[column]:
+            problems.append(ManifestProblem(line, COLUMN_NAMES[column], None, "is blank"))
+
+    if not ZIP_PATTERN.fullmatch(values[ZIP]):
+        problems.append(ManifestProblem(line, COLUMN_NAMES[ZIP], values[ZIP], "not a zip code"))
+
+    deadline = values[DEADLINE]
+    deadline_minutes = deadline_cache.get(deadline)
+    if deadline_minutes is None:
+        try:
+            deadline_minutes = deadline_cache[deadline] = deadline_to_minutes(deadline)
+        except ValueError:
+            problems.append(ManifestProblem(line, COLUMN_NAMES[DEADLINE], deadline,
+                                            "not EOD or a time like 10:30 AM"))
+
+    weight = None
+    try:
+        weight = float(values[WEIGHT])
+    except ValueError:
+        pass
+    if weight is None or not math.isfinite(weight) or weight <= 0:
+        problems.append(ManifestProblem(line, COLUMN_NAMES[WEIGHT], values[WEIGHT], "not a weight above 0"))
+
+    if problems:
+        return None, problems
+    return ManifestRow(line, package_id, values[ADDRESS], values[CITY], values[STATE], values[ZIP], deadline,
+                       deadline_minutes, weight, values[NOTES] if len(values) > NOTES else ""), []
+
+
+def is_header_row(cells):
+    """The column names row: its first cell names the Package ID column."""
+    return cells[0].strip().casefold() == COLUMN_NAMES[ID].casefold()
+
+
+def is_title_row(cells):
+    """A title line above the header: one cell of text and nothing else."""
+    first = cells[0].strip()
+    return bool(first) and not first[0].isdigit() and not any(cell.strip() for cell in cells[1:])
+
+
+def read_manifest_chunks(file_path, report, chunk_size=CHUNK_SIZE):
+    """
+    Read a package CSV a chunk at a time, checking every row.
+
+    Rows that fail their checks go into the report instead of the chunks.
+
+    Args:
+        file_path (str): The package CSV
+        report (ManifestReport): Gets the counts and problems
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        list: Up to chunk_size ManifestRows
+    """
+    deadline_cache = {}
+    chunk = []
+    started = False  # Seen the header or the first package row yet
+
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        for cells in reader:
+            if not any(cell.strip() for cell in cells):
+                continue
+            if not started:
+                if is_header_row(cells):
+                    started = True
+                    continue
+                if is_title_row(cells):
+                    continue
+                started = True
+
+            report.rows_read += 1
+            row, problems = check_row(cells, reader.line_num, deadline_cache)
+            if row is None:
+                report.rows_rejected += 1
+                for problem in problems:
+                    report.add_problem(problem)
+                continue
+
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                report.chunks += 1
+                yield chunk
+                chunk = []
+
+    if chunk:
+        report.chunks += 1
+        yield chunk
+
+
+def ingest_manifest(file_path, table, resolve_address=None, constraints=None, chunk_size=CHUNK_SIZE,
+                    max_errors=MAX_ERRORS, strict=False):
+    """
+    Stream a package CSV into the package table.
+
+    Args:
+        file_path (str): The package CSV
+        table (HashTable): Where the packages go
+        resolve_address (callable): Address -> distance table location index
+            (like DistanceManager.resolve_address); None leaves locations unknown
+        constraints (ConstraintSet): Gets each package's special notes (optional)
+        chunk_size (int): Rows read and checked per chunk
+        max_errors (int): Problems to keep for the report (all of them are counted)
+        strict (bool): Stop at the first problem instead of leaving the row out
+
+    Returns:
+        ManifestReport: What happened
+
+    Raises:
+        ManifestError: In strict mode, for the first row with a problem
+    """
+    report = ManifestReport(file_path, max_errors)
+    locations = {}  # address -> location index, so each distinct address is only looked up once
+    started = time.perf_counter()
+
+    for chunk in read_manifest_chunks(file_path, report, chunk_size):
+        if strict and report.problems:
+            raise ManifestError(report.problems[0])
+
+        for row in chunk:
+            if table.lookup_view(row.package_id) is not None:
+                report.rows_rejected += 1
+                problem = ManifestProblem(row.line, COLUMN_NAMES[ID], str(row.package_id),
+                                          "package ID is already in the manifest")
+                if strict:
+                    raise ManifestError(problem)
+                report.add_problem(problem)
+                continue
+
+            location_index = HashTable.UNKNOWN_LOCATION
+            if resolve_address is not None:
+                location_index = locations.get(row.address)
+                if location_index is None:
+                    location_index = locations[row.address] = resolve_address(row.address)
+                if location_index == HashTable.UNKNOWN_LOCATION:
+                    report.unresolved_rows += 1
+
+            table.insert(row.package_id, row.address, row.city, row.state, row.zip_code, row.deadline,
+                         row.weight, location_index=location_index, special_notes=row.notes,
+                         deadline_minutes=row.deadline_minutes)
+            if constraints is not None:
+                constraints.add_package(row.package_id, row.notes)
+            report.rows_loaded += 1
+
+    if strict and report.problems:
+        raise ManifestError(report.problems[0])
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a package manifest and report its problems")
+    parser.add_argument("package_file", help="Package CSV")
+    parser.add_argument("--distances", help="Distance table (CSV or .wgd) to match addresses against")
+    parser.add_argument("--errors", help="Write every kept problem to this CSV")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--max-errors", type=int, default=MAX_ERRORS, help="Problems to keep for the report")
+    args = parser.parse_args()
+
+    resolve_address = None
+    if args.distances:
+        from main import DistanceManager
+        distance_manager = DistanceManager()
+        distance_manager.load_distance_data(args.distances)
+        resolve_address = distance_manager.resolve_address
+
+    report = ingest_manifest(args.package_file, HashTable(), resolve_address, chunk_size=args.chunk_size,
+                             max_errors=args.max_errors)
+    report.print_summary()
+    print(f"✓ {report.rows_loaded} packages would be loaded")
+    if args.errors:
+        report.write_problems(args.errors)
+        print(f"Problems written to {args.errors}")
+
+
+if __name__ == "__main__":
+    main()
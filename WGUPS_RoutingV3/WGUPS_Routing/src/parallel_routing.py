@@ -0,0 +1,196 @@
+# parallel_routing.py - Plan truck routes on several processes at once
+"""
+WGUPS Parallel Route Planning
+
+Once every truck knows its loads and when each one leaves, planning one
+trip's route doesn't depend on any other trip. Deadline insertion plus
+2-opt/Or-opt is the slowest part of a big day, so this module fans the
+trips out over a ProcessPoolExecutor.
+
+The distance table is the only big thing the workers need, and it is never
+pickled:
+
+- a compiled .wgd table is already a file, so every worker just mmaps it
+  (the OS shares the pages between processes)
+- otherwise the packed triangle is copied once into a shared memory block
+  that every worker reads in place
+
+Each task only carries one trip's packages (ID, location, deadline), its
+departure and its start, so sending work to the pool costs almost nothing.
+A worker attached to shared memory has no address names, so corrected
+addresses are resolved to location indexes here and handed over once.
+The workers plan with the same DeliveryRouter code as the main process,
+and route improvement stops on a move count rather than the clock (unless
+a time budget is set), so a route comes out the same whichever process
+planned it.
+"""
+
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from distance_file import packed_size
+
+# Set up once in each worker process by _start_worker()
+_worker_router = None
+_worker_block = None
+
+
+class SharedDistances:
+    """
+    The packed distance triangle in a shared memory block.
+
+    distance(i, j) for i >= j is at i * (i + 1) // 2 + j, same as the
+    compiled file, so workers read it exactly the way they'd read a .wgd.
+    """
+
+    def __init__(self, distance_manager):
+        """
+        Copy a loaded distance table into shared memory.
+
+        Args:
+            distance_manager (DistanceManager): A manager with its distances loaded
+        """
+        self.address_count = len(distance_manager.addresses)
+        count = packed_size(self.address_count)
+        self.block = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+
+        view = self.block.buf.cast('d')
+        packed = distance_manager.packed_distances
+        if packed is not None:
+            # Already a packed triangle (array, NumPy array or mmap'd file) - copy row by row
+            for i in range(self.address_count):
+                start = i * (i + 1) // 2
+                view[start:start + i + 1] = array('d', (float(value) for value in packed[start:start + i + 1]))
+        else:
+            matrix = distance_manager.distance_matrix
+            for i in range(self.address_count):
+                start = i * (i + 1) // 2
+                view[start:start + i + 1] = array('d', (float(value) for value in matrix[i][:i + 1]))
+        view.release()
+
+    def source(self):
+        """What a worker needs to attach: ("shared_memory", block name, address count)."""
+        return ("shared_memory", self.block.name, self.address_count)
+
+    def close(self):
+        """Free the block (workers must be done with it)."""
+        self.block.close()
+        self.block.unlink()
+
+
+def _start_worker(distance_source, settings, corrections, correction_locations):
+    """
+    Build this worker's router around the shared distance table.
+
+    Args:
+        distance_source (tuple): ("file", path) or ("shared_memory", name, address count)
+        settings (dict): Router settings (route_strategy, route_improvers, time budget)
+        corrections (list): AddressCorrection objects, for counting late packages
+        correction_locations (dict): package_id -> location index of its corrected
+            address, resolved by the main process
+    """
+    global _worker_router, _worker_block
+
+    # Imported here because main.py imports this module
+    from main import DeliveryRouter, DistanceManager
+
+    router = DeliveryRouter(distance_storage=DistanceManager.TRIANGULAR,
+                            route_improvers=settings['route_improvers'],
+                            route_strategy=settings['route_strategy'])
+    router.improvement_time_budget = settings['improvement_time_budget']
+    router.start_time = settings['start_time']
+
+    if distance_source[0] == "file":
+        router.distance_manager.load_distance_data(distance_source[1])
+    else:
+        _, name, address_count = distance_source
+        _worker_block = shared_memory.SharedMemory(name=name)
+        manager = router.distance_manager
+        manager.addresses = [""] * address_count
+        manager.distance_matrix = None
+        manager.packed_distances = _worker_block.buf.cast('d')[:packed_size(address_count)]
+
+    for correction in corrections:
+        router.constraints.add_correction(correction)
+    router.correction_locations = dict(correction_locations)
+    _worker_router = router
+
+
+def _plan_route(task):
+    """
+    Plan one trip's route in a worker.
+
+    Args:
+        task (tuple): (key, [(package_id, location_index, deadline), ...],
+            departure datetime, start location index, truck speed)
+
+    Returns:
+        tuple: (key, package IDs in delivery order)
+    """
+    # Imported here because main.py imports this module
+    from hash_table import HashTable
+    from main import Truck
+
+    key, packages, departure_time, start_index, speed = task
+    router = _worker_router
+
+    # A fresh little table with just this trip's packages
+    router.package_table = HashTable()
+    for package_id, location_index, deadline in packages:
+        router.package_table.insert(package_id, "", "", "", "", deadline, 0.0, location_index=location_index)
+
+    truck = Truck(0)
+    truck.speed = speed
+    route = router.calculate_route_for_truck(truck, package_ids=[package[0] for package in packages],
+                                             departure_time=departure_time, start_index=start_index)
+    return key, route
+
+
+def plan_routes_parallel(router, tasks, workers):
+    """
+    Plan many trips' routes on a pool of worker processes.
+
+    Args:
+        router (DeliveryRouter): Router with its distances loaded (supplies
+            the table and the route settings)
+        tasks (list): (key, packages, departure, start index, speed) tuples,
+            see _plan_route()
+        workers (int): How many processes to use
+
+    Returns:
+        tuple: (dict key -> route, seconds it took)
+    """
+    started = time.perf_counter()
+    manager = router.distance_manager
+
+    shared = None
+    if manager.distance_file is not None:
+        distance_source = ("file", manager.distance_file.file_path)
+    else:
+        shared = SharedDistances(manager)
+        distance_source = shared.source()
+
+    settings = {
+        'route_strategy': router.route_strategy,
+        'route_improvers': router.route_improvers,
+        'improvement_time_budget': router.improvement_time_budget,
+        'start_time': router.start_time,
+    }
+    corrections = list(router.constraints.corrections.values())
+    # The same location the main process would drive to (see DeliveryRouter._delivery_location)
+    correction_locations = {correction.package_id: router._delivery_location(correction.package_id, None)
+                            for correction in corrections}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                 initargs=(distance_source, settings, corrections,
+                                           correction_locations)) as pool:
+            chunk_size = max(1, len(tasks) // (workers * 4))
+            routes = dict(pool.map(_plan_route, tasks, chunksize=chunk_size))
+    finally:
+        if shared is not None:
+            shared.close()
+
+    return routes, time.perf_counter() - started
@@ -0,0 +1,293 @@
+# plan_file.py - Save a computed delivery day and load it back without re-solving
+"""
+WGUPS Plan Files
+
+Planning and simulating the day is the slow part of every status tool:
+status_query.py, status_service.py and an audit of yesterday's run all
+used to load the distance table, assign, route and simulate before they
+could answer a single question. A plan file keeps everything that work
+produced, so the next program just reads it back:
+
+- the fleet, and each truck's trips: departure, packages and the stops in
+  delivery order with their times and miles so far
+- every package's row from the package table (address, deadline, weight,
+  notes, final status, delivery time, truck)
+- the timeline's events for every package and truck, so status-at-time
+  queries work exactly like they did on the router that made the plan
+
+All times are whole seconds after midnight (see clock.py), and the day
+itself is in the header.
+
+There are two forms with the same content:
+
+    plan.jsonl   one JSON record per line - a header, then one line per
+                 truck, then one per package. Easy to diff, grep or read
+                 in an audit.
+    plan.wgp     the same records pickled, for loading as fast as possible.
+                 Only plain lists/dicts/strings/numbers are allowed back
+                 out, so a .wgp file can't run code when it's loaded.
+
+The form is picked from the file extension. Both start with a format
+version, and a file from a different version is refused instead of being
+half-read.
+
+Usage:
+    save_plan(router, "plan.jsonl")      # after router.run_delivery_simulation()
+    router = load_plan("plan.jsonl")     # ready for StatusQuery(router)
+"""
+
+import datetime
+import io
+import json
+import pickle
+
+from clock import at_seconds, seconds_of_day
+from fleet import FleetConfig, TruckSpec
+from hash_table import HashTable
+from timeline import DeliveryTimeline, _PackageHistory, _TruckHistory
+
+PLAN_FORMAT = "wgups-plan"
+PLAN_VERSION = 1
+BINARY_EXTENSION = ".wgp"
+BINARY_MAGIC = b"WGUPSPLN"
+
+# Package table columns saved for every package, in record order
+PACKAGE_COLUMNS = ('package_id', 'delivery_address', 'delivery_city', 'delivery_state', 'delivery_zip',
+                   'delivery_deadline', 'package_weight', 'special_notes', 'location_index',
+                   'delivery_status', 'delivery_time', 'truck_id')
+
+
+class PlanFileError(ValueError):
+    """A plan file that's damaged, from another version, or not a plan file at all."""
+
+
+def _plan_records(router):
+    """The header, truck and package records for a router that has run its simulation."""
+    timeline = router.timeline
+    if timeline is None:
+        raise ValueError("The router hasn't run its delivery simulation yet - there's no plan to save")
+
+    day = router.start_time
+    header = {
+        'format': PLAN_FORMAT,
+        'version': PLAN_VERSION,
+        'day': day.date().isoformat(),
+        'start': seconds_of_day(day),
+        'hub': router.hub_address,
+        'drivers': router.fleet.drivers,
+        'shift': [router.fleet.shift_start, router.fleet.shift_end],
+        'total_miles': round(sum(truck.mileage for truck in router.trucks), 6),
+        'trucks': len(router.trucks),
+        'packages': router.package_table.size,
+    }
+    records = [header]
+
+    for truck in router.trucks:
+        history = timeline.trucks.get(truck.truck_id)
+        events = [list(event) for event in history.events] if history is not None else []
+
+        # The stops of each trip, in the order they were made
+        stops = [[] for _ in truck.trips]
+        trip = None
+        for event_time, kind, event_trip, package_id, miles, _ in events:
+            if kind == DeliveryTimeline.DEPARTED:
+                trip = event_trip
+            elif kind == DeliveryTimeline.DELIVERED and trip is not None and trip < len(stops):
+                stops[trip].append([package_id, event_time, round(miles, 6)])
+
+        records.append({
+            'type': 'truck',
+            'truck_id': truck.truck_id,
+            'capacity': truck.capacity,
+            'speed': truck.speed,
+            'max_weight': truck.max_weight,
+            'miles': round(truck.mileage, 6),
+            'trips': [{'departure': seconds_of_day(departure), 'packages': list(package_ids), 'stops': trip_stops}
+                      for package_ids, departure, trip_stops in zip(truck.trips, truck.trip_departures, stops)],
+            'events': events,
+        })
+
+    for package_id, row in sorted(router.package_table.iter_items(fields=PACKAGE_COLUMNS)):
+        record = {'type': 'package'}
+        record.update(zip(PACKAGE_COLUMNS, row))
+        if record['delivery_time'] is not None:
+            record['delivery_time'] = seconds_of_day(record['delivery_time'])
+
+        history = timeline.packages.get(package_id)
+        if history is not None:
+            record['history'] = {
+                'truck_id': history.truck_id,
+                'trip': history.trip,
+                'address': history.address,
+                'deadline': history.deadline,
+                'available_time': history.available_time,
+                'address_pending': history.address_pending,
+                'events': [[event_time, kind, list(details) if isinstance(details, tuple) else details]
+                           for event_time, kind, details in history.events],
+            }
+        records.append(record)
+
+    return records
+
+
+def save_plan(router, file_path, binary=None):
+    """
+    Write a computed day to a plan file.
+
+    Args:
+        router (DeliveryRouter): A router that has run run_delivery_simulation()
+        file_path (str): Where to write it
+        binary (bool): Pickled .wgp form (True) or JSON lines (False) - by
+            default a .wgp extension means binary
+
+    Returns:
+        int: How many records were written
+    """
+    records = _plan_records(router)
+    if binary is None:
+        binary = file_path.endswith(BINARY_EXTENSION)
+
+    if binary:
+        with open(file_path, 'wb') as file:
+            file.write(BINARY_MAGIC)
+            file.write(PLAN_VERSION.to_bytes(2, 'little'))
+            pickle.dump(records, file, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+                file.write("\n")
+    return len(records)
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Unpickles lists, dicts, strings and numbers only - any class or function is refused."""
+
+    def find_class(self, module, name):
+        raise PlanFileError(f"Plan file wants to load {module}.{name} - plan files only hold plain data")
+
+
+def read_plan_records(file_path):
+    """
+    Read a plan file's records (either form) and check its version.
+
+    Args:
+        file_path (str): A .jsonl or .wgp plan file
+
+    Returns:
+        list: The header record, then the truck and package records
+
+    Raises:
+        PlanFileError: If it isn't a plan file this version can read
+    """
+    with open(file_path, 'rb') as file:
+        data = file.read()
+
+    try:
+        if data.startswith(BINARY_MAGIC):
+            version = int.from_bytes(data[len(BINARY_MAGIC):len(BINARY_MAGIC) + 2], 'little')
+            if version != PLAN_VERSION:
+                raise PlanFileError(f"{file_path} is plan format version {version}, "
+                                    f"this program reads version {PLAN_VERSION}")
+            records = _PlainUnpickler(io.BytesIO(data[len(BINARY_MAGIC) + 2:])).load()
+        else:
+            records = [json.loads(line) for line in data.decode('utf-8').splitlines() if line.strip()]
+    except (pickle.UnpicklingError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise PlanFileError(f"{file_path} isn't a readable plan file: {error}") from error
+
+    header = records[0] if isinstance(records, list) and records and isinstance(records[0], dict) else {}
+    if header.get('format') != PLAN_FORMAT:
+        raise PlanFileError(f"{file_path} isn't a WGUPS plan file")
+    if header.get('version') != PLAN_VERSION:
+        raise PlanFileError(f"{file_path} is plan format version {header.get('version')}, "
+                            f"this program reads version {PLAN_VERSION}")
+    return records
+
+
+def load_plan(file_path):
+    """
+    Rebuild a router from a plan file, as if it had just run its simulation.
+
+    Nothing gets planned or simulated: the package table, trucks, trips and
+    timeline come straight from the file. The distance table isn't loaded
+    either, so the router is for looking at the day (StatusQuery, the
+    supervisor views, reports), not for planning another one.
+
+    Args:
+        file_path (str): A .jsonl or .wgp plan file
+
+    Returns:
+        DeliveryRouter: With package_table, trucks, package_trips,
+            total_distance and timeline filled in
+
+    Raises:
+        PlanFileError: If it isn't a plan file this version can read, or a
+            record in it is missing fields or has the wrong kind of value
+    """
+    records = read_plan_records(file_path)
+    try:
+        return _router_from_records(records)
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as error:
+        # The version matched but a record doesn't look like this version writes it
+        raise PlanFileError(f"{file_path} has a damaged record ({type(error).__name__}: {error})") from error
+
+
+def _router_from_records(records):
+    """The DeliveryRouter for a plan file's records (see load_plan)."""
+    from main import DeliveryRouter  # main imports a lot; only needed once a plan is actually loaded
+
+    header = records[0]
+    truck_records = [record for record in records if record.get('type') == 'truck']
+    package_records = [record for record in records if record.get('type') == 'package']
+
+    day = datetime.datetime.fromisoformat(header['day'])
+    fleet = FleetConfig([TruckSpec(record['truck_id'], record['capacity'], record['max_weight'], record['speed'])
+                         for record in truck_records],
+                        header['drivers'], *header['shift'])
+    router = DeliveryRouter(hub_address=header['hub'], fleet=fleet, start_time=at_seconds(day, header['start']))
+
+    # Trucks and their trips, as they were at the end of the day
+    trucks = {truck.truck_id: truck for truck in router.trucks}
+    timeline = DeliveryTimeline(router.start_time)
+    for record in truck_records:
+        truck = trucks[record['truck_id']]
+        truck.trips = [list(trip['packages']) for trip in record['trips']]
+        truck.trip_departures = [at_seconds(day, trip['departure']) for trip in record['trips']]
+        truck.mileage = record['miles']
+        if truck.trips:
+            truck.packages = list(truck.trips[-1])
+            truck.departure_time = truck.trip_departures[-1]
+        for trip, package_ids in enumerate(truck.trips):
+            for package_id in package_ids:
+                router.package_trips[package_id] = (truck, trip)
+
+        history = _TruckHistory(truck.truck_id)
+        history.events = [tuple(event) for event in record['events']]
+        if history.events:
+            truck.current_time = at_seconds(day, history.events[-1][0])
+        timeline.trucks[truck.truck_id] = history
+
+    # The package table, with every package's final status - sized up front so it never has to grow
+    table = router.package_table = HashTable(initial_capacity=max(40, len(package_records)))
+    for record in package_records:
+        package_id = record['package_id']
+        table.insert(package_id, record['delivery_address'], record['delivery_city'], record['delivery_state'],
+                     record['delivery_zip'], record['delivery_deadline'], record['package_weight'],
+                     location_index=record['location_index'], special_notes=record['special_notes'])
+        delivered = record['delivery_time']
+        table.update_package_status(package_id, record['delivery_status'],
+                                    at_seconds(day, delivered) if delivered is not None else None,
+                                    record['truck_id'])
+
+        saved = record.get('history')
+        if saved is not None:
+            history = _PackageHistory(package_id, saved['truck_id'], saved['trip'], saved['address'],
+                                      saved['deadline'], saved['available_time'], saved['address_pending'])
+            history.events = [(event_time, kind, tuple(details) if isinstance(details, list) else details)
+                              for event_time, kind, details in saved['events']]
+            timeline.packages[package_id] = history
+
+    timeline.finish()
+    router.timeline = timeline
+    router.total_distance = header['total_miles']
+    return router
@@ -0,0 +1,400 @@
+# route_optimizer.py - Local search improvement for WGUPS truck routes
+"""
+WGUPS Route Improvement
+
+Nearest neighbor gives a decent route fast, but it usually ends up
+15-25% longer than it has to be because early greedy choices force long
+jumps later. This module cleans up a finished route with local search:
+
+- 2-opt: take two legs of the route and reconnect them the other way,
+  which reverses the stops in between (this removes crossing paths)
+- Or-opt: pick up a run of 1-3 stops and drop it somewhere else
+
+Both only look at each stop's nearest neighbors (neighbor lists) and skip
+stops that didn't lead to an improvement last time until something near
+them changes (don't-look bits). That keeps each pass close to linear
+instead of checking every pair of stops.
+
+It also has a deadline-aware route builder (deadline_insertion_tour) that
+can replace nearest neighbor as the starting route.
+
+A route here is a "tour": a list of node numbers where tour[0] is the hub.
+The truck starts there and drives back to it at the end. The caller
+supplies distance(node_a, node_b) and, optionally, count_late(tour) so a
+move is only kept if it doesn't make more packages late.
+"""
+
+import heapq
+import time
+from collections import deque
+
+# Most improving moves per stop before improvement stops (routes usually
+# settle after less than one per stop). It's counted in moves, not seconds,
+# so a route comes out the same on any machine
+MOVES_PER_STOP = 5
+
+
+def build_neighbor_lists(node_count, distance, neighbor_count):
+    """
+    Find the closest few nodes for every node.
+
+    Args:
+        node_count (int): Nodes are numbered 0 .. node_count - 1
+        distance (callable): distance(node_a, node_b) -> miles
+        neighbor_count (int): How many neighbors to keep per node
+
+    Returns:
+        list: neighbors[node] is a list of nodes, closest first
+    """
+    neighbors = []
+    for node in range(node_count):
+        others = (other for other in range(node_count) if other != node)
+        neighbors.append(heapq.nsmallest(neighbor_count, others, key=lambda other: distance(node, other)))
+    return neighbors
+
+
+def tour_length(tour, distance):
+    """Total miles to drive the tour, including the trip back to the hub."""
+    total = 0.0
+    for i in range(len(tour)):
+        total += distance(tour[i], tour[(i + 1) % len(tour)])
+    return total
+
+
+def deadline_insertion_tour(node_count, distance, travel_time, deadlines, start_time):
+    """
+    Build a tour that meets deadlines by inserting stops one at a time.
+
+    This is a simple VRPTW-style insertion heuristic. Stops go in earliest
+    deadline first (ties: farthest from the hub first), and each one is put
+    in the spot that adds the fewest miles without making it or any stop
+    after it late. If a stop can't make its deadline anywhere, it goes in
+    the cheapest spot that at least doesn't make any other stop late.
+
+    To check a spot in O(1) I keep, for every position in the tour, the
+    arrival time and the "slack": how long everything from that position on
+    could be pushed back before something misses its deadline. Inserting a
+    stop pushes the rest of the route back by a fixed amount of time, so the
+    spot is fine as long as that shift fits in the slack.
+
+    Args:
+        node_count (int): Nodes are numbered 0 .. node_count - 1, node 0 is the hub
+        distance (callable): distance(node_a, node_b) -> miles
+        travel_time (callable): travel_time(node_a, node_b) -> driving time (any unit, the
+            WGUPS router uses whole seconds)
+        deadlines (list): deadlines[node] in the same unit after midnight (the hub's is ignored)
+        start_time (int): When the truck leaves the hub, same unit after midnight
+
+    Returns:
+        list: The tour, starting with the hub (node 0)
+    """
+    order = sorted(range(1, node_count), key=lambda node: (deadlines[node], -distance(0, node)))
+
+    tour = [0]
+    arrival = [start_time]
+    slack = [float('inf')]
+
+    for node in order:
+        # Best spot that keeps everyone on time, best spot where only this
+        # stop is late, and the cheapest spot of all (a last resort)
+        best = [None, None, None]
+        best_added = [float('inf')] * 3
+
+        for position in range(len(tour)):
+            before = tour[position]
+            after = tour[position + 1] if position + 1 < len(tour) else 0
+            added = distance(before, node) + distance(node, after) - distance(before, after)
+
+            if added < best_added[2]:
+                best[2], best_added[2] = position, added
+            if added >= best_added[1]:
+                continue
+
+            if position + 1 < len(tour):
+                shift = travel_time(before, node) + travel_time(node, after) - travel_time(before, after)
+                if shift > slack[position + 1]:
+                    continue  # Something later in the route would be late
+            best[1], best_added[1] = position, added
+
+            if added < best_added[0] and arrival[position] + travel_time(before, node) <= deadlines[node]:
+                best[0], best_added[0] = position, added
+
+        best_position = next(position for position in best if position is not None)
+        tour.insert(best_position + 1, node)
+
+        # Redo arrival times from the new stop on, then the slack from the back
+        arrival = arrival[:best_position + 1]
+        for position in range(best_position + 1, len(tour)):
+            arrival.append(arrival[-1] + travel_time(tour[position - 1], tour[position]))
+
+        # Stops that are already late don't count - pushing them back doesn't add a late package
+        slack = [float('inf')] * len(tour)
+        remaining = float('inf')
+        for position in range(len(tour) - 1, 0, -1):
+            spare = deadlines[tour[position]] - arrival[position]
+            if spare >= 0:
+                remaining = min(remaining, spare)
+            slack[position] = remaining
+
+    return tour
+
+
+class ImprovementBudget:
+    """
+    How much improving a route gets: a number of improving moves, and
+    optionally a wall-clock limit on top of that.
+
+    Only the move cap is reproducible - with a time limit, a slower or
+    busier machine can stop earlier and end up with a different route.
+    """
+
+    __slots__ = ('moves_left', 'stop_time')
+
+    def __init__(self, max_moves, time_budget=None):
+        """
+        Args:
+            max_moves (int): Improving moves allowed in all
+            time_budget (float): Seconds allowed in all (None = no time limit)
+        """
+        self.moves_left = max_moves
+        self.stop_time = None if time_budget is None else time.perf_counter() + time_budget
+
+    def spend(self):
+        """Count one improving move."""
+        self.moves_left -= 1
+
+    def exhausted(self):
+        """True once the moves (or the time) are used up."""
+        return self.moves_left <= 0 or (self.stop_time is not None and time.perf_counter() >= self.stop_time)
+
+
+class TourImprover:
+    """
+    One pluggable improvement stage.
+
+    Subclasses implement improve() and return a tour that is never longer
+    than the one they were given.
+    """
+
+    name = "no-op"
+
+    def improve(self, tour, distance, neighbors, count_late, budget):
+        """
+        Try to shorten the tour.
+
+        Args:
+            tour (list): Nodes in driving order, tour[0] is the hub
+            distance (callable): distance(node_a, node_b) -> miles
+            neighbors (list): Output of build_neighbor_lists()
+            count_late (callable): count_late(tour) -> number of late packages
+            budget (ImprovementBudget): Call spend() for every improving move
+                and stop once exhausted()
+
+        Returns:
+            list: The improved tour
+        """
+        return tour
+
+
+class TwoOptImprover(TourImprover):
+    """
+    2-opt with neighbor lists and don't-look bits.
+
+    A 2-opt move removes two legs (a, a_next) and (c, c_next) and adds
+    (a, c) and (a_next, c_next), reversing everything in between.
+    """
+
+    name = "2-opt"
+
+    def improve(self, tour, distance, neighbors, count_late, budget):
+        tour = list(tour)
+        size = len(tour)
+        if size < 4:
+            return tour
+
+        position = [0] * size
+        for i, node in enumerate(tour):
+            position[node] = i
+
+        late = count_late(tour)
+        queue = deque(tour[1:])  # Every stop starts with its don't-look bit off
+        queued = [True] * size
+        queued[tour[0]] = False
+
+        while queue and not budget.exhausted():
+            a = queue.popleft()
+            queued[a] = False
+
+            move = self._find_move(tour, position, a, distance, neighbors, count_late, late)
+            if move is None:
+                continue  # Leave the bit on until a neighbor changes
+
+            tour, late, touched = move
+            budget.spend()
+            for i, node in enumerate(tour):
+                position[node] = i
+            for node in touched:
+                if not queued[node] and node != tour[0]:
+                    queued[node] = True
+                    queue.append(node)
+
+        return tour
+
+    def _find_move(self, tour, position, a, distance, neighbors, count_late, late):
+        """Look for an improving, deadline-safe 2-opt move at node a."""
+        size = len(tour)
+        i = position[a]
+        a_next = tour[(i + 1) % size]
+        a_prev = tour[i - 1]
+
+        for c in neighbors[a]:
+            j = position[c]
+            gain_limit = distance(a, c)
+
+            # Successor side: swap (a, a_next), (c, c_next) for (a, c), (a_next, c_next)
+            c_next = tour[(j + 1) % size]
+            if c != a_next and c_next != a:
+                delta = gain_limit + distance(a_next, c_next) - distance(a, a_next) - distance(c, c_next)
+                if delta < -1e-9:
+                    candidate = self._reverse(tour, min(i, j) + 1, max(i, j))
+                    candidate_late = count_late(candidate)
+                    if candidate_late <= late:
+                        return candidate, candidate_late, (a, a_next, c, c_next)
+
+            # Predecessor side: swap (a_prev, a), (c_prev, c) for (a, c), (a_prev, c_prev)
+            if i == 0 or j == 0:
+                continue
+            c_prev = tour[j - 1]
+            if c != a_prev and c_prev != a:
+                delta = gain_limit + distance(a_prev, c_prev) - distance(a_prev, a) - distance(c_prev, c)
+                if delta < -1e-9:
+                    candidate = self._reverse(tour, min(i, j), max(i, j) - 1)
+                    candidate_late = count_late(candidate)
+                    if candidate_late <= late:
+                        return candidate, candidate_late, (a, a_prev, c, c_prev)
+
+        return None
+
+    @staticmethod
+    def _reverse(tour, start, end):
+        """Copy of the tour with tour[start..end] reversed (the hub never moves)."""
+        return tour[:start] + tour[start:end + 1][::-1] + tour[end + 1:]
+
+
+class OrOptImprover(TourImprover):
+    """
+    Or-opt: move a run of 1 to 3 stops to a better spot, either way round.
+
+    Insertion spots are only tried next to the neighbors of the run's two
+    ends, so each try is cheap.
+    """
+
+    name = "or-opt"
+
+    def __init__(self, max_segment=3):
+        self.max_segment = max_segment
+
+    def improve(self, tour, distance, neighbors, count_late, budget):
+        tour = list(tour)
+        if len(tour) < 4:
+            return tour
+
+        late = count_late(tour)
+        improved = True
+        while improved and not budget.exhausted():
+            improved = False
+            for segment_length in range(1, self.max_segment + 1):
+                start = 1
+                while start + segment_length <= len(tour) and not budget.exhausted():
+                    move = self._find_move(tour, start, segment_length, distance, neighbors, count_late, late)
+                    if move is None:
+                        start += 1
+                        continue
+                    tour, late = move
+                    budget.spend()
+                    improved = True
+
+        return tour
+
+    def _find_move(self, tour, start, segment_length, distance, neighbors, count_late, late):
+        """Look for an improving, deadline-safe place to move tour[start:start + length]."""
+        size = len(tour)
+        end = start + segment_length - 1
+        first, last = tour[start], tour[end]
+        before, after = tour[start - 1], tour[(end + 1) % size]
+
+        removal_gain = distance(before, first) + distance(last, after) - distance(before, after)
+        if removal_gain <= 1e-9:
+            return None
+
+        segment = tour[start:end + 1]
+        remaining = tour[:start] + tour[end + 1:]
+        remaining_position = {node: i for i, node in enumerate(remaining)}
+
+        # Try inserting after each neighbor of the ends, or just before it
+        spots = set()
+        for node in neighbors[first] + neighbors[last]:
+            if node in remaining_position:
+                spot = remaining_position[node]
+                spots.add(spot)
+                spots.add(spot - 1 if spot > 0 else len(remaining) - 1)
+
+        for spot in spots:
+            left = remaining[spot]
+            right = remaining[(spot + 1) % len(remaining)]
+            if left == before and right == after:
+                continue
+            base = distance(left, right)
+
+            for ordered in (segment, segment[::-1]):
+                added = distance(left, ordered[0]) + distance(ordered[-1], right) - base
+                if added < removal_gain - 1e-9:
+                    candidate = remaining[:spot + 1] + ordered + remaining[spot + 1:]
+                    candidate_late = count_late(candidate)
+                    if candidate_late <= late:
+                        return candidate, candidate_late
+
+        return None
+
+
+def improve_route(tour, distance, improvers, count_late=None, time_budget=None, neighbor_count=8,
+                  max_moves=None):
+    """
+    Run the improvement stages over a tour until none of them helps or the budget runs out.
+
+    Args:
+        tour (list): Nodes in driving order, tour[0] is the hub
+        distance (callable): distance(node_a, node_b) -> miles
+        improvers (list): TourImprover objects to run, in order
+        count_late (callable): count_late(tour) -> late packages (None = no deadlines)
+        time_budget (float): Seconds allowed for the whole improvement (None = no
+            time limit, only the move cap - the same tour always gives the same result)
+        neighbor_count (int): Size of each node's neighbor list
+        max_moves (int): Improving moves allowed (defaults to MOVES_PER_STOP per stop)
+
+    Returns:
+        list: The improved tour (tour[0] is still the hub)
+    """
+    if not improvers or len(tour) < 4:
+        return list(tour)
+
+    if count_late is None:
+        def count_late(_):
+            return 0
+
+    if max_moves is None:
+        max_moves = MOVES_PER_STOP * (len(tour) - 1)
+    budget = ImprovementBudget(max_moves, time_budget)
+    neighbors = build_neighbor_lists(len(tour), distance, neighbor_count)
+
+    best_length = tour_length(tour, distance)
+    while not budget.exhausted():
+        for improver in improvers:
+            tour = improver.improve(tour, distance, neighbors, count_late, budget)
+
+        length = tour_length(tour, distance)
+        if length >= best_length - 1e-9:
+            break
+        best_length = length
+
+    return tour
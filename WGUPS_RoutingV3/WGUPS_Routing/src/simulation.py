@@ -0,0 +1,557 @@
+# simulation.py - Discrete-event delivery simulation for WGUPS
+"""
+WGUPS Delivery Simulation
+
+The original simulation ran one truck all the way to the end of its route,
+then the next truck, and faked waiting for package 9's address by adding
+30 minutes at a time until it was past 10:20.
+
+This engine runs every truck on one shared clock instead. Everything that
+happens during the day is an event with a time, and a heap (heapq) always
+hands back the next one:
+
+- DEPARTURE           a truck leaves the hub (or waits for late packages)
+- ARRIVAL             a truck pulls up at a stop
+- DELIVERY            a package is handed over
+- ADDRESS_CORRECTION  a wrong address gets fixed (package 9 at 10:20 AM)
+- PACKAGE_CHANGE      management changes a package's address, deadline or
+                      availability partway through the day
+- PACKAGE_ARRIVAL     a delayed package finally reaches the hub
+- RETURN_TO_HUB       a truck is back and can be reloaded for its next trip
+
+Handling an event can schedule more events. Each event is pushed and
+popped once, so a whole day costs O(E log E) for E events no matter how
+many trucks are out, and a change like an address correction takes effect
+at the exact minute it happens - a truck waiting on it starts driving
+right then.
+
+Event times are whole seconds after midnight (see clock.py). The trucks'
+departure/current times and the package table's delivery times are still
+datetimes, since that's what the supervisor views show.
+
+A change to a package that's already out on a truck only re-plans the rest
+of that truck's route, starting from wherever the truck is heading next.
+Nothing else in the day is touched, so a change costs one small route
+optimization instead of a re-run of the whole day.
+
+Drivers are a shared resource too. A truck can only leave when one is free;
+otherwise it waits in line, and the next driver back at the hub takes the
+truck that's been waiting longest.
+"""
+
+import heapq
+import time
+from collections import deque
+from itertools import count
+
+from clock import SECONDS_PER_MINUTE, travel_seconds
+from timeline import DeliveryTimeline
+
+
+class SimulationEvent:
+    """One thing that happens at one moment during the day."""
+
+    DEPARTURE = "departure"
+    ARRIVAL = "arrival"
+    DELIVERY = "delivery"
+    ADDRESS_CORRECTION = "address_correction"
+    PACKAGE_CHANGE = "package_change"
+    PACKAGE_ARRIVAL = "package_arrival"
+    RETURN_TO_HUB = "return_to_hub"
+
+    __slots__ = ('time', 'kind', 'truck', 'package_id', 'change')
+
+    def __init__(self, time, kind, truck=None, package_id=None, change=None):
+        self.time = time
+        self.kind = kind
+        self.truck = truck
+        self.package_id = package_id
+        self.change = change  # PackageChange for ADDRESS_CORRECTION and PACKAGE_CHANGE
+
+
+class PackageChange:
+    """
+    Something management changes about one package at one moment.
+
+    Only the fields that are given change. An address change can leave out
+    the city, state or zip to keep the old ones.
+    """
+
+    __slots__ = ('package_id', 'minutes', 'address', 'city', 'state', 'zip', 'deadline',
+                 'available_minutes', 'previous_address')
+
+    def __init__(self, package_id, minutes, address=None, city=None, state=None, zip_code=None,
+                 deadline=None, available_minutes=None):
+        """
+        Args:
+            package_id (int): The package that changes
+            minutes (int): When the change happens, in minutes after midnight
+            address (str): New delivery address
+            city (str): New city
+            state (str): New state
+            zip_code (str): New zip code
+            deadline (str): New deadline, like "10:30 AM" or "EOD"
+            available_minutes (int): New time the package reaches the hub
+        """
+        self.package_id = package_id
+        self.minutes = minutes
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip = zip_code
+        self.deadline = deadline
+        self.available_minutes = available_minutes
+        self.previous_address = None  # Filled in when an address change is applied
+
+    def describe(self):
+        """Short text like 'address -> 410 S State St, deadline -> 10:30 AM'."""
+        parts = []
+        if self.address is not None:
+            parts.append(f"address -> {self.address}")
+        if self.deadline is not None:
+            parts.append(f"deadline -> {self.deadline}")
+        if self.available_minutes is not None:
+            hours, minutes = divmod(self.available_minutes, 60)
+            parts.append(f"at the hub from {(hours - 1) % 12 + 1}:{minutes:02d} {'AM' if hours < 12 else 'PM'}")
+        return ", ".join(parts) or "no change"
+
+
+class EventQueue:
+    """
+    Min-heap of events ordered by time.
+
+    Events at the same time come out in the order they were scheduled (the
+    counter breaks ties), which keeps every run exactly repeatable.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = count()
+
+    def push(self, event):
+        heapq.heappush(self._heap, (event.time, next(self._counter), event))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class _TruckState:
+    """Where one truck is in its day."""
+
+    __slots__ = ('truck', 'trip', 'route', 'next_stop', 'skipped', 'current_index', 'leg_distance',
+                 'waiting', 'has_driver', 'busy_until')
+
+    def __init__(self, truck):
+        self.truck = truck
+        self.trip = 0  # Which of the truck's trips it's on
+        self.route = []  # Package IDs in delivery order
+        self.next_stop = 0  # Position in route of the next package
+        self.skipped = []  # Packages passed over until their address is fixed
+        self.current_index = None  # Location index the truck is at
+        self.leg_distance = 0.0  # Miles driven on the last leg
+        self.waiting = False  # Parked until an event (correction/late package) wakes it
+        self.has_driver = False
+        self.busy_until = None  # When the truck gets to current_index
+
+
+class DeliverySimulation:
+    """
+    Runs the delivery day for a set of trucks on one event queue.
+
+    Routing, distances and the package table all come from the router, so
+    this class only decides *when* things happen.
+    """
+
+    def __init__(self, router, trucks=None, verbose=True, drivers=None):
+        """
+        Args:
+            router (DeliveryRouter): Supplies the package table, distances,
+                constraints and route planning
+            trucks (list): Trucks to run (defaults to every loaded truck)
+            verbose (bool): Print each delivery as it happens
+            drivers (int): How many trucks can be out at once (defaults to
+                the router's driver count)
+        """
+        self.router = router
+        self.trucks = [truck for truck in (trucks if trucks is not None else router.trucks)
+                       if truck.trips or truck.packages]
+        self.verbose = verbose
+        self.queue = EventQueue()
+        self.events_processed = 0
+        self.log = []  # (time, kind, truck_id, package_id) for every event handled
+
+        self.hub_index = None
+        self.states = {}
+        self.pending_corrections = set()  # Packages whose address isn't fixed yet
+        self.pending_arrivals = set()  # Packages that haven't reached the hub yet
+        self.free_drivers = router.driver_count if drivers is None else drivers
+        self.driver_queue = deque()  # Trucks ready to go with nobody to drive them
+        self.trip_of = {}  # package_id -> (truck, trip number)
+        self.changed_addresses = set()  # Packages delivered somewhere other than first listed
+        self.replans = []  # (time, truck_id, stops re-planned, seconds) for every suffix re-plan
+        self.timeline = DeliveryTimeline(router.start_time)  # Everything that happened, for status-at-time queries
+
+        self._handlers = {
+            SimulationEvent.DEPARTURE: self._on_departure,
+            SimulationEvent.ARRIVAL: self._on_arrival,
+            SimulationEvent.DELIVERY: self._on_delivery,
+            SimulationEvent.ADDRESS_CORRECTION: self._on_package_change,
+            SimulationEvent.PACKAGE_CHANGE: self._on_package_change,
+            SimulationEvent.PACKAGE_ARRIVAL: self._on_package_arrival,
+            SimulationEvent.RETURN_TO_HUB: self._on_return_to_hub,
+        }
+
+    def schedule(self, time, kind, truck=None, package_id=None, change=None):
+        """Add an event to the queue."""
+        self.queue.push(SimulationEvent(time, kind, truck, package_id, change))
+
+    def schedule_change(self, change):
+        """
+        Have a package change at change.minutes.
+
+        Can be called before run(), or while it's running for a change at
+        or after the current event's time.
+
+        Args:
+            change (PackageChange): What changes, and when
+        """
+        self.schedule(change.minutes * SECONDS_PER_MINUTE, SimulationEvent.PACKAGE_CHANGE,
+                      package_id=change.package_id, change=change)
+
+    def run(self):
+        """
+        Play the whole day out.
+
+        Returns:
+            float: Total miles driven by all the trucks
+        """
+        router = self.router
+        constraints = router.constraints
+        self.hub_index = router.distance_manager.resolve_address(router.hub_address)
+
+        for truck in self.trucks:
+            if not truck.trips:
+                # Loaded by hand rather than planned - that's one trip
+                truck.trips = [list(truck.packages)]
+                truck.trip_departures = [truck.departure_time]
+            truck.packages = list(truck.trips[0])
+            truck.departure_time = truck.trip_departures[0]
+            truck.current_time = truck.departure_time
+            truck.current_location = router.hub_address
+            truck.mileage = 0.0
+            state = self.states[truck.truck_id] = _TruckState(truck)
+            state.current_index = self.hub_index
+            departure_seconds = router._to_seconds(truck.departure_time)
+            self.schedule(departure_seconds, SimulationEvent.DEPARTURE, truck)
+
+            # Late flights and wrong addresses become events of their own
+            for trip, (package_ids, departure_time) in enumerate(zip(truck.trips, truck.trip_departures)):
+                departure_time = router._to_seconds(departure_time)
+                for package_id in package_ids:
+                    self.trip_of[package_id] = (truck, trip)
+                    package = router.package_table.lookup_view(package_id)
+                    available_minutes = constraints.available_minutes(package_id)
+                    correction = constraints.correction_for(package_id)
+                    self.timeline.add_package(
+                        package_id, truck.truck_id, trip, package.delivery_address, package.delivery_deadline,
+                        None if available_minutes is None else available_minutes * SECONDS_PER_MINUTE,
+                        address_pending=correction is not None)
+
+                    if available_minutes is not None:
+                        available_time = available_minutes * SECONDS_PER_MINUTE
+                        if available_time > departure_time:
+                            self.pending_arrivals.add(package_id)
+                            self.schedule(available_time, SimulationEvent.PACKAGE_ARRIVAL, truck, package_id)
+
+                    if correction is not None:
+                        # The listed address is known to be wrong, so it's held until then
+                        self.pending_corrections.add(package_id)
+                        change = PackageChange(package_id, correction.minutes, correction.address,
+                                               correction.city, correction.state, correction.zip)
+                        self.schedule(correction.minutes * SECONDS_PER_MINUTE,
+                                      SimulationEvent.ADDRESS_CORRECTION, truck, package_id, change)
+
+            # First trips are loaded at the start of the day
+            self.timeline.record_loaded(min(router._to_seconds(router.start_time), departure_seconds),
+                                        truck.truck_id, 0, truck.packages)
+
+        # Changes management has lined up for the day
+        for change in router.package_changes:
+            self.schedule_change(change)
+
+        while self.queue:
+            event = self.queue.pop()
+            self.events_processed += 1
+            self.log.append((event.time, event.kind, event.truck.truck_id if event.truck else None,
+                             event.package_id))
+            self._handlers[event.kind](event)
+
+        # Nothing left to happen - anyone still parked is waiting for something that never came
+        for state in self.states.values():
+            if state.waiting:
+                print(f"⚠️  Truck {state.truck.truck_id} never finished: still waiting on "
+                      f"packages {sorted(state.skipped or state.truck.packages)}")
+        for truck in self.driver_queue:
+            print(f"⚠️  Truck {truck.truck_id} never left: no driver came back for it")
+
+        self.timeline.finish()
+
+        return sum(truck.mileage for truck in self.trucks)
+
+    def _say(self, message):
+        if self.verbose:
+            print(message)
+
+    def _location_of(self, package_id):
+        return self.router.package_table.lookup_view(package_id).location_index
+
+    def _drive_to(self, state, now, location_index):
+        """Drive a truck to a location. Returns the arrival time."""
+        truck = state.truck
+        distance = self.router.distance_manager.get_distance_by_index(state.current_index, location_index)
+
+        # How long it takes to drive there, to the second
+        truck.mileage += distance
+        state.current_index = location_index
+        state.leg_distance = distance
+        state.busy_until = now + travel_seconds(distance, truck.speed)
+        return state.busy_until
+
+    def _next_stop(self, state, now):
+        """Send a truck to its next deliverable package, or back to the hub."""
+        truck = state.truck
+
+        while state.next_stop < len(state.route):
+            package_id = state.route[state.next_stop]
+            state.next_stop += 1
+
+            if package_id in self.pending_corrections:
+                # Address hasn't been corrected yet, skip it for now
+                state.skipped.append(package_id)
+                continue
+
+            arrival_time = self._drive_to(state, now, self._location_of(package_id))
+            self.schedule(arrival_time, SimulationEvent.ARRIVAL, truck, package_id)
+            return
+
+        # Second pass: anything we had to skip that's deliverable now
+        for package_id in state.skipped:
+            if package_id not in self.pending_corrections:
+                state.skipped.remove(package_id)
+                arrival_time = self._drive_to(state, now, self._location_of(package_id))
+                self.schedule(arrival_time, SimulationEvent.ARRIVAL, truck, package_id)
+                return
+
+        if state.skipped:
+            # Park here until the address correction comes in
+            state.waiting = True
+            return
+
+        # Drive back to the hub
+        return_time = self._drive_to(state, now, self.hub_index)
+        self.schedule(return_time, SimulationEvent.RETURN_TO_HUB, truck)
+
+    def _on_departure(self, event):
+        truck = event.truck
+        state = self.states[truck.truck_id]
+
+        if any(package_id in self.pending_arrivals for package_id in truck.packages):
+            # Some of the load is still on a plane - leave when it lands
+            state.waiting = True
+            return
+        state.waiting = False
+
+        if not state.has_driver:
+            if not self.free_drivers:
+                # Everyone's out driving - wait for the next driver back
+                self.driver_queue.append(truck)
+                return
+            self.free_drivers -= 1
+            state.has_driver = True
+
+        truck.departure_time = self.router._from_seconds(event.time)
+        truck.trip_departures[state.trip] = truck.departure_time
+        truck.current_time = truck.departure_time
+        self.timeline.record_departed(event.time, truck.truck_id, state.trip, truck.packages, truck.mileage)
+        self._say(f"\nStarting deliveries for Truck {truck.truck_id}")
+
+        # Plan the route right as the truck leaves, with everything known by then
+        # (or use the one planned in parallel for this departure)
+        state.route = self.router.route_for_trip(truck, state.trip)
+        state.next_stop = 0
+        self._next_stop(state, event.time)
+
+    def _on_arrival(self, event):
+        truck = event.truck
+        state = self.states[truck.truck_id]
+        package = self.router.package_table.lookup_view(event.package_id)
+
+        if package.location_index != state.current_index:
+            # Its address changed while we were driving here - fit it back into the rest of the route
+            state.next_stop -= 1
+            truck.current_time = self.router._from_seconds(event.time)
+            self._replan_suffix(state, event.time)
+            self._next_stop(state, event.time)
+            return
+
+        truck.current_time = self.router._from_seconds(event.time)
+        truck.current_location = package.delivery_address
+        self.schedule(event.time, SimulationEvent.DELIVERY, truck, event.package_id)
+
+    def _on_delivery(self, event):
+        router = self.router
+        truck = event.truck
+        state = self.states[truck.truck_id]
+        package_id = event.package_id
+
+        # Mark the package as delivered
+        delivery_time = router._from_seconds(event.time)
+        router.package_table.update_package_status(package_id, "Delivered", delivery_time)
+        self.timeline.record_delivered(event.time, truck.truck_id, package_id, truck.mileage)
+
+        corrected = " [Address Corrected]" if package_id in self.changed_addresses else ""
+        self._say(f"  Truck {truck.truck_id}: Package {package_id} delivered to {truck.current_location} at "
+                  f"{delivery_time.strftime('%I:%M %p')} (Distance: {state.leg_distance:.1f} miles){corrected}")
+
+        self._next_stop(state, event.time)
+
+    def _on_package_change(self, event):
+        """Apply a PackageChange (an address correction is one too)."""
+        router = self.router
+        table = router.package_table
+        change = event.change
+        package_id = change.package_id
+        package = table.lookup_view(package_id)
+
+        if package is None:
+            print(f"⚠️  Change for unknown package {package_id} ignored")
+            return
+        if package.delivery_status == "Delivered":
+            self._say(f"⚠️  Package {package_id} was already delivered - change ({change.describe()}) ignored")
+            return
+
+        if change.address is not None:
+            change.previous_address = package.delivery_address
+            table.update_package_address(
+                package_id, change.address,
+                package.delivery_city if change.city is None else change.city,
+                package.delivery_state if change.state is None else change.state,
+                package.delivery_zip if change.zip is None else change.zip,
+                location_index=router.distance_manager.resolve_address(change.address))
+            self.pending_corrections.discard(package_id)
+            self.changed_addresses.add(package_id)
+
+            correction = router.constraints.correction_for(package_id)
+            if correction is not None and correction.original_address is None:
+                correction.original_address = change.previous_address
+
+        if change.deadline is not None:
+            table.update_package_deadline(package_id, change.deadline)
+        if change.address is not None or change.deadline is not None:
+            self.timeline.record_changed(event.time, package_id, change.address, change.deadline)
+
+        truck, trip = self.trip_of.get(package_id, (None, None))
+        state = self.states.get(truck.truck_id) if truck is not None else None
+        on_board = state is not None and state.trip == trip and bool(state.route)
+
+        if change.available_minutes is not None:
+            router.constraints.set_available_minutes(package_id, change.available_minutes)
+            if on_board:
+                print(f"⚠️  Package {package_id} is already out on Truck {truck.truck_id} - "
+                      f"its new arrival time doesn't matter any more")
+            elif change.available_minutes * SECONDS_PER_MINUTE > event.time:
+                self.pending_arrivals.add(package_id)
+                self.schedule(change.available_minutes * SECONDS_PER_MINUTE, SimulationEvent.PACKAGE_ARRIVAL,
+                              truck, package_id)
+            else:
+                self.pending_arrivals.discard(package_id)
+
+        if event.kind == SimulationEvent.PACKAGE_CHANGE:
+            self._say(f"  Package {package_id} changed at "
+                      f"{router._from_seconds(event.time).strftime('%I:%M %p')}: {change.describe()}")
+
+        if truck is None:
+            return
+
+        # A route planned in advance for this trip is out of date now
+        router.planned_routes.pop((truck.truck_id, trip), None)
+
+        if not on_board:
+            # Not out yet - its route gets planned with the new details when it leaves
+            return
+
+        if state.waiting:
+            # Parked waiting on an address - re-plan and get going
+            state.waiting = False
+            truck.current_time = router._from_seconds(event.time)
+            self._replan_suffix(state, event.time)
+            self._next_stop(state, event.time)
+        elif package_id in state.route[state.next_stop:] or package_id in state.skipped:
+            # Still to be delivered - re-plan whatever is left after the stop we're driving to
+            self._replan_suffix(state, event.time)
+
+    def _replan_suffix(self, state, now):
+        """
+        Re-plan the part of a truck's route it hasn't driven yet.
+
+        The truck keeps going to the stop it's already driving to; the rest
+        of its packages get a fresh route from there.
+        """
+        remaining = state.route[state.next_stop:] + state.skipped
+        if len(remaining) < 2:
+            # Nothing to put in order
+            state.route = state.route[:state.next_stop] + remaining
+            state.skipped = []
+            return
+
+        started = time.perf_counter()
+        start_time = max(now, state.busy_until) if state.busy_until is not None else now
+        suffix = self.router.calculate_route_for_truck(state.truck, package_ids=remaining,
+                                                       departure_time=self.router._from_seconds(start_time),
+                                                       start_index=state.current_index)
+        state.route = state.route[:state.next_stop] + suffix
+        state.skipped = []
+
+        seconds = time.perf_counter() - started
+        self.replans.append((now, state.truck.truck_id, len(remaining), seconds))
+        self._say(f"  Re-planned Truck {state.truck.truck_id}'s last {len(remaining)} stops "
+                  f"in {seconds * 1000:.1f} ms")
+
+    def _on_package_arrival(self, event):
+        self.pending_arrivals.discard(event.package_id)
+
+        # If the truck is sitting at the hub waiting for this package, it can go now
+        state = self.states.get(event.truck.truck_id)
+        if (state is not None and state.waiting and not state.route
+                and event.package_id in event.truck.packages):
+            self.schedule(event.time, SimulationEvent.DEPARTURE, event.truck)
+
+    def _on_return_to_hub(self, event):
+        truck = event.truck
+        state = self.states[truck.truck_id]
+        truck.current_time = self.router._from_seconds(event.time)
+        truck.current_location = self.router.hub_address
+        self._say(f"Truck {truck.truck_id} completed route: {truck.mileage:.1f} total miles")
+        self.timeline.record_returned(event.time, truck.truck_id, state.trip, truck.mileage)
+
+        # The driver is free again - first dibs go to a truck that's been waiting
+        state.has_driver = False
+        self.free_drivers += 1
+        if self.driver_queue:
+            self.schedule(event.time, SimulationEvent.DEPARTURE, self.driver_queue.popleft())
+
+        # Reload for the next trip, if there is one
+        if state.trip + 1 < len(truck.trips):
+            state.trip += 1
+            state.route = []
+            state.next_stop = 0
+            state.skipped = []
+            truck.packages = list(truck.trips[state.trip])
+            self.timeline.record_loaded(event.time, truck.truck_id, state.trip, truck.packages)
+            self._say(f"Truck {truck.truck_id} reloaded with {len(truck.packages)} packages for trip "
+                      f"{state.trip + 1}")
+            self.schedule(max(event.time, self.router._to_seconds(truck.trip_departures[state.trip])),
+                          SimulationEvent.DEPARTURE, truck)
@@ -0,0 +1,387 @@
+# status_query.py - Supervisor status queries without the menu
+"""
+WGUPS Status Queries
+
+The supervisor menu in main.py asks for everything with input() and
+prints tables, so the only way for another program to get a status was
+to type into it and read the screen - and every session planned and
+simulated the whole day again.
+
+StatusQuery plans and simulates the day once and then answers any number
+of questions against that one plan. Every answer is a plain dict (or a
+list of them) that's ready for json.dump or csv, and each lookup is a
+bisect on the simulation's timeline, so a dashboard polling it pays
+microseconds per question:
+
+    query = StatusQuery.compute()
+    query.package(9, "10:25 AM")
+    query.truck(2, "9:00 AM")
+    query.fleet("10:00")
+
+The same thing from the command line (run from the src directory):
+
+    python status_query.py --at 10:00 --truck 2 --format json
+    python status_query.py --at 9:00 10:00 11:00 --package 6 9 25 --format csv
+    python status_query.py --stdin --format json      # one query per input line
+
+--save-plan FILE writes the computed day to a plan file, and --plan FILE
+answers from one instead of planning again (see plan_file.py):
+
+    python status_query.py --at 10:00 --save-plan ../output/plan.wgp
+    python status_query.py --plan ../output/plan.wgp --at 10:00 --truck 2
+
+With --stdin the plan is computed once and each line ("10:00",
+"10:00 truck 2" or "10:00 package 9") gets one line of output, so a
+dashboard can keep one process open instead of starting a new one per
+question.
+
+Times are shown as 24-hour HH:MM:SS. Queries accept "10:00 AM", "10:00"
+or "14:30".
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import json
+import sys
+from functools import lru_cache
+
+from main import DeliveryRouter
+
+TIME_FORMATS = ("%I:%M %p", "%I:%M%p", "%H:%M", "%H:%M:%S")
+
+# Shown when a text query can't be read
+QUERY_USAGE = 'Ask like "10:00", "10:00 truck 2" or "10:00 package 9"'
+
+# Column order for csv output
+PACKAGE_FIELDS = ("at", "package_id", "truck", "trip", "status", "time_info", "address", "deadline",
+                  "departure", "delivered")
+TRUCK_FIELDS = ("at", "truck", "status", "trip", "on_board", "delivered", "miles")
+
+
+def parse_query_time(text, day=None):
+    """
+    Turn "10:00 AM", "10:00" or "14:30" into a datetime on the delivery day.
+
+    Args:
+        text (str): The time
+        day (datetime): Any moment on the delivery day (defaults to Jan 1, 2024,
+            the day the router plans for)
+
+    Returns:
+        datetime: The moment
+
+    Raises:
+        ValueError: If the text isn't a time
+    """
+    day = day or datetime.datetime(2024, 1, 1)
+    hour, minute, second = _parse_clock(text)
+    return day.replace(hour=hour, minute=minute, second=second, microsecond=0)
+
+
+@lru_cache(maxsize=1024)
+def _parse_clock(text):
+    """(hour, minute, second) for a time text - cached, since dashboards ask about the same times a lot."""
+    cleaned = " ".join(text.strip().upper().split())
+    for time_format in TIME_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(cleaned, time_format)
+        except ValueError:
+            continue
+        return parsed.hour, parsed.minute, parsed.second
+    raise ValueError(f"Can't read {text!r} as a time - use HH:MM AM/PM (e.g. '10:00 AM') or 24-hour HH:MM")
+
+
+def _clock(moment):
+    """A datetime as 24-hour HH:MM:SS (None stays None)."""
+    return moment.strftime("%H:%M:%S") if moment is not None else None
+
+
+class StatusQuery:
+    """Answers status questions against one computed delivery day."""
+
+    def __init__(self, router):
+        """
+        Args:
+            router (DeliveryRouter): A router that has already run its simulation
+        """
+        if router.timeline is None:
+            raise ValueError("The router hasn't run its delivery simulation yet")
+        self.router = router
+
+    @classmethod
+    def compute(cls, router=None, quiet=True):
+        """
+        Plan and simulate the day, then get ready for queries.
+
+        Args:
+            router (DeliveryRouter): Router to run (defaults to the WGUPS day)
+            quiet (bool): Keep the planner's output off the screen
+
+        Returns:
+            StatusQuery: Ready to answer questions
+        """
+        router = router or DeliveryRouter()
+        if quiet:
+            with contextlib.redirect_stdout(io.StringIO()):
+                router.run_delivery_simulation()
+        else:
+            router.run_delivery_simulation()
+        return cls(router)
+
+    @classmethod
+    def from_plan(cls, file_path):
+        """
+        Get ready for queries from a saved plan file - nothing is planned or simulated.
+
+        Args:
+            file_path (str): A plan file written by plan_file.save_plan()
+
+        Returns:
+            StatusQuery: Ready to answer questions
+        """
+        from plan_file import load_plan
+        return cls(load_plan(file_path))
+
+    def _time(self, at):
+        """Accept a datetime or text for any query."""
+        if isinstance(at, datetime.datetime):
+            return at
+        return parse_query_time(at, self.router.start_time)
+
+    def _package_record(self, status_info, query_time):
+        trip = status_info['trip']
+        return {
+            'at': _clock(query_time),
+            'package_id': status_info['package_id'],
+            'truck': status_info['truck'],
+            'trip': trip + 1 if trip is not None else None,
+            'status': status_info['status'],
+            'time_info': status_info['time_info'],
+            'address': status_info['address'],
+            'deadline': status_info['deadline'],
+            'departure': _clock(status_info['departure_time']),
+            # Only once it's happened - a dashboard at 9:00 shouldn't see the future
+            'delivered': (_clock(status_info['delivery_time'])
+                          if status_info['delivery_time'] is not None
+                          and status_info['delivery_time'] <= query_time else None),
+        }
+
+    def package(self, package_id, at):
+        """
+        One package's status.
+
+        Args:
+            package_id (int): Which package
+            at: datetime or time text
+
+        Returns:
+            dict: See PACKAGE_FIELDS (None if there's no such package)
+        """
+        query_time = self._time(at)
+        status_info = self.router.get_package_status_at_time(package_id, query_time)
+        return self._package_record(status_info, query_time) if status_info is not None else None
+
+    def truck(self, truck_id, at):
+        """
+        One truck's status and the status of every package assigned to it.
+
+        Args:
+            truck_id (int): Which truck
+            at: datetime or time text
+
+        Returns:
+            dict: See TRUCK_FIELDS, plus "packages" (a list of package records)
+                - None if there's no such truck
+        """
+        query_time = self._time(at)
+        if truck_id not in {truck.truck_id for truck in self.router.trucks}:
+            return None
+
+        truck_status = self.router.get_truck_status_at_time(truck_id, query_time) or {
+            'truck': truck_id, 'status': "At Hub", 'trip': None, 'on_board': 0, 'delivered': 0, 'miles': 0.0}
+        record = self._truck_record(truck_status, query_time)
+        record['packages'] = [self.package(package_id, query_time)
+                              for package_id in sorted(self.router.package_table.find_packages(truck_id=truck_id))]
+        return record
+
+    def _truck_record(self, truck_status, query_time):
+        trip = truck_status['trip']
+        return {
+            'at': _clock(query_time),
+            'truck': truck_status['truck'],
+            'status': truck_status['status'],
+            'trip': trip + 1 if trip is not None else None,
+            'on_board': truck_status['on_board'],
+            'delivered': truck_status['delivered'],
+            'miles': round(truck_status['miles'], 1),
+        }
+
+    def fleet(self, at):
+        """
+        Every truck and every package at one time.
+
+        Args:
+            at: datetime or time text
+
+        Returns:
+            dict: "at", "trucks" (truck records), "packages" (package
+                records in ID order) and "counts" (packages per status)
+        """
+        query_time = self._time(at)
+        packages = [self._package_record(status_info, query_time)
+                    for status_info in self.router.package_statuses_at(query_time)]
+
+        trucks = []
+        for truck in self.router.trucks:
+            truck_status = self.router.get_truck_status_at_time(truck.truck_id, query_time)
+            if truck_status is not None:
+                trucks.append(self._truck_record(truck_status, query_time))
+
+        counts = {}
+        for record in packages:
+            counts[record['status']] = counts.get(record['status'], 0) + 1
+
+        return {'at': _clock(query_time), 'trucks': trucks, 'packages': packages, 'counts': counts}
+
+    def mileage(self):
+        """Miles per truck and in total for the whole day."""
+        trucks = {truck.truck_id: round(truck.mileage, 1) for truck in self.router.trucks}
+        return {'trucks': trucks, 'total': round(sum(truck.mileage for truck in self.router.trucks), 1)}
+
+    def answer(self, line):
+        """
+        Answer one text query: "10:00", "10:00 truck 2" or "10:00 package 9".
+
+        Returns:
+            dict: The answer, or {"error": ...} if the query doesn't make sense
+        """
+        words = line.split()
+        if words and words[-1].lower() in ("truck", "package"):
+            return {'error': f"Which {words[-1].lower()}? {QUERY_USAGE}"}
+        try:
+            if len(words) >= 2 and words[-2].lower() in ("truck", "package"):
+                kind, number = words[-2].lower(), words[-1]
+                if not (number.isascii() and number.isdigit()):
+                    return {'error': f"{number!r} isn't a {kind} number. {QUERY_USAGE}"}
+                number = int(number)
+                at = " ".join(words[:-2])
+                result = self.truck(number, at) if kind == "truck" else self.package(number, at)
+                return result if result is not None else {'error': f"No {kind} {number}"}
+            return self.fleet(" ".join(words))
+        except ValueError as error:
+            return {'error': str(error)}
+
+
+def _write(records, fields, output_format, out):
+    """Write records as json (one document), csv or a plain table."""
+    if output_format == "json":
+        json.dump(records, out, indent=2)
+        out.write("\n")
+    elif output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore', lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        rows = [["" if record.get(field) is None else str(record[field]) for field in fields] for record in records]
+        widths = [max([len(field)] + [len(row[column]) for row in rows]) for column, field in enumerate(fields)]
+        out.write(" ".join(field.upper().ljust(width) for field, width in zip(fields, widths)).rstrip() + "\n")
+        for row in rows:
+            out.write(" ".join(text.ljust(width) for text, width in zip(row, widths)).rstrip() + "\n")
+
+
+def run_queries(query, times, trucks=None, packages=None, output_format="table", out=None):
+    """
+    Answer the CLI's queries: every time in times, for the given trucks/packages (or the fleet).
+
+    Args:
+        query (StatusQuery): The computed day
+        times (list): Time texts
+        trucks (list): Truck IDs (optional)
+        packages (list): Package IDs (optional)
+        output_format (str): "table", "json" or "csv"
+        out: Where to write (defaults to stdout)
+    """
+    out = out or sys.stdout
+
+    if packages:
+        records = [record for at in times for record in (query.package(package_id, at) for package_id in packages)
+                   if record is not None]
+        _write(records, PACKAGE_FIELDS, output_format, out)
+    elif trucks:
+        answers = [answer for at in times for answer in (query.truck(truck_id, at) for truck_id in trucks)
+                   if answer is not None]
+        if output_format == "json":
+            _write(answers, None, output_format, out)
+            return
+        if output_format == "table":
+            # The trucks first, then their packages (csv just gets the package rows)
+            _write(answers, TRUCK_FIELDS, output_format, out)
+            out.write("\n")
+        _write([record for answer in answers for record in answer['packages']], PACKAGE_FIELDS, output_format, out)
+    else:
+        snapshots = [query.fleet(at) for at in times]
+        if output_format == "json":
+            _write(snapshots, None, output_format, out)
+        else:
+            _write([record for snapshot in snapshots for record in snapshot['packages']],
+                   PACKAGE_FIELDS, output_format, out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WGUPS package and truck status at any time of day")
+    parser.add_argument("--at", nargs="+", default=[], help="Time(s) to check, like 10:00 or '10:00 AM'")
+    parser.add_argument("--truck", type=int, nargs="+", help="Truck ID(s) to show")
+    parser.add_argument("--package", type=int, nargs="+", help="Package ID(s) to show")
+    parser.add_argument("--format", choices=("table", "json", "csv"), default="table", help="Output format")
+    parser.add_argument("--stdin", action="store_true",
+                        help="Read one query per line ('10:00', '10:00 truck 2', '10:00 package 9') "
+                             "and answer each as one JSON line")
+    parser.add_argument("--city", help="City folder with a city.json (see batch.py) instead of the WGUPS day")
+    parser.add_argument("--plan", help="Answer from a saved plan file instead of planning the day")
+    parser.add_argument("--save-plan", help="Write the computed day to this plan file (.jsonl or .wgp)")
+    args = parser.parse_args(argv)
+
+    if not args.at and not args.stdin and not args.save_plan:
+        parser.error("give at least one --at time, or --stdin")
+    if args.plan and args.city:
+        parser.error("--plan already says which day it is - leave out --city")
+
+    try:
+        # Every time is checked before the day gets computed
+        for at in args.at:
+            parse_query_time(at)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.plan:
+        from plan_file import PlanFileError
+        try:
+            query = StatusQuery.from_plan(args.plan)
+        except (OSError, PlanFileError) as error:
+            parser.error(str(error))
+    else:
+        router = None
+        if args.city:
+            from batch import build_router, load_city_config
+            router = build_router(load_city_config(args.city))
+        query = StatusQuery.compute(router)
+
+    if args.save_plan:
+        from plan_file import save_plan
+        save_plan(query.router, args.save_plan)
+        print(f"✓ Plan saved to {args.save_plan}", file=sys.stderr)
+
+    if args.stdin:
+        for line in sys.stdin:
+            if line.strip():
+                print(json.dumps(query.answer(line)), flush=True)
+        return
+
+    run_queries(query, args.at, args.truck, args.package, args.format)
+
+
+if __name__ == "__main__":
+    main()
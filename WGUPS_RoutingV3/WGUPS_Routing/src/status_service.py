@@ -0,0 +1,276 @@
+# status_service.py - Local HTTP status service for supervisor dashboards
+"""
+WGUPS Status Service
+
+A small asyncio HTTP server around StatusQuery (see status_query.py). The
+day is planned and simulated once at startup; after that every request is
+answered from the timeline in memory, so hundreds of dashboards polling
+at once never cause another run_delivery_simulation().
+
+Endpoints (all GET, all JSON):
+
+    /fleet?at=10:00            every truck and package at that time
+    /trucks/2?at=10:00         one truck and its packages
+    /packages/9?at=10:25%20AM  one package
+    /mileage                   miles per truck and in total
+    /health                    {"status": "ok"}
+
+"at" defaults to the current time of day. Query times are rounded down
+to a time bucket (60 seconds unless --bucket says otherwise), and the
+answer for each (endpoint, bucket) is built once and cached. Every answer
+carries an ETag, so a dashboard that sends If-None-Match gets a 304 with
+no body while nothing has changed.
+
+With --plan the day comes from a saved plan file (see plan_file.py)
+instead of being planned at startup, so the service is up in milliseconds.
+
+Only the standard library is used: asyncio streams and a deliberately
+small HTTP/1.1 reader (GET/HEAD, keep-alive, no request bodies). A
+request that comes with a body gets its answer and then the connection is
+closed, since the body is never read. A request or header line longer
+than the stream limit (64 KiB) gets a 414 or 431 and the connection is
+closed. It's meant for the local network, not the open internet.
+
+Usage (from the src directory):
+    python status_service.py --port 8950
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from status_query import StatusQuery, parse_query_time
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 414: "URI Too Long", 431: "Request Header Fields Too Large"}
+
+MAX_HEADER_LINES = 100
+
+
+class StatusService:
+    """Turns request paths into cached JSON answers. The HTTP part is in serve()."""
+
+    def __init__(self, query, bucket_seconds=60, cache_size=4096, clock=None):
+        """
+        Args:
+            query (StatusQuery): The computed day
+            bucket_seconds (int): Query times in the same bucket share one answer
+            cache_size (int): How many answers to keep (least recently used go first)
+            clock (callable): Returns "now" for requests without ?at= (defaults
+                to the wall clock's time of day)
+        """
+        self.query = query
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.cache_size = cache_size
+        self.clock = clock or datetime.datetime.now
+        self.cache = OrderedDict()  # (route, truck/package ID, bucket time) -> (etag, body)
+        self.hits = 0
+        self.misses = 0
+
+        # Part of every ETag, so answers from an earlier run of the service never match
+        self.plan_tag = hashlib.sha1(json.dumps(query.mileage(), sort_keys=True).encode()).hexdigest()[:12]
+
+    def _bucket_time(self, params):
+        """The query time from ?at=, rounded down to its bucket."""
+        day = self.query.router.start_time
+        if "at" in params:
+            query_time = parse_query_time(params["at"][0], day)
+        else:
+            now = self.clock()
+            query_time = day.replace(hour=now.hour, minute=now.minute, second=now.second, microsecond=0)
+
+        seconds = query_time.hour * 3600 + query_time.minute * 60 + query_time.second
+        seconds -= seconds % self.bucket_seconds
+        return day.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(seconds=seconds)
+
+    def _route(self, path):
+        """("fleet"|"truck"|"package"|"mileage"|"health", number or None), or None for an unknown path."""
+        parts = [part for part in path.split("/") if part]
+        if parts in (["fleet"], ["mileage"], ["health"]):
+            return parts[0], None
+        if len(parts) == 2 and parts[0] in ("trucks", "packages") \
+                and parts[1].isascii() and parts[1].isdigit():
+            return parts[0][:-1], int(parts[1])
+        return None
+
+    def _build(self, route, number, query_time):
+        """The answer for one route at one (bucketed) time, or None if the truck/package doesn't exist."""
+        if route == "fleet":
+            return self.query.fleet(query_time)
+        if route == "truck":
+            return self.query.truck(number, query_time)
+        if route == "package":
+            return self.query.package(number, query_time)
+        return self.query.mileage()
+
+    def handle(self, target, if_none_match=None):
+        """
+        Answer one GET.
+
+        Args:
+            target (str): Request path with query string, like "/trucks/2?at=10:00"
+            if_none_match (str): The request's If-None-Match header, if any
+
+        Returns:
+            tuple: (status code, ETag or None, body bytes)
+        """
+        url = urlsplit(target)
+        found = self._route(url.path)
+        if found is None:
+            return 404, None, _json({"error": f"No such endpoint: {url.path}"})
+        route, number = found
+        if route == "health":
+            return 200, None, _json({"status": "ok"})
+
+        try:
+            query_time = self._bucket_time(parse_qs(url.query)) if route != "mileage" else None
+        except ValueError as error:
+            return 400, None, _json({"error": str(error)})
+
+        key = (route, number, query_time)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+        else:
+            self.misses += 1
+            answer = self._build(route, number, query_time)
+            if answer is None:
+                return 404, None, _json({"error": f"No {route} {number}"})
+            body = _json(answer)
+            cached = (f'"{self.plan_tag}-{hashlib.sha1(body).hexdigest()[:16]}"', body)
+            self.cache[key] = cached
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        etag, body = cached
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return 304, etag, b""
+        return 200, etag, body
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it (or asks to)."""
+        try:
+            while True:
+                # readline() raises ValueError for a line past the stream limit (64 KiB)
+                try:
+                    request_line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await _respond(writer, 414, None, _json({"error": "Request line too long"}), close=True)
+                    break
+                if not request_line:
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                headers = {}
+                try:
+                    for _ in range(MAX_HEADER_LINES):
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    else:
+                        await _respond(writer, 431, None, _json({"error": "Too many headers"}), close=True)
+                        break
+                except (ValueError, asyncio.LimitOverrunError):
+                    await _respond(writer, 431, None, _json({"error": "Header line too long"}), close=True)
+                    break
+
+                version = parts[2] if len(parts) == 3 else "HTTP/1.0"
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                # Request bodies are never read, so after one the connection can't be
+                # used again - the next "request" would really be the body
+                if headers.get("transfer-encoding") or headers.get("content-length", "0") not in ("", "0"):
+                    close = True
+
+                if len(parts) != 3:
+                    await _respond(writer, 400, None, _json({"error": "Bad request line"}), close=True)
+                    break
+                if parts[0] not in ("GET", "HEAD"):
+                    await _respond(writer, 405, None, _json({"error": "Only GET and HEAD"}), close)
+                else:
+                    status, etag, body = self.handle(parts[1], headers.get("if-none-match"))
+                    await _respond(writer, status, etag, body, close, head_only=parts[0] == "HEAD")
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host="127.0.0.1", port=8950):
+        """Start listening (port 0 picks a free port). Returns the asyncio server."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve(self, host="127.0.0.1", port=8950):
+        """Run until cancelled."""
+        server = await self.start(host, port)
+        addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+        print(f"✓ WGUPS status service listening on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+
+def _json(data):
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+async def _respond(writer, status, etag, body, close=False, head_only=False):
+    """Write one HTTP/1.1 response."""
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+             "Content-Type: application/json",
+             "Cache-Control: no-cache"]
+    if status != 304:
+        lines.append(f"Content-Length: {len(body)}")
+    if etag is not None:
+        lines.append(f"ETag: {etag}")
+    if close:
+        lines.append("Connection: close")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    if not head_only and status != 304:
+        writer.write(body)
+    await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve WGUPS package and truck status over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8950, help="Port to listen on")
+    parser.add_argument("--bucket", type=int, default=60, help="Seconds of query time that share one answer")
+    parser.add_argument("--city", help="City folder with a city.json (see batch.py) instead of the WGUPS day")
+    parser.add_argument("--plan", help="Serve a saved plan file instead of planning the day")
+    args = parser.parse_args()
+
+    if args.plan:
+        from plan_file import PlanFileError
+        try:
+            query = StatusQuery.from_plan(args.plan)
+        except (OSError, PlanFileError) as error:
+            parser.error(str(error))
+    else:
+        router = None
+        if args.city:
+            from batch import build_router, load_city_config
+            router = build_router(load_city_config(args.city))
+        print("Planning the delivery day...")
+        query = StatusQuery.compute(router)
+
+    service = StatusService(query, bucket_seconds=args.bucket)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nStatus service stopped")
+
+
+if __name__ == "__main__":
+    main()
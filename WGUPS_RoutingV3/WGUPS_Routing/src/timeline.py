@@ -0,0 +1,308 @@
+# timeline.py - What happened to every package and truck, in time order
+"""
+WGUPS Delivery Timeline
+
+The supervisor views ask "what was going on at 10:00 AM?" over and over.
+Working that out from the package table means re-deriving every status
+from the delivery times, departures, late flights and corrections each
+time. Instead the simulation writes down everything as it happens:
+
+    package: loaded, departed, delivered, arrived at the hub, address/deadline changed
+    truck:   loaded, departed, delivered a package, returned to the hub
+
+Once the day is over, finish() turns each package's and truck's events
+into a sorted list of times plus the status *after* each event. A status
+at time T is then one bisect into that list, and a whole-fleet snapshot
+is one bisect per package, with no scanning of trucks or other packages.
+
+Times are stored the way the simulation keeps them, in whole seconds
+after midnight. The queries take and give back datetimes.
+"""
+
+from bisect import bisect_right
+
+from clock import at_seconds, seconds_of_day
+
+
+class _PackageHistory:
+    """Events for one package, and the status after each one once finished."""
+
+    __slots__ = ('package_id', 'truck_id', 'trip', 'address', 'deadline', 'available_time',
+                 'address_pending', 'events', 'times', 'statuses', 'departure_time', 'delivery_time')
+
+    def __init__(self, package_id, truck_id, trip, address, deadline, available_time, address_pending):
+        self.package_id = package_id
+        self.truck_id = truck_id
+        self.trip = trip
+        self.address = address  # As first listed
+        self.deadline = deadline
+        self.available_time = available_time  # When it reaches the hub, None = there from the start
+        self.address_pending = address_pending  # Listed address is known to be wrong
+        self.events = []  # (time, kind, details)
+        self.times = []
+        self.statuses = []  # statuses[i] = status once the first i events have happened
+        self.departure_time = None
+        self.delivery_time = None
+
+
+class _TruckHistory:
+    """Events for one truck, and the truck's status after each one once finished."""
+
+    __slots__ = ('truck_id', 'events', 'times', 'statuses')
+
+    def __init__(self, truck_id):
+        self.truck_id = truck_id
+        self.events = []  # (time, kind, trip, package_id, miles so far, package count)
+        self.times = []
+        self.statuses = []
+
+
+class DeliveryTimeline:
+    """
+    Per-package and per-truck event history for one simulated day.
+
+    The simulation calls the record_* methods while it runs and finish()
+    when it's done. After that, the status queries are all O(log events).
+    """
+
+    LOADED = "loaded"
+    DEPARTED = "departed"
+    DELIVERED = "delivered"
+    ARRIVED = "arrived"  # A late package reached the hub
+    CHANGED = "changed"  # Address and/or deadline changed (an address correction is one too)
+    RETURNED = "returned"
+
+    def __init__(self, day):
+        """
+        Args:
+            day (datetime): Any moment on the delivery day (for turning seconds back into datetimes)
+        """
+        self.day = day
+        self.packages = {}  # package_id -> _PackageHistory
+        self.trucks = {}  # truck_id -> _TruckHistory
+        self.finished = False
+
+    # ------------------------------------------------------------------
+    # Recording (called by the simulation)
+    # ------------------------------------------------------------------
+
+    def add_package(self, package_id, truck_id, trip, address, deadline, available_time=None,
+                    address_pending=False):
+        """
+        Start a package's history with how things stand at the start of the day.
+
+        Args:
+            package_id (int): The package
+            truck_id (int): Truck it's planned on
+            trip (int): Which of that truck's trips (0 = first)
+            address (str): Delivery address as listed
+            deadline (str): Deadline as listed
+            available_time (int): Seconds after midnight it reaches the hub, if it's late
+            address_pending (bool): True if the listed address is wrong until corrected
+        """
+        history = _PackageHistory(package_id, truck_id, trip, address, deadline, available_time,
+                                  address_pending)
+        self.packages[package_id] = history
+        if available_time is not None:
+            history.events.append((available_time, self.ARRIVED, None))
+        self.trucks.setdefault(truck_id, _TruckHistory(truck_id))
+
+    def record_loaded(self, time, truck_id, trip, package_ids):
+        """A truck was loaded with a trip's packages."""
+        self.trucks.setdefault(truck_id, _TruckHistory(truck_id)).events.append(
+            (time, self.LOADED, trip, None, None, len(package_ids)))
+        for package_id in package_ids:
+            history = self.packages.get(package_id)
+            if history is not None:
+                history.events.append((time, self.LOADED, truck_id))
+
+    def record_departed(self, time, truck_id, trip, package_ids, miles):
+        """A truck left the hub with these packages."""
+        self.trucks.setdefault(truck_id, _TruckHistory(truck_id)).events.append(
+            (time, self.DEPARTED, trip, None, miles, len(package_ids)))
+        for package_id in package_ids:
+            history = self.packages.get(package_id)
+            if history is not None:
+                history.events.append((time, self.DEPARTED, truck_id))
+
+    def record_delivered(self, time, truck_id, package_id, miles):
+        """A package was delivered."""
+        self.trucks.setdefault(truck_id, _TruckHistory(truck_id)).events.append(
+            (time, self.DELIVERED, None, package_id, miles, None))
+        history = self.packages.get(package_id)
+        if history is not None:
+            history.events.append((time, self.DELIVERED, truck_id))
+
+    def record_changed(self, time, package_id, address=None, deadline=None):
+        """A package's address and/or deadline changed."""
+        history = self.packages.get(package_id)
+        if history is not None:
+            history.events.append((time, self.CHANGED, (address, deadline)))
+
+    def record_returned(self, time, truck_id, trip, miles):
+        """A truck got back to the hub."""
+        self.trucks.setdefault(truck_id, _TruckHistory(truck_id)).events.append(
+            (time, self.RETURNED, trip, None, miles, 0))
+
+    def finish(self):
+        """
+        Sort everything and work out the status after every event.
+
+        Events are kept in the order they happened within the same minute
+        (the sort is stable), so a package loaded and sent out at 8:00 AM
+        is En Route at 8:00 AM.
+        """
+        for history in self.packages.values():
+            history.events.sort(key=lambda event: event[0])
+            history.times = [event[0] for event in history.events]
+            for time, kind, _ in history.events:
+                if kind == self.DEPARTED:
+                    history.departure_time = at_seconds(self.day, time)
+                elif kind == self.DELIVERED:
+                    history.delivery_time = at_seconds(self.day, time)
+            self._package_statuses(history)
+
+        for history in self.trucks.values():
+            history.events.sort(key=lambda event: event[0])
+            history.times = [event[0] for event in history.events]
+            self._truck_statuses(history)
+
+        self.finished = True
+
+    def _package_statuses(self, history):
+        """Fill in history.statuses, one more than there are events."""
+        arrived = history.available_time is None
+        address_pending = history.address_pending
+        departed = False
+        delivered_at = None
+        address = history.address
+        deadline = history.deadline
+
+        def status():
+            # Same order of checks the supervisor view has always used
+            if address_pending:
+                return "At Hub", "Address TBD"
+            if delivered_at is not None:
+                return "Delivered", at_seconds(self.day, delivered_at).strftime('%I:%M %p')
+            if departed:
+                return "En Route", "In Transit"
+            if not arrived:
+                arrives = at_seconds(self.day, history.available_time)
+                return "Delayed", f"Arrives {arrives.strftime('%I:%M %p').lstrip('0')}"
+            if history.departure_time is not None:
+                return "At Hub", f"Departs {history.departure_time.strftime('%I:%M %p')}"
+            return "At Hub", "Waiting"
+
+        history.statuses = [status() + (address, deadline)]
+        for event_time, kind, details in history.events:
+            if kind == self.ARRIVED:
+                arrived = True
+            elif kind == self.DEPARTED:
+                departed = True
+            elif kind == self.DELIVERED:
+                delivered_at = event_time
+            elif kind == self.CHANGED:
+                new_address, new_deadline = details
+                if new_address is not None:
+                    address = new_address
+                    address_pending = False
+                if new_deadline is not None:
+                    deadline = new_deadline
+            history.statuses.append(status() + (address, deadline))
+
+    def _truck_statuses(self, history):
+        """Fill in history.statuses for a truck."""
+        status = "At Hub"
+        trip = None
+        on_board = 0
+        delivered = 0
+        miles = 0.0
+
+        history.statuses = [(status, trip, on_board, delivered, miles)]
+        for _, kind, event_trip, _, event_miles, package_count in history.events:
+            if kind == self.LOADED:
+                trip = event_trip
+                on_board = package_count
+            elif kind == self.DEPARTED:
+                status = "En Route"
+                trip = event_trip
+                on_board = package_count
+            elif kind == self.DELIVERED:
+                on_board -= 1
+                delivered += 1
+            elif kind == self.RETURNED:
+                status = "At Hub"
+                on_board = 0
+            if event_miles is not None:
+                miles = event_miles
+            history.statuses.append((status, trip, on_board, delivered, miles))
+
+    # ------------------------------------------------------------------
+    # Queries (after finish())
+    # ------------------------------------------------------------------
+
+    def package_status(self, package_id, query_time):
+        """
+        A package's status at a moment of the day.
+
+        Args:
+            package_id (int): Which package
+            query_time (datetime): When
+
+        Returns:
+            dict: package_id, address, deadline, status, time_info, truck,
+                trip, departure_time and delivery_time - or None if the
+                package was never on a truck
+        """
+        history = self.packages.get(package_id)
+        if history is None:
+            return None
+
+        index = bisect_right(history.times, seconds_of_day(query_time))
+        status, time_info, address, deadline = history.statuses[index]
+        return {
+            'package_id': package_id,
+            'address': address,
+            'deadline': deadline,
+            'status': status,
+            'time_info': time_info,
+            'truck': history.truck_id,
+            'trip': history.trip,
+            'departure_time': history.departure_time,
+            'delivery_time': history.delivery_time,
+        }
+
+    def truck_status(self, truck_id, query_time):
+        """
+        A truck's status at a moment of the day.
+
+        Args:
+            truck_id (int): Which truck
+            query_time (datetime): When
+
+        Returns:
+            dict: truck, status ("At Hub"/"En Route"), trip, packages on
+                board, packages delivered so far and miles driven so far -
+                or None if the truck never had anything to do
+        """
+        history = self.trucks.get(truck_id)
+        if history is None:
+            return None
+
+        index = bisect_right(history.times, seconds_of_day(query_time))
+        status, trip, on_board, delivered, miles = history.statuses[index]
+        return {
+            'truck': truck_id,
+            'status': status,
+            'trip': trip,
+            'on_board': on_board,
+            'delivered': delivered,
+            'miles': miles,
+        }
+
+    def package_events(self, package_id):
+        """Everything that happened to a package: [(datetime, kind), ...] in order."""
+        history = self.packages.get(package_id)
+        if history is None:
+            return []
+        return [(at_seconds(self.day, time), kind) for time, kind, _ in history.events]
@@ -0,0 +1,31 @@
+# conftest.py - Shared setup for the tests
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+# The modules in src import each other by name, the same way main.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+def _run_day(router=None):
+    """Plan and simulate a day with the planner's printing kept quiet."""
+    from main import DeliveryRouter
+    router = router or DeliveryRouter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        router.run_delivery_simulation()
+    return router
+
+
+@pytest.fixture
+def run_day():
+    """For tests that need their own day (with package changes, another fleet, ...)."""
+    return _run_day
+
+
+@pytest.fixture(scope="session")
+def wgups_day():
+    """The WGUPS day, planned and simulated once for every test that only reads it."""
+    return _run_day()
@@ -0,0 +1,170 @@
+# test_assignment.py - Tests for the truck assigner
+import heapq
+import math
+import random
+
+import pytest
+
+from assignment import GRID_MIN_LOCATIONS, TruckAssigner, dispatch_trips
+from constraints import AddressCorrection, ConstraintSet
+
+START = 8 * 60
+EOD = 24 * 60
+
+
+def city(location_count, seed=4):
+    """A distance function over random points (location 0 is the hub)."""
+    rng = random.Random(seed)
+    points = [(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(location_count)]
+
+    def distance(location1, location2):
+        return math.dist(points[location1], points[location2])
+    return distance
+
+
+def assigner(location_count=30):
+    return TruckAssigner(city(location_count), 0, 18, START)
+
+
+def load_of(loads, package_id):
+    [load] = [load for load in loads if package_id in load.package_ids]
+    return load
+
+
+def test_every_package_goes_on_a_truck_with_room():
+    packages = [(package_id, package_id % 29 + 1, EOD) for package_id in range(1, 31)]
+
+    loads, unassigned = assigner().assign([(1, 16), (2, 16)], packages, ConstraintSet())
+
+    assert unassigned == []
+    assert sorted(package_id for load in loads for package_id in load.package_ids) == list(range(1, 31))
+    assert all(len(load.package_ids) <= 16 for load in loads)
+
+
+def test_packages_that_dont_fit_come_back_unassigned():
+    packages = [(package_id, package_id % 29 + 1, EOD) for package_id in range(1, 11)]
+
+    loads, unassigned = assigner().assign([(1, 4)], packages, ConstraintSet())
+
+    assert len(loads[0].package_ids) == 4
+    assert len(unassigned) == 6
+
+
+def test_weight_limit():
+    packages = [(package_id, package_id, EOD, 30.0) for package_id in range(1, 5)]
+
+    loads, unassigned = assigner().assign([(1, 16, None, 70.0), (2, 16, None, 70.0)], packages, ConstraintSet())
+
+    assert unassigned == []
+    assert all(load.weight <= 70.0 for load in loads)
+
+
+def test_co_delivery_group_rides_together():
+    constraints = ConstraintSet()
+    constraints.add_package(1, "Must be delivered with 5, 9")
+    constraints.add_package(9, "Must be delivered with 13")
+    packages = [(package_id, package_id, EOD) for package_id in range(1, 21)]
+
+    loads, _ = assigner().assign([(1, 8), (2, 8), (3, 8)], packages, constraints)
+
+    assert {load_of(loads, package_id).truck_id for package_id in (1, 5, 9, 13)} == {load_of(loads, 1).truck_id}
+
+
+def test_required_truck():
+    constraints = ConstraintSet()
+    for package_id in (2, 4, 6):
+        constraints.add_package(package_id, "Can only be on truck 3")
+    packages = [(package_id, package_id, EOD) for package_id in range(1, 11)]
+
+    loads, _ = assigner().assign([(1, 16), (2, 16), (3, 16)], packages, constraints)
+
+    assert all(load_of(loads, package_id).truck_id == 3 for package_id in (2, 4, 6))
+
+
+def test_group_split_across_required_trucks_is_an_error():
+    constraints = ConstraintSet()
+    constraints.add_package(1, "Can only be on truck 1, Must be delivered with 2")
+    constraints.add_package(2, "Can only be on truck 2")
+
+    with pytest.raises(ValueError):
+        assigner().assign([(1, 16), (2, 16)], [(1, 1, EOD), (2, 2, EOD)], constraints)
+
+
+def test_required_truck_off_shift_waits_for_its_wave():
+    constraints = ConstraintSet()
+    constraints.add_package(2, "Can only be on truck 2")
+    packages = [(1, 1, EOD), (2, 2, EOD)]
+
+    # Truck 2 is in the fleet but not going out this wave
+    loads, unassigned = assigner().assign([(1, 16)], packages, constraints, fleet_truck_ids=[1, 2])
+    assert loads[0].package_ids == [1]
+    assert unassigned == [2]
+
+    # Truck 7 isn't in the fleet at all
+    constraints.add_package(1, "Can only be on truck 7")
+    with pytest.raises(ValueError):
+        assigner().assign([(1, 16)], packages, constraints, fleet_truck_ids=[1, 2])
+
+
+def test_delayed_package_holds_its_truck_until_the_flight():
+    constraints = ConstraintSet()
+    constraints.add_package(3, "Delayed on flight---will not arrive to depot until 9:05 am")
+    packages = [(package_id, package_id, EOD) for package_id in range(1, 6)]
+
+    loads, _ = assigner().assign([(1, 16), (2, 16)], packages, constraints)
+
+    assert load_of(loads, 3).departure >= 9 * 60 + 5
+
+
+def test_wrong_address_package_waits_for_its_correction():
+    constraints = ConstraintSet()
+    constraints.add_package(9, "Wrong address listed")
+    constraints.add_correction(AddressCorrection(9, 10 * 60 + 20, "410 S State St", "Salt Lake City", "UT", "84111"))
+    packages = [(package_id, package_id, 10 * 60 + 30 if package_id == 1 else EOD) for package_id in range(1, 11)]
+
+    loads, _ = assigner().assign([(1, 16), (2, 16)], packages, constraints)
+
+    assert load_of(loads, 9).departure >= 10 * 60 + 20
+    # ...without holding back the package due at 10:30
+    assert load_of(loads, 1).departure < 10 * 60 + 20
+
+
+def test_wgups_package_9_leaves_after_the_correction(wgups_day):
+    departure = wgups_day.package_departure(9)
+    package = wgups_day.package_table.lookup(9)
+
+    assert (departure.hour, departure.minute) >= (10, 20)
+    assert package['delivery_address'] == "410 S State St"
+    assert package['delivery_time'] > departure
+
+
+@pytest.mark.parametrize("location_count", [GRID_MIN_LOCATIONS // 2, GRID_MIN_LOCATIONS * 3])
+def test_grid_neighbors_match_checking_every_pair(location_count):
+    truck_assigner = assigner(location_count)
+    distance = truck_assigner.distance
+    locations = list(range(1, location_count))
+
+    neighbors = truck_assigner._neighbor_locations(locations)
+
+    for location in locations:
+        others = (other for other in locations if other != location)
+        expected = heapq.nsmallest(truck_assigner.neighbor_count, others, key=lambda other: distance(location, other))
+        assert neighbors[location] == expected
+
+
+def test_dispatch_gives_drivers_to_the_tightest_loads_first():
+    packages = [(1, 1, 9 * 60), (2, 2, EOD), (3, 3, EOD)]
+    constraints = ConstraintSet()
+    constraints.add_package(1, "Can only be on truck 2")
+    constraints.add_package(2, "Can only be on truck 1")
+    constraints.add_package(3, "Can only be on truck 3")
+    loads, _ = assigner().assign([(1, 16), (2, 16), (3, 16)], packages, constraints)
+
+    driver_free = [START, START]
+    heapq.heapify(driver_free)
+    trips = dispatch_trips(loads, driver_free, {}, lambda truck_id, package_ids, departure: (departure + 60, 0))
+
+    departures = {trip.truck_id: trip.departure for trip in trips}
+    assert departures[2] == START
+    # Two drivers, three loads - the last one waits for a driver to get back
+    assert sorted(departures.values()) == [START, START, START + 60]
@@ -0,0 +1,98 @@
+# test_constraints.py - Tests for reading the special notes
+from constraints import ConstraintSet, UnionFind, load_address_corrections, parse_special_notes
+
+
+def test_truck_restriction():
+    assert parse_special_notes(3, "Can only be on truck 2").required_truck == 2
+
+
+def test_delayed_flight():
+    constraints = parse_special_notes(6, "Delayed on flight---will not arrive to depot until 9:05 am")
+
+    assert constraints.available_minutes == 9 * 60 + 5
+    assert constraints.unrecognized == ""
+
+
+def test_delivered_with_lists():
+    assert parse_special_notes(14, "Must be delivered with 15, 19").delivered_with == [15, 19]
+    assert parse_special_notes(16, "Must be delivered with 13 and 19").delivered_with == [13, 19]
+
+
+def test_wrong_address():
+    constraints = parse_special_notes(9, "Wrong address listed")
+
+    assert constraints.wrong_address
+    assert constraints.unrecognized == ""
+
+
+def test_unknown_note_is_kept():
+    constraints = parse_special_notes(1, "Fragile - handle with care")
+
+    assert constraints.required_truck is None
+    assert constraints.unrecognized == "Fragile - handle with care"
+
+
+def test_packages_without_notes_are_not_stored():
+    constraints = ConstraintSet()
+    constraints.add_package(1, "")
+
+    assert constraints.packages == {}
+    assert constraints.required_truck(1) is None
+    assert constraints.available_minutes(1) is None
+    assert constraints.group_root(1) == 1
+
+
+def test_union_find_merges_chains():
+    sets = UnionFind()
+    sets.union(1, 2)
+    sets.union(3, 4)
+    sets.union(2, 3)
+    sets.add(5)
+
+    assert sets.find(1) == sets.find(4)
+    assert sets.find(5) == 5
+    assert sets.groups() == [[1, 2, 3, 4]]
+
+
+def test_co_delivery_notes_chain_into_one_group():
+    # The WGUPS notes only ever name some of the group - the rest comes through the chain
+    constraints = ConstraintSet()
+    constraints.add_package(14, "Must be delivered with 15, 19")
+    constraints.add_package(16, "Must be delivered with 13, 19")
+    constraints.add_package(20, "Must be delivered with 13, 15")
+    constraints.add_package(30, "Must be delivered with 31")
+
+    assert constraints.co_delivery_groups() == [[13, 14, 15, 16, 19, 20], [30, 31]]
+    assert len({constraints.group_root(package_id) for package_id in (13, 14, 15, 16, 19, 20)}) == 1
+    assert constraints.group_root(30) != constraints.group_root(13)
+
+
+def test_set_available_minutes():
+    constraints = ConstraintSet()
+    constraints.set_available_minutes(7, None)
+    assert 7 not in constraints.packages
+
+    constraints.set_available_minutes(7, 10 * 60)
+    assert constraints.available_minutes(7) == 10 * 60
+    assert constraints.delayed_packages() == [7]
+
+
+def test_address_corrections_file(tmp_path):
+    corrections_file = tmp_path / "corrections.csv"
+    corrections_file.write_text("Package ID,Time,Address,City,State,Zip\n"
+                                "9,10:20 AM,410 S State St,Salt Lake City,UT,84111\n")
+
+    [correction] = load_address_corrections(str(corrections_file))
+    assert (correction.package_id, correction.minutes, correction.address, correction.zip) \
+        == (9, 10 * 60 + 20, "410 S State St", "84111")
+    assert load_address_corrections(str(tmp_path / "missing.csv")) == []
+
+
+def test_wgups_notes(wgups_day):
+    constraints = wgups_day.constraints
+
+    assert constraints.co_delivery_groups() == [[13, 14, 15, 16, 19, 20]]
+    assert constraints.delayed_packages() == [6, 25, 28, 32]
+    assert [package_id for package_id in range(1, 41) if constraints.required_truck(package_id) == 2] \
+        == [3, 18, 36, 38]
+    assert constraints.correction_for(9).minutes == 10 * 60 + 20
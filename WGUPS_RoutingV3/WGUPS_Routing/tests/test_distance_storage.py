@@ -0,0 +1,104 @@
+# test_distance_storage.py - Tests for the full, triangular and compiled distance tables
+import pytest
+
+from distance_file import DistanceFile, compile_distance_table, packed_size, write_distance_file
+from main import DeliveryRouter, DistanceManager
+
+STORAGE_OPTIONS = [
+    (DistanceManager.LIST, DistanceManager.FULL),
+    (DistanceManager.LIST, DistanceManager.TRIANGULAR),
+    (DistanceManager.NUMPY, DistanceManager.FULL),
+    (DistanceManager.NUMPY, DistanceManager.TRIANGULAR),
+]
+
+
+def loaded(backend=DistanceManager.LIST, storage=DistanceManager.FULL, file_path=None):
+    if backend == DistanceManager.NUMPY:
+        pytest.importorskip("numpy")
+    manager = DistanceManager(backend=backend, storage=storage)
+    manager.load_distance_data(file_path or DistanceManager.DEFAULT_DISTANCE_FILE)
+    return manager
+
+
+def all_distances(manager):
+    size = len(manager.addresses)
+    return [[manager.get_distance_by_index(i, j) for j in range(size)] for i in range(size)]
+
+
+@pytest.fixture(scope="module")
+def full_distances():
+    return all_distances(loaded())
+
+
+@pytest.mark.parametrize("backend, storage", STORAGE_OPTIONS)
+def test_every_storage_gives_the_same_distances(backend, storage, full_distances):
+    assert all_distances(loaded(backend, storage)) == full_distances
+
+
+def test_distances_are_symmetric(full_distances):
+    size = len(full_distances)
+    assert size == 27
+    assert all(full_distances[i][j] == full_distances[j][i] for i in range(size) for j in range(size))
+    assert all(full_distances[i][i] == 0 for i in range(size))
+
+
+def test_triangular_storage_keeps_half_the_cells():
+    manager = loaded(storage=DistanceManager.TRIANGULAR)
+
+    assert manager.distance_matrix is None
+    assert len(manager.packed_distances) == packed_size(27) == 27 * 28 // 2
+
+
+def test_compiled_table_gives_the_same_distances(tmp_path, full_distances):
+    compiled = str(tmp_path / "wgups.wgd")
+    compile_distance_table(DistanceManager.DEFAULT_DISTANCE_FILE, compiled)
+
+    manager = loaded(file_path=compiled)
+    try:
+        assert manager.addresses == loaded().addresses
+        assert all_distances(manager) == full_distances
+    finally:
+        manager.distance_file.close()
+
+
+def test_compiled_table_is_the_same_file_either_way(tmp_path):
+    # Compiling copies the triangle straight across; it has to match writing every distance one by one
+    compiled, written = tmp_path / "compiled.wgd", tmp_path / "written.wgd"
+    compile_distance_table(DistanceManager.DEFAULT_DISTANCE_FILE, str(compiled))
+    manager = loaded()
+    write_distance_file(str(written), manager.addresses, manager.get_distance_by_index)
+
+    assert compiled.read_bytes() == written.read_bytes()
+
+
+@pytest.mark.parametrize("damage, problem", [
+    (lambda data: data[:-8], "truncated"),
+    (lambda data: data[:len(data) // 2], "truncated"),
+    (lambda data: data + b"\0" * 8, "truncated"),
+    (lambda data: data[:20], "too short"),
+])
+def test_damaged_compiled_table_is_refused(tmp_path, damage, problem):
+    compiled = tmp_path / "wgups.wgd"
+    compile_distance_table(DistanceManager.DEFAULT_DISTANCE_FILE, str(compiled))
+    compiled.write_bytes(damage(compiled.read_bytes()))
+
+    with pytest.raises(ValueError, match=problem):
+        DistanceFile(str(compiled))
+    with pytest.raises(ValueError, match=problem):
+        loaded(file_path=str(compiled))
+
+
+def test_lookup_by_address_matches_lookup_by_index():
+    manager = loaded(storage=DistanceManager.TRIANGULAR)
+    hub = manager.resolve_address("4001 South 700 East")
+    capitol = manager.resolve_address("410 S State St")
+
+    assert manager.get_distance("4001 South 700 East", "410 S State St") \
+        == manager.get_distance_by_index(hub, capitol) \
+        == manager.get_distance_by_index(capitol, hub)
+
+
+def test_triangular_day_matches_the_full_day(wgups_day, run_day):
+    router = run_day(DeliveryRouter(distance_storage=DistanceManager.TRIANGULAR))
+
+    assert [truck.mileage for truck in router.trucks] == [truck.mileage for truck in wgups_day.trucks]
@@ -0,0 +1,50 @@
+# test_fleet.py - Tests for reading the fleet configuration
+import json
+
+import pytest
+
+from fleet import FleetConfig, load_fleet_config
+from main import DeliveryRouter
+
+
+def test_wgups_fleet_file():
+    fleet = load_fleet_config(DeliveryRouter.FLEET_FILE)
+
+    assert [(truck.truck_id, truck.capacity, truck.max_weight, truck.speed) for truck in fleet.trucks] \
+        == [(1, 16, None, 18.0), (2, 16, None, 18.0), (3, 16, None, 18.0)]
+    assert (fleet.drivers, fleet.shift_start, fleet.shift_end) == (2, 8 * 60, 17 * 60)
+
+
+def test_groups_are_numbered_in_order(tmp_path):
+    file_path = tmp_path / "fleet.json"
+    file_path.write_text(json.dumps({"drivers": 3, "trucks": [{"count": 2, "capacity": 10},
+                                                              {"capacity": 24, "max_weight": 800, "speed": 15}]}))
+
+    fleet = load_fleet_config(str(file_path))
+
+    assert [(truck.truck_id, truck.capacity, truck.max_weight, truck.speed) for truck in fleet.trucks] \
+        == [(1, 10, None, 18.0), (2, 10, None, 18.0), (3, 24, 800.0, 15.0)]
+    assert fleet.describe() == "Fleet: 2 x 10 packages at 18 mph, 1 x 24 packages, 800 max weight at 15 mph; 3 drivers"
+
+
+@pytest.mark.parametrize("group, problem", [
+    ({"capacity": 0}, "at least one package"),
+    ({"capacity": -4}, "at least one package"),
+    ({"speed": 0}, "speed above 0"),
+    ({"speed": -18}, "speed above 0"),
+    ({"speed": "nan"}, "speed above 0"),
+    ({"max_weight": 0}, "max weight above 0"),
+])
+def test_truck_that_cant_deliver_is_refused(group, problem):
+    with pytest.raises(ValueError, match=problem):
+        FleetConfig.from_dict({"trucks": [{"count": 2}, group]})
+
+
+@pytest.mark.parametrize("data, problem", [
+    ({"trucks": []}, "at least one truck"),
+    ({"trucks": [{}], "drivers": 0}, "at least one driver"),
+    ({"trucks": [{}], "shift_start": "5:00 PM", "shift_end": "8:00 AM"}, "end after it starts"),
+])
+def test_fleet_that_cant_work_is_refused(data, problem):
+    with pytest.raises(ValueError, match=problem):
+        FleetConfig.from_dict(data)
@@ -0,0 +1,204 @@
+# test_hash_table.py - Tests for the package hash table
+import random
+
+import pytest
+
+from hash_table import HashTable
+
+MODES = [HashTable.CHAINING, HashTable.ROBIN_HOOD]
+
+
+def add_package(table, package_id, address="410 S State St", deadline="EOD"):
+    table.insert(package_id, address, "Salt Lake City", "UT", "84111", deadline, 5)
+
+
+def home_slots(table):
+    """Package ID in each Robin Hood slot (None for an empty one)."""
+    return [None if row == HashTable.EMPTY_SLOT else table._ids[row] for row in table.slots]
+
+
+def check_probe_runs(table):
+    """Every stored package can be reached from its home slot without crossing an empty slot."""
+    for slot_index, row in enumerate(table.slots):
+        if row == HashTable.EMPTY_SLOT:
+            continue
+        home = table._hash_function(table._ids[row])
+        for distance in range(table._probe_distance(row, slot_index)):
+            assert table.slots[(home + distance) % table.capacity] != HashTable.EMPTY_SLOT
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_resize_keeps_every_package(mode):
+    table = HashTable(initial_capacity=4, mode=mode)
+    for package_id in range(1, 101):
+        add_package(table, package_id)
+
+    assert table.size == 100
+    assert table.resize_count > 0
+    assert table.size <= table.capacity * table.load_factor
+    assert all(table.lookup(package_id)["package_id"] == package_id for package_id in range(1, 101))
+    assert sorted(package.package_id for package in table.get_all_packages()) == list(range(1, 101))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_insert_existing_package_overwrites_it(mode):
+    table = HashTable(mode=mode)
+    add_package(table, 7, address="233 Canyon Rd")
+    add_package(table, 7, address="2530 S 500 E")
+
+    assert table.size == 1
+    assert table.lookup(7)["delivery_address"] == "2530 S 500 E"
+    assert table.find_packages(address="233 Canyon Rd") == set()
+    assert table.find_packages(address="2530 S 500 E") == {7}
+
+
+def test_robin_hood_insert_displaces_rows_closer_to_home():
+    table = HashTable(initial_capacity=8, load_factor=1.0, mode=HashTable.ROBIN_HOOD)
+    add_package(table, 2)  # Home slot 2
+    add_package(table, 1)  # Home slot 1
+    add_package(table, 9)  # Also home slot 1 - takes slot 2 and pushes package 2 on to slot 3
+
+    assert home_slots(table)[1:4] == [1, 9, 2]
+    assert [table.lookup(package_id)["package_id"] for package_id in (1, 2, 9)] == [1, 2, 9]
+    check_probe_runs(table)
+
+
+def test_robin_hood_lookup_stops_at_a_richer_row():
+    table = HashTable(initial_capacity=8, load_factor=1.0, mode=HashTable.ROBIN_HOOD)
+    for package_id in (1, 9, 2):
+        add_package(table, package_id)
+
+    # 17 would live in slot 1's run, so the search gives up at package 2 instead of wrapping around
+    assert table.lookup(17) is None
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_remove(mode):
+    table = HashTable(mode=mode)
+    for package_id in range(1, 11):
+        add_package(table, package_id, deadline="9:00 AM" if package_id <= 3 else "EOD")
+
+    assert table.remove(2)
+    assert not table.remove(2)
+    assert not table.remove(99)
+    assert table.size == 9
+    assert table.lookup(2) is None
+    assert table.lookup_view(2) is None
+    assert 2 not in [package.package_id for package in table.get_all_packages()]
+    assert table.packages_with_deadline_before("10:30 AM") == [1, 3]
+    assert table.find_packages(deadline="9:00 AM") == {1, 3}
+    assert 2 not in table.find_packages()
+    assert table.count_by_status() == {"At Hub": 9}
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_removed_row_is_a_tombstone(mode):
+    table = HashTable(mode=mode)
+    add_package(table, 5, address="233 Canyon Rd")
+    table.remove(5)
+
+    # The old row stays in the columns, marked as removed, and a new insert gets a fresh row
+    assert list(table._ids) == [HashTable.REMOVED_ID]
+    add_package(table, 5, address="2530 S 500 E")
+    assert list(table._ids) == [HashTable.REMOVED_ID, 5]
+    assert table.size == 1
+    assert table.lookup(5)["delivery_address"] == "2530 S 500 E"
+
+
+def test_robin_hood_remove_shifts_the_run_back():
+    table = HashTable(initial_capacity=8, load_factor=1.0, mode=HashTable.ROBIN_HOOD)
+    for package_id in (2, 1, 9, 4):
+        add_package(table, package_id)
+    assert home_slots(table)[1:5] == [1, 9, 2, 4]
+
+    table.remove(1)
+
+    # 9 and 2 move back toward home; 4 is already home and stays put
+    assert home_slots(table)[1:5] == [9, 2, None, 4]
+    assert [table.lookup(package_id)["package_id"] for package_id in (2, 4, 9)] == [2, 4, 9]
+    check_probe_runs(table)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_random_inserts_and_removes_match_a_dict(mode):
+    rng = random.Random(5)
+    table = HashTable(initial_capacity=8, mode=mode)
+    expected = {}
+
+    for step in range(3000):
+        package_id = rng.randint(1, 400)
+        if rng.random() < 0.4:
+            assert table.remove(package_id) == (package_id in expected)
+            expected.pop(package_id, None)
+        else:
+            address = f"{step} S State St"
+            add_package(table, package_id, address=address)
+            expected[package_id] = address
+
+    assert table.size == len(expected)
+    for package_id in range(1, 401):
+        found = table.lookup(package_id)
+        assert (found and found["delivery_address"]) == expected.get(package_id)
+    if mode == HashTable.ROBIN_HOOD:
+        check_probe_runs(table)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_update_package_status_moves_status_and_truck_indexes(mode):
+    table = HashTable(mode=mode)
+    for package_id in (1, 2, 3):
+        add_package(table, package_id)
+
+    table.update_package_status(1, "En Route", truck_id=2)
+    table.update_package_status(2, "En Route", truck_id=2)
+    assert table.find_packages(status="En Route") == {1, 2}
+    assert table.find_packages(truck_id=2) == {1, 2}
+    assert table.count_by_status() == {"At Hub": 1, "En Route": 2}
+
+    table.update_package_status(2, "At Hub", truck_id=HashTable.NO_TRUCK)
+    assert table.find_packages(truck_id=2) == {1}
+    assert table.find_packages(status="At Hub") == {2, 3}
+    assert table.lookup_view(2).truck_id is None
+
+    assert not table.update_package_status(99, "En Route")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_update_package_address_moves_address_index(mode):
+    table = HashTable(mode=mode)
+    table.insert(9, "300 State St", "Salt Lake City", "UT", "84103", "EOD", 2, location_index=12)
+    add_package(table, 10, address="300 State St")
+
+    assert table.update_package_address(9, "410 S State St", "Salt Lake City", "UT", "84111", location_index=19)
+    assert table.find_packages(address="300 State St") == {10}
+    assert table.find_packages(address="410 S State St") == {9}
+    view = table.lookup_view(9)
+    assert (view.delivery_address, view.delivery_zip, view.location_index) == ("410 S State St", "84111", 19)
+
+    assert not table.update_package_address(99, "410 S State St", "Salt Lake City", "UT", "84111")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_update_package_deadline_moves_deadline_index(mode):
+    table = HashTable(mode=mode)
+    add_package(table, 1, deadline="EOD")
+    add_package(table, 2, deadline="10:30 AM")
+
+    assert table.update_package_deadline(1, "9:00 AM")
+    assert table.find_packages(deadline="9:00 AM") == {1}
+    assert table.find_packages(deadline="EOD") == set()
+    assert table.packages_with_deadline_before("10:00 AM") == [1]
+    assert table.lookup(1)["delivery_deadline"] == "9:00 AM"
+
+    assert not table.update_package_deadline(99, "9:00 AM")
+
+
+def test_find_packages_needs_secondary_indexes():
+    table = HashTable(secondary_indexes=False)
+    add_package(table, 1)
+
+    with pytest.raises(ValueError):
+        table.find_packages(status="At Hub")
+    # The table itself still works without them
+    assert table.remove(1)
+    assert table.size == 0
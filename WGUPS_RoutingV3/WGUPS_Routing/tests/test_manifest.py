@@ -0,0 +1,168 @@
+# test_manifest.py - Tests for streaming, validated manifest loading
+import csv
+
+import pytest
+
+from constraints import ConstraintSet
+from hash_table import HashTable
+from main import DeliveryRouter, DistanceManager
+from manifest import ManifestError, ingest_manifest
+
+HEADER = "Package ID,Address,City,State,Zip,Delivery Deadline,Weight KILO,Special Notes\n"
+GOOD_ROWS = ("1,195 W Oakland Ave,Salt Lake City,UT,84115,10:30 AM,21,\n"
+             "2,2530 S 500 E,Salt Lake City,UT,84106,EOD,44,Can only be on truck 2\n"
+             "3,233 Canyon Rd,Salt Lake City,UT,84103-1234,9:00 AM,2.5,\n")
+
+# (bad row, column the problem is reported in)
+BAD_ROWS = [
+    ("x4,380 W 2880 S,Salt Lake City,UT,84115,EOD,4,\n", "Package ID"),
+    ("0,380 W 2880 S,Salt Lake City,UT,84115,EOD,4,\n", "Package ID"),
+    ("5,,Salt Lake City,UT,84111,EOD,5,\n", "Address"),
+    ("6,3060 Lester St,,UT,84119,EOD,88,\n", "City"),
+    ("7,1330 2100 S,Salt Lake City,,84106,EOD,8,\n", "State"),
+    ("8,300 State St,Salt Lake City,UT,841,EOD,9,\n", "Zip"),
+    ("9,300 State St,Salt Lake City,UT,84103,25:00 PM,2,\n", "Delivery Deadline"),
+    ("10,600 E 900 South,Salt Lake City,UT,84105,EOD,12kg,\n", "Weight"),
+    ("11,600 E 900 South,Salt Lake City,UT,84105,EOD,0,\n", "Weight"),
+    ("12,600 E 900 South,Salt Lake City,UT,84105,EOD,inf,\n", "Weight"),
+    ("13,600 E 900 South,Salt Lake City\n", None),
+    ("2,4300 S 1300 E,Millcreek,UT,84117,EOD,88,\n", "Package ID"),  # Already in the manifest
+    # One past what the package table's ID column can hold
+    ("9223372036854775808,380 W 2880 S,Salt Lake City,UT,84115,EOD,4,\n", "Package ID"),
+]
+
+
+def write_manifest(tmp_path, text, name="packages.csv", encoding="utf-8"):
+    file_path = tmp_path / name
+    file_path.write_text(text, encoding=encoding)
+    return str(file_path)
+
+
+def test_good_rows_are_loaded(tmp_path):
+    table = HashTable()
+    constraints = ConstraintSet()
+
+    report = ingest_manifest(write_manifest(tmp_path, HEADER + GOOD_ROWS), table, constraints=constraints)
+
+    assert (report.rows_read, report.rows_loaded, report.rows_rejected) == (3, 3, 0)
+    package = table.lookup_view(3)
+    assert (package.delivery_zip, package.deadline_minutes, package.package_weight) == ("84103-1234", 9 * 60, 2.5)
+    assert package.location_index == HashTable.UNKNOWN_LOCATION
+    assert constraints.required_truck(2) == 2
+
+
+@pytest.mark.parametrize("bad_row, column", BAD_ROWS)
+def test_bad_row_is_left_out_and_reported(tmp_path, bad_row, column):
+    table = HashTable()
+
+    report = ingest_manifest(write_manifest(tmp_path, HEADER + GOOD_ROWS + bad_row), table)
+
+    assert (report.rows_loaded, report.rows_rejected) == (3, 1)
+    assert table.size == 3
+    [problem] = report.problems
+    assert (problem.line, problem.column) == (5, column)
+    assert "line 5" in problem.describe()
+
+
+def test_every_problem_in_a_row_is_reported(tmp_path):
+    text = HEADER + GOOD_ROWS + "x,,Salt Lake City,UT,8411,soon,-1,\n"
+    report = ingest_manifest(write_manifest(tmp_path, text), HashTable())
+
+    assert report.rows_rejected == 1
+    assert [problem.column for problem in report.problems] \
+        == ["Package ID", "Address", "Zip", "Delivery Deadline", "Weight"]
+
+
+def test_strict_mode_stops_at_the_first_problem(tmp_path):
+    file_path = write_manifest(tmp_path, HEADER + GOOD_ROWS + BAD_ROWS[5][0] + BAD_ROWS[6][0])
+
+    with pytest.raises(ManifestError) as raised:
+        ingest_manifest(file_path, HashTable(), strict=True)
+    assert raised.value.problem.line == 5
+    assert raised.value.problem.column == "Zip"
+
+
+def test_max_errors_keeps_the_first_problems_but_counts_them_all(tmp_path):
+    text = HEADER + "".join(f"{package_id},195 W Oakland Ave,Salt Lake City,UT,84115,EOD,heavy,\n"
+                            for package_id in range(1, 21))
+
+    report = ingest_manifest(write_manifest(tmp_path, text), HashTable(), max_errors=5)
+
+    assert report.rows_rejected == report.problem_count == 20
+    assert [problem.line for problem in report.problems] == [2, 3, 4, 5, 6]
+
+
+def test_chunks_dont_change_what_is_loaded(tmp_path):
+    text = HEADER + "".join(f"{package_id},195 W Oakland Ave,Salt Lake City,UT,84115,EOD,{package_id},\n"
+                            for package_id in range(1, 26)) + BAD_ROWS[7][0]
+    file_path = write_manifest(tmp_path, text)
+
+    whole, chunked = HashTable(), HashTable()
+    whole_report = ingest_manifest(file_path, whole)
+    chunked_report = ingest_manifest(file_path, chunked, chunk_size=4)
+
+    assert chunked_report.chunks == 7
+    assert (chunked_report.rows_loaded, chunked_report.rows_rejected) == (whole_report.rows_loaded, 1)
+    assert [chunked.lookup(package_id) for package_id in range(1, 26)] \
+        == [whole.lookup(package_id) for package_id in range(1, 26)]
+
+
+def test_title_lines_blank_rows_and_byte_order_mark(tmp_path):
+    text = "WGUPS Package File\n\n" + HEADER + "\n" + GOOD_ROWS + ",,,,,,,\n"
+
+    report = ingest_manifest(write_manifest(tmp_path, text, encoding="utf-8-sig"), HashTable())
+
+    assert (report.rows_read, report.rows_loaded, report.rows_rejected) == (3, 3, 0)
+
+
+@pytest.mark.parametrize("header", [HEADER, "WGUPS Package File\n" + HEADER, ""], ids=["header", "title", "no_header"])
+def test_broken_first_package_row_is_reported(tmp_path, header):
+    # Only the header and title lines are skipped, so a bad first row isn't mistaken for one
+    text = header + " 1x,195 W Oakland Ave,Salt Lake City,UT,84115,10:30 AM,21,\n" + GOOD_ROWS.split("\n", 1)[1]
+
+    report = ingest_manifest(write_manifest(tmp_path, text), HashTable())
+
+    assert (report.rows_read, report.rows_loaded, report.rows_rejected) == (3, 2, 1)
+    [problem] = report.problems
+    assert (problem.line, problem.column, problem.value) == (header.count("\n") + 1, "Package ID", "1x")
+
+
+def test_each_address_is_resolved_once(tmp_path):
+    calls = []
+
+    def resolve_address(address):
+        calls.append(address)
+        return 7 if address != "233 Canyon Rd" else HashTable.UNKNOWN_LOCATION
+
+    text = HEADER + GOOD_ROWS + "4,195 W Oakland Ave,Salt Lake City,UT,84115,EOD,4,\n"
+    table = HashTable()
+    report = ingest_manifest(write_manifest(tmp_path, text), table, resolve_address)
+
+    assert sorted(calls) == ["195 W Oakland Ave", "233 Canyon Rd", "2530 S 500 E"]
+    assert table.lookup_view(4).location_index == 7
+    assert report.unresolved_rows == 1
+
+
+def test_problems_file(tmp_path):
+    report = ingest_manifest(write_manifest(tmp_path, HEADER + GOOD_ROWS + BAD_ROWS[7][0]), HashTable())
+    problems_path = tmp_path / "problems.csv"
+
+    report.write_problems(str(problems_path))
+
+    with open(problems_path, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert rows == [["Line", "Column", "Value", "Problem"], ["5", "Weight", "12kg", "not a weight above 0"]]
+
+
+def test_wgups_manifest_loads_cleanly():
+    router = DeliveryRouter()
+    router.distance_manager.load_distance_data(DistanceManager.DEFAULT_DISTANCE_FILE)
+
+    report = router.load_package_data()
+
+    assert (report.rows_loaded, report.rows_rejected, report.unresolved_rows) == (40, 0, 0)
+    # Package 9 keeps its listed address until the correction comes in during the day
+    package = router.package_table.lookup_view(9)
+    assert package.delivery_address == "300 State St"
+    assert package.location_index == router.distance_manager.resolve_address("300 State St")
+    assert router.constraints.correction_for(9).address == "410 S State St"
@@ -0,0 +1,72 @@
+# test_parallel_routing.py - Tests for planning routes on worker processes
+import contextlib
+import io
+
+import pytest
+
+from distance_file import compile_distance_table
+from main import DeliveryRouter, DistanceManager
+from parallel_routing import SharedDistances
+
+
+@pytest.fixture(scope="module")
+def compiled_table(tmp_path_factory):
+    file_path = str(tmp_path_factory.mktemp("distances") / "wgups.wgd")
+    with contextlib.redirect_stdout(io.StringIO()):
+        compile_distance_table(DistanceManager.DEFAULT_DISTANCE_FILE, file_path)
+    return file_path
+
+
+def assigned_router(distance_file=DistanceManager.DEFAULT_DISTANCE_FILE):
+    """A WGUPS router with its trips assigned but no routes planned yet."""
+    router = DeliveryRouter(distance_file=distance_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        router.distance_manager.load_distance_data(distance_file)
+        router.load_package_data()
+        router.assign_packages_to_trucks()
+    return router
+
+
+def serial_routes(router):
+    hub_index = router.distance_manager.resolve_address(router.hub_address)
+    return {(truck.truck_id, trip): router.calculate_route_for_truck(truck, package_ids=package_ids,
+                                                                     departure_time=departure, start_index=hub_index)
+            for truck in router.trucks
+            for trip, (package_ids, departure) in enumerate(zip(truck.trips, truck.trip_departures))}
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["shared_memory", "wgd_file"])
+def test_parallel_routes_match_serial_routes(compiled, compiled_table, capfd):
+    router = assigned_router(compiled_table if compiled else DistanceManager.DEFAULT_DISTANCE_FILE)
+    expected = serial_routes(router)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        router.plan_routes(workers=2)
+
+    assert {key: route for key, (_, route) in router.planned_routes.items()} == expected
+    # Package 9's corrected address was found in the workers too
+    assert "not found" not in capfd.readouterr().out
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["shared_memory", "wgd_file"])
+def test_parallel_day_matches_serial_day(wgups_day, run_day, compiled, compiled_table):
+    distance_file = compiled_table if compiled else DistanceManager.DEFAULT_DISTANCE_FILE
+    router = run_day(DeliveryRouter(route_workers=2, distance_file=distance_file))
+
+    assert [truck.mileage for truck in router.trucks] == [truck.mileage for truck in wgups_day.trucks]
+    assert [truck.trips for truck in router.trucks] == [truck.trips for truck in wgups_day.trucks]
+
+
+def test_shared_distances_hold_the_packed_triangle():
+    manager = DistanceManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_distance_data()
+    shared = SharedDistances(manager)
+    try:
+        view = shared.block.buf.cast('d')
+        size = len(manager.addresses)
+        assert [view[i * (i + 1) // 2 + j] for i in range(size) for j in range(i + 1)] \
+            == [manager.get_distance_by_index(i, j) for i in range(size) for j in range(i + 1)]
+        view.release()
+    finally:
+        shared.close()
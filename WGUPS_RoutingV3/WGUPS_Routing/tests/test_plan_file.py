@@ -0,0 +1,144 @@
+# test_plan_file.py - Tests for saving a computed day and loading it back
+import datetime
+import json
+import pickle
+
+import pytest
+
+from main import DeliveryRouter
+from plan_file import BINARY_MAGIC, PLAN_VERSION, PlanFileError, load_plan, read_plan_records, save_plan
+from status_query import StatusQuery, main
+
+FORMATS = ["plan.jsonl", "plan.wgp"]
+
+
+def query_times(router):
+    """Every 10 minutes from 7:50 AM to 1:00 PM."""
+    first = router.start_time.replace(hour=7, minute=50)
+    return [first + datetime.timedelta(minutes=minutes) for minutes in range(0, 5 * 60 + 20, 10)]
+
+
+@pytest.fixture(scope="module", params=FORMATS)
+def saved_day(request, wgups_day, tmp_path_factory):
+    file_path = str(tmp_path_factory.mktemp("plans") / request.param)
+    save_plan(wgups_day, file_path)
+    return file_path
+
+
+def write_records(file_path, records):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+
+def test_round_trip_keeps_every_package(wgups_day, saved_day):
+    loaded = load_plan(saved_day)
+
+    assert loaded.package_table.size == wgups_day.package_table.size
+    for package_id in range(1, 41):
+        assert loaded.package_table.lookup(package_id) == wgups_day.package_table.lookup(package_id)
+        assert loaded.package_table.lookup_view(package_id).special_notes \
+            == wgups_day.package_table.lookup_view(package_id).special_notes
+
+
+def test_round_trip_keeps_the_trucks(wgups_day, saved_day):
+    loaded = load_plan(saved_day)
+
+    assert loaded.driver_count == wgups_day.driver_count
+    assert loaded.total_distance == pytest.approx(sum(truck.mileage for truck in wgups_day.trucks))
+    for original, copy in zip(wgups_day.trucks, loaded.trucks):
+        assert (copy.truck_id, copy.capacity, copy.speed) == (original.truck_id, original.capacity, original.speed)
+        assert copy.trips == original.trips
+        assert copy.trip_departures == original.trip_departures
+        assert copy.mileage == pytest.approx(original.mileage)
+    for package_id in range(1, 41):
+        assert loaded.package_departure(package_id) == wgups_day.package_departure(package_id)
+
+
+def test_round_trip_answers_status_queries_the_same(wgups_day, saved_day):
+    original = StatusQuery(wgups_day)
+    loaded = StatusQuery.from_plan(saved_day)
+
+    for query_time in query_times(wgups_day):
+        assert loaded.fleet(query_time) == original.fleet(query_time)
+    assert loaded.mileage() == original.mileage()
+
+
+def test_saving_needs_a_simulated_day(tmp_path):
+    with pytest.raises(ValueError):
+        save_plan(DeliveryRouter(), str(tmp_path / "plan.jsonl"))
+
+
+def test_not_a_plan_file(tmp_path):
+    file_path = tmp_path / "packages.csv"
+    file_path.write_text("Package ID,Address\n1,195 W Oakland Ave\n")
+
+    with pytest.raises(PlanFileError):
+        load_plan(str(file_path))
+
+
+def test_other_version_is_refused(tmp_path, saved_day):
+    records = read_plan_records(saved_day)
+    records[0]['version'] = PLAN_VERSION + 1
+    file_path = str(tmp_path / "plan.jsonl")
+    write_records(file_path, records)
+
+    with pytest.raises(PlanFileError, match="version"):
+        load_plan(file_path)
+
+    binary_path = tmp_path / "plan.wgp"
+    binary_path.write_bytes(BINARY_MAGIC + (PLAN_VERSION + 1).to_bytes(2, 'little') + pickle.dumps(records))
+    with pytest.raises(PlanFileError, match="version"):
+        load_plan(str(binary_path))
+
+
+def test_truncated_binary_file(tmp_path, wgups_day):
+    file_path = tmp_path / "plan.wgp"
+    save_plan(wgups_day, str(file_path))
+    file_path.write_bytes(file_path.read_bytes()[:200])
+
+    with pytest.raises(PlanFileError):
+        load_plan(str(file_path))
+
+
+def test_binary_file_cant_load_objects(tmp_path, saved_day):
+    records = read_plan_records(saved_day)
+    records[1]['events'] = [datetime.datetime(2024, 1, 1)]
+    file_path = tmp_path / "plan.wgp"
+    file_path.write_bytes(BINARY_MAGIC + PLAN_VERSION.to_bytes(2, 'little') + pickle.dumps(records))
+
+    with pytest.raises(PlanFileError, match="plain data"):
+        load_plan(str(file_path))
+
+
+@pytest.mark.parametrize("damage", [
+    lambda records: records[-1].pop('delivery_address'),
+    lambda records: records[1].update(trips="not a list of trips"),
+    lambda records: records[-1]['history'].update(events=[[30000, "delivered"]]),
+    lambda records: records[0].update(day=None),
+])
+def test_damaged_record(tmp_path, saved_day, damage):
+    records = read_plan_records(saved_day)
+    damage(records)
+    file_path = str(tmp_path / "plan.jsonl")
+    write_records(file_path, records)
+
+    with pytest.raises(PlanFileError, match="damaged record"):
+        load_plan(file_path)
+
+
+def test_query_cli_answers_from_a_plan_file(wgups_day, saved_day, capsys):
+    main(["--plan", saved_day, "--at", "10:25", "--package", "9", "--format", "json"])
+
+    assert json.loads(capsys.readouterr().out) == [StatusQuery(wgups_day).package(9, "10:25")]
+
+
+@pytest.mark.parametrize("argv", [
+    ["--plan", "no_such_plan.wgp", "--at", "10:00"],
+    ["--plan", "plan.wgp", "--city", "salt_lake_city", "--at", "10:00"],
+])
+def test_query_cli_plan_errors_exit_2(argv, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main(argv)
+    assert exit.value.code == 2
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,130 @@
+# test_replanning.py - Tests for package changes partway through the day
+import contextlib
+import io
+
+import pytest
+
+from main import DeliveryRouter
+
+NEW_ADDRESS = "3575 W Valley Central Station bus Loop"
+
+
+def run_logged(router):
+    """Run the day and hand back everything it printed."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        router.run_delivery_simulation()
+    return out.getvalue()
+
+
+def minutes_of(moment):
+    return moment.hour * 60 + moment.minute + moment.second / 60
+
+
+def replans(log):
+    """(truck ID, stops) for every "Re-planned Truck N's last K stops" line."""
+    found = []
+    for line in log.splitlines():
+        words = line.split()
+        if words[:2] == ["Re-planned", "Truck"]:
+            found.append((int(words[2].split("'")[0]), int(words[4])))
+    return found
+
+
+@pytest.fixture(scope="module")
+def normal_replans():
+    """The normal day already re-plans once: truck 3's route when package 9's address comes in."""
+    return replans(run_logged(DeliveryRouter()))
+
+
+def test_address_change_mid_route_is_delivered_to_the_new_address(wgups_day, normal_replans):
+    # Package 19 goes out at 8:00 and isn't delivered until after 9:00 on the normal day
+    assert minutes_of(wgups_day.package_table.lookup(19)['delivery_time']) > 9 * 60
+
+    router = DeliveryRouter()
+    router.change_package(19, "9:00 AM", address=NEW_ADDRESS, zip_code="84119")
+    log = run_logged(router)
+
+    package = router.package_table.lookup(19)
+    assert package['delivery_status'] == "Delivered"
+    assert package['delivery_address'] == NEW_ADDRESS
+    assert package['delivery_zip'] == "84119"
+    assert minutes_of(package['delivery_time']) > 9 * 60
+    # Only truck 1 (the one carrying it) had to re-plan
+    extra = [replan for replan in replans(log) if replan not in normal_replans]
+    assert extra and all(truck_id == 1 for truck_id, _ in extra)
+    assert [truck.mileage for truck in router.trucks[1:]] == [truck.mileage for truck in wgups_day.trucks[1:]]
+
+
+def test_deadline_change_is_met():
+    router = DeliveryRouter()
+    router.change_package(40, "8:30 AM", deadline="9:30 AM")
+    run_logged(router)
+
+    package = router.package_table.lookup(40)
+    assert package['delivery_deadline'] == "9:30 AM"
+    assert package['delivery_time'] <= router.start_time.replace(hour=9, minute=30)
+
+
+def test_change_to_a_delivered_package_is_ignored(wgups_day, normal_replans):
+    # Package 15 is delivered a little after 8:00
+    router = DeliveryRouter()
+    router.change_package(15, "11:00 AM", address=NEW_ADDRESS, deadline="EOD")
+    log = run_logged(router)
+
+    assert "Package 15 was already delivered" in log
+    assert replans(log) == normal_replans
+    package = router.package_table.lookup(15)
+    expected = wgups_day.package_table.lookup(15)
+    assert (package['delivery_address'], package['delivery_deadline'], package['delivery_time']) \
+        == (expected['delivery_address'], expected['delivery_deadline'], expected['delivery_time'])
+    assert [truck.mileage for truck in router.trucks] == [truck.mileage for truck in wgups_day.trucks]
+
+
+def test_change_to_a_package_not_loaded_yet():
+    # With two trucks, package 21 waits at the hub for truck 1's second trip
+    normal_day = DeliveryRouter(truck_count=2)
+    normal_log = run_logged(normal_day)
+    truck, trip = normal_day.package_trips[21]
+    assert (truck.truck_id, trip) == (1, 1)
+
+    router = DeliveryRouter(truck_count=2)
+    router.change_package(21, "8:30 AM", address=NEW_ADDRESS, zip_code="84119")
+    log = run_logged(router)
+
+    # Truck 1's first trip is out at 8:30, but 21 isn't on it - nothing gets re-planned,
+    # the second trip is just planned with the new address when it leaves
+    assert replans(log) == replans(normal_log)
+    assert router.trucks[0].trips[0] == normal_day.trucks[0].trips[0]
+    package = router.package_table.lookup(21)
+    assert (package['delivery_status'], package['delivery_address']) == ("Delivered", NEW_ADDRESS)
+    assert package['delivery_time'] > router.package_departure(21) >= router.start_time.replace(hour=8, minute=30)
+
+
+def test_change_while_the_truck_waits_at_the_hub(wgups_day, normal_replans):
+    # Truck 3 is loaded at 8:00 but sits at the hub until 10:20
+    truck, _ = wgups_day.package_trips[24]
+    assert truck.truck_id == 3
+
+    router = DeliveryRouter()
+    router.change_package(24, "9:30 AM", address=NEW_ADDRESS, zip_code="84119", deadline="12:00 PM")
+    log = run_logged(router)
+
+    assert replans(log) == normal_replans
+    package = router.package_table.lookup(24)
+    assert (package['delivery_address'], package['delivery_deadline']) == (NEW_ADDRESS, "12:00 PM")
+    assert router.package_departure(24) == wgups_day.package_departure(24)
+    assert package['delivery_time'] <= router.start_time.replace(hour=12)
+    # The trucks already out don't notice
+    assert [truck.mileage for truck in router.trucks[:2]] == [truck.mileage for truck in wgups_day.trucks[:2]]
+
+
+def test_later_flight_holds_the_truck_at_the_hub(normal_replans):
+    # Package 6 is on the 9:05 flight and rides truck 2; at 8:30 the flight is running late
+    router = DeliveryRouter()
+    router.change_package(6, "8:30 AM", available_at="9:40 AM")
+    log = run_logged(router)
+
+    assert replans(log) == normal_replans
+    assert router.package_departure(6) >= router.start_time.replace(hour=9, minute=40)
+    assert router.package_table.lookup(6)['delivery_status'] == "Delivered"
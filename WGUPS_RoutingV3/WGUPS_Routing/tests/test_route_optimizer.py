@@ -0,0 +1,117 @@
+# test_route_optimizer.py - Tests for the route improvement stages
+import itertools
+import math
+import random
+
+import pytest
+
+from route_optimizer import OrOptImprover, TwoOptImprover, deadline_insertion_tour, improve_route, tour_length
+
+# A hub and 7 stops, with distances rounded to a tenth of a mile like the WGUPS table.
+# Trying every order shows the shortest route is 0, 4, 2, 6, 1, 7, 3, 5 (or backwards): 23.1 miles
+STOPS = [(0.0, 0.0), (6.0, 4.0), (2.5, 1.8), (5.0, -3.0), (0.8, 2.5), (2.0, -3.4), (4.6, 3.6), (6.7, 0.5)]
+MATRIX = [[round(math.dist(point1, point2), 1) for point2 in STOPS] for point1 in STOPS]
+
+
+START = 8 * 60
+EOD = 24 * 60
+
+
+def improvers():
+    return [TwoOptImprover(), OrOptImprover()]
+
+
+def distance(node1, node2):
+    return MATRIX[node1][node2]
+
+
+def brute_force_length(node_count, distance):
+    """The shortest route through every stop, found by trying them all."""
+    return min(tour_length([0] + list(order), distance) for order in itertools.permutations(range(1, node_count)))
+
+
+def travel_minutes(node1, node2):
+    return distance(node1, node2) * 60 / 18
+
+
+def late_stops(tour, deadlines):
+    """Stops reached after their deadline, leaving the hub at 8:00."""
+    now, late = START, []
+    for before, node in zip(tour, tour[1:]):
+        now += travel_minutes(before, node)
+        if now > deadlines[node]:
+            late.append(node)
+    return late
+
+
+def random_distance(node_count, seed):
+    rng = random.Random(seed)
+    points = [(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(node_count)]
+    return lambda node1, node2: math.dist(points[node1], points[node2])
+
+
+def test_matches_the_brute_force_shortest_route():
+    best = brute_force_length(len(MATRIX), distance)
+    assert best == pytest.approx(23.1)
+
+    for start in ([0, 1, 2, 3, 4, 5, 6, 7], [0, 7, 2, 5, 4, 1, 6, 3], [0, 3, 6, 1, 4, 7, 2, 5]):
+        tour = improve_route(start, distance, improvers())
+        assert tour_length(tour, distance) == pytest.approx(best)
+        assert tour[0] == 0 and sorted(tour) == list(range(len(MATRIX)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_never_longer_than_the_route_it_was_given(seed):
+    distance = random_distance(12, seed)
+    start = [0] + random.Random(seed).sample(range(1, 12), 11)
+
+    tour = improve_route(start, distance, improvers())
+
+    assert tour_length(tour, distance) <= tour_length(start, distance) + 1e-9
+    assert tour[0] == 0 and sorted(tour) == list(range(12))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_on_random_stops_it_gets_close_to_the_brute_force_route(seed):
+    distance = random_distance(8, seed)
+    start = [0] + random.Random(seed).sample(range(1, 8), 7)
+
+    tour = improve_route(start, distance, improvers())
+
+    # Local search doesn't promise the best route, but on 7 stops it shouldn't be far off
+    assert tour_length(tour, distance) <= brute_force_length(8, distance) * 1.1
+
+
+def test_doesnt_make_a_package_late_to_save_miles():
+    # Stop 5 has to come first, even though the loop order would put it near the end
+    def count_late(tour):
+        return 0 if tour[1] == 5 else 1
+    start = [0, 5, 1, 2, 3, 4, 6, 7]
+
+    tour = improve_route(start, distance, improvers(), count_late)
+
+    assert tour[1] == 5
+    assert tour_length(tour, distance) <= tour_length(start, distance)
+
+
+def test_deadline_insertion_meets_deadlines_that_can_be_met():
+    deadlines = [EOD] * len(MATRIX)
+    deadlines[3], deadlines[1] = START + 20, START + 45
+    on_time = [[0] + list(order) for order in itertools.permutations(range(1, len(MATRIX)))
+               if not late_stops([0] + list(order), deadlines)]
+
+    tour = deadline_insertion_tour(len(MATRIX), distance, travel_minutes, deadlines, START)
+
+    assert tour[0] == 0 and sorted(tour) == list(range(len(MATRIX)))
+    assert late_stops(tour, deadlines) == []
+    assert tour_length(tour, distance) <= min(tour_length(order, distance) for order in on_time) * 1.1
+
+
+def test_deadline_that_cant_be_met_only_makes_that_stop_late():
+    # Stop 1 is 24 minutes out, so it can't make 8:10 whatever the order
+    deadlines = [EOD] * len(MATRIX)
+    deadlines[3], deadlines[1] = START + 20, START + 10
+
+    tour = deadline_insertion_tour(len(MATRIX), distance, travel_minutes, deadlines, START)
+
+    assert late_stops(tour, deadlines) == [1]
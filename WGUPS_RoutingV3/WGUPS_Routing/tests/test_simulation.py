@@ -0,0 +1,103 @@
+# test_simulation.py - Tests for the discrete-event delivery simulation
+from hash_table import deadline_to_minutes
+from main import DeliveryRouter
+from simulation import EventQueue, SimulationEvent
+from timeline import DeliveryTimeline
+
+DELAYED_PACKAGES = (6, 25, 28, 32)
+TRUCK_2_PACKAGES = (3, 18, 36, 38)
+
+
+def minutes_of(moment):
+    return moment.hour * 60 + moment.minute + moment.second / 60
+
+
+def trips(router):
+    """(departure, return) in seconds after midnight for every trip any truck drove."""
+    intervals = []
+    for history in router.timeline.trucks.values():
+        departed = None
+        for time, kind, *_ in history.events:
+            if kind == DeliveryTimeline.DEPARTED:
+                departed = time
+            elif kind == DeliveryTimeline.RETURNED and departed is not None:
+                intervals.append((departed, time))
+                departed = None
+    return intervals
+
+
+def test_event_queue_orders_by_time_then_by_schedule_order():
+    queue = EventQueue()
+    for time, package_id in ((600, 1), (300, 2), (600, 3), (300, 4)):
+        queue.push(SimulationEvent(time, SimulationEvent.DELIVERY, package_id=package_id))
+
+    assert [queue.pop().package_id for _ in range(len(queue))] == [2, 4, 1, 3]
+
+
+def test_every_package_is_delivered_on_time(wgups_day):
+    packages = list(wgups_day.package_table.iter_packages())
+
+    assert len(packages) == 40
+    for package in packages:
+        assert package.delivery_status == "Delivered"
+        assert minutes_of(package.delivery_time) <= package.deadline_minutes, package.package_id
+
+
+def test_day_stays_under_140_miles(wgups_day):
+    total = sum(truck.mileage for truck in wgups_day.trucks)
+
+    assert 0 < total < 140
+    # The timeline's end-of-day miles agree with the trucks' own odometers
+    end_of_day = wgups_day.start_time.replace(hour=23, minute=59)
+    for truck in wgups_day.trucks:
+        assert wgups_day.timeline.truck_status(truck.truck_id, end_of_day)['miles'] == truck.mileage
+
+
+def test_the_same_day_comes_out_the_same(wgups_day, run_day):
+    again = run_day()
+
+    assert [truck.mileage for truck in again.trucks] == [truck.mileage for truck in wgups_day.trucks]
+    assert ([again.package_table.lookup(package_id)['delivery_time'] for package_id in range(1, 41)]
+            == [wgups_day.package_table.lookup(package_id)['delivery_time'] for package_id in range(1, 41)])
+
+
+def test_delayed_packages_leave_after_their_flight(wgups_day):
+    flight = deadline_to_minutes("9:05 AM")
+    for package_id in DELAYED_PACKAGES:
+        assert minutes_of(wgups_day.package_departure(package_id)) >= flight, package_id
+
+
+def test_truck_only_packages_ride_their_truck(wgups_day):
+    for package_id in TRUCK_2_PACKAGES:
+        truck, _ = wgups_day.package_trips[package_id]
+        assert truck.truck_id == 2, package_id
+
+
+def test_no_more_trucks_out_than_drivers(wgups_day):
+    intervals = trips(wgups_day)
+    assert intervals
+
+    # Count trucks on the road right after every departure
+    for departed, _ in intervals:
+        out = sum(1 for start, end in intervals if start <= departed < end)
+        assert out <= wgups_day.driver_count
+
+
+def test_trucks_never_carry_more_than_capacity(wgups_day):
+    for truck in wgups_day.trucks:
+        assert all(len(trip) <= truck.capacity for trip in truck.trips)
+    assert sorted(package_id for truck in wgups_day.trucks for trip in truck.trips for package_id in trip) \
+        == list(range(1, 41))
+
+
+def test_delivery_lines_name_their_truck(wgups_day, capsys):
+    # Deliveries from different trucks come out interleaved, so each line has to say whose it is
+    DeliveryRouter().run_delivery_simulation()
+    lines = [line for line in capsys.readouterr().out.splitlines() if " delivered to " in line]
+
+    assert len(lines) == 40
+    for line in lines:
+        truck_part, package_part = line.strip().split(": Package ")
+        package_id = int(package_part.split()[0])
+        truck, _ = wgups_day.package_trips[package_id]
+        assert truck_part == f"Truck {truck.truck_id}"
@@ -0,0 +1,160 @@
+# test_status_query.py - Tests for the headless status queries and their CLI
+import csv
+import io
+import json
+
+import pytest
+
+import status_query
+from status_query import StatusQuery, main, parse_query_time
+
+
+@pytest.fixture
+def query(wgups_day):
+    return StatusQuery(wgups_day)
+
+
+@pytest.fixture
+def cli(wgups_day, monkeypatch, capsys):
+    """Run main() with argv against the already computed WGUPS day; returns (exit code, stdout, stderr)."""
+    computed = []
+
+    def compute(router=None, quiet=True):
+        computed.append(router)
+        return StatusQuery(wgups_day)
+    monkeypatch.setattr(StatusQuery, "compute", compute)
+
+    def run(*argv, stdin=None):
+        if stdin is not None:
+            monkeypatch.setattr(status_query.sys, "stdin", io.StringIO(stdin))
+        try:
+            main(list(argv))
+            code = 0
+        except SystemExit as exit:
+            code = exit.code
+        out, err = capsys.readouterr()
+        return code, out, err
+    run.computed = computed
+    return run
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10:00 AM", (10, 0, 0)),
+    ("10:00am", (10, 0, 0)),
+    ("  9:05   pm ", (21, 5, 0)),
+    ("14:30", (14, 30, 0)),
+    ("14:30:15", (14, 30, 15)),
+])
+def test_time_formats(text, expected):
+    moment = parse_query_time(text)
+    assert (moment.hour, moment.minute, moment.second) == expected
+
+
+@pytest.mark.parametrize("text", ["25:00", "10:61", "noon", "", "13:00 PM"])
+def test_not_a_time(text):
+    with pytest.raises(ValueError):
+        parse_query_time(text)
+
+
+def test_answer_package_truck_and_fleet(query):
+    package = query.answer("10:25 AM package 9")
+    assert (package['package_id'], package['status'], package['address']) == (9, "En Route", "410 S State St")
+    assert query.answer("10:25 package 9") == package
+
+    truck = query.answer("10:25 truck 3")
+    assert (truck['truck'], truck['status']) == (3, "En Route")
+    assert sorted(record['package_id'] for record in truck['packages']) == [2, 9, 21, 22, 24, 25, 26, 33]
+
+    fleet = query.answer("10:25")
+    assert len(fleet['packages']) == 40
+    assert sum(fleet['counts'].values()) == 40
+
+
+@pytest.mark.parametrize("line", [
+    "10:00 truck 7",
+    "10:00 package 99",
+    "10:00 package 0",
+    "10:00 truck two",
+    "10:00 package -3",
+    "25:00 truck 2",
+    "noon",
+])
+def test_answer_turns_bad_queries_into_errors(query, line):
+    assert set(query.answer(line)) == {'error'}
+
+
+def test_unknown_truck_and_package(query):
+    assert query.answer("10:00 truck 7") == {'error': "No truck 7"}
+    assert query.truck(7, "10:00") is None
+    assert query.package(99, "10:00") is None
+
+
+def test_cli_truck_as_json(cli, query):
+    code, out, _ = cli("--at", "9:00", "10:25 AM", "--truck", "2", "--format", "json")
+
+    assert code == 0
+    answers = json.loads(out)
+    assert answers == json.loads(json.dumps([query.truck(2, "9:00"), query.truck(2, "10:25 AM")]))
+    assert [answer['at'] for answer in answers] == ["09:00:00", "10:25:00"]
+
+
+def test_cli_packages_as_csv(cli):
+    code, out, _ = cli("--at", "8:00", "12:00", "--package", "9", "15", "--format", "csv")
+
+    assert code == 0
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [(row['at'], row['package_id']) for row in rows] \
+        == [("08:00:00", "9"), ("08:00:00", "15"), ("12:00:00", "9"), ("12:00:00", "15")]
+    assert [row['status'] for row in rows] == ["At Hub", "En Route", "Delivered", "Delivered"]
+
+
+def test_cli_unknown_truck_is_left_out(cli):
+    code, out, _ = cli("--at", "10:00", "--truck", "7", "--format", "json")
+
+    assert (code, json.loads(out)) == (0, [])
+
+
+def test_cli_fleet_table(cli):
+    code, out, _ = cli("--at", "10:00")
+
+    lines = out.splitlines()
+    assert code == 0
+    assert lines[0].split()[:3] == ["AT", "PACKAGE_ID", "TRUCK"]
+    assert len(lines) == 41
+
+
+@pytest.mark.parametrize("argv, message", [
+    ([], "at least one --at"),
+    (["--at", "25:00"], "Can't read '25:00' as a time"),
+    (["--at", "10:00", "--truck", "two"], "invalid int value"),
+    (["--at", "10:00", "--format", "xml"], "invalid choice"),
+])
+def test_cli_usage_errors_exit_2_before_planning(cli, argv, message):
+    code, out, err = cli(*argv)
+
+    assert (code, out) == (2, "")
+    assert message in err
+    assert cli.computed == []
+
+
+def test_cli_stdin_answers_one_json_line_per_query(cli):
+    code, out, _ = cli("--stdin", stdin="10:25 package 9\n\n10:00 truck 7\n9:00\n")
+
+    answers = [json.loads(line) for line in out.splitlines()]
+    assert code == 0
+    assert [answer.get('package_id') for answer in answers] == [9, None, None]
+    assert answers[1] == {'error': "No truck 7"}
+    assert answers[2]['at'] == "09:00:00"
+
+
+@pytest.mark.parametrize("line, problem", [
+    ("10:00 truck", "Which truck?"),
+    ("10:00 package", "Which package?"),
+    ("10:00 truck two", "'two' isn't a truck number"),
+    ("10:00 package ²", "'²' isn't a package number"),
+])
+def test_answer_explains_a_bad_truck_or_package_number(query, line, problem):
+    error = query.answer(line)['error']
+
+    assert error.startswith(problem)
+    assert status_query.QUERY_USAGE in error
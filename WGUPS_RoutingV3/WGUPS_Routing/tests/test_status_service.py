@@ -0,0 +1,160 @@
+# test_status_service.py - Tests for the HTTP status service, over a real socket
+import asyncio
+import json
+
+import pytest
+
+from status_query import StatusQuery
+from status_service import MAX_HEADER_LINES, StatusService
+
+
+@pytest.fixture
+def service(wgups_day):
+    return StatusService(StatusQuery(wgups_day))
+
+
+def exchange(service, raw):
+    """Start the service on a free port, send raw request bytes on one connection and return everything sent back."""
+    async def talk():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        writer.write_eof()
+        reply = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return reply
+    return asyncio.run(talk())
+
+
+def responses(reply):
+    """Split a reply into (status, headers, body) for each response in it."""
+    found = []
+    while reply:
+        head, _, reply = reply.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        headers = {name.strip().lower(): value.strip()
+                   for name, _, value in (line.partition(":") for line in header_lines)}
+        length = int(headers.get("content-length", 0))
+        found.append((int(status_line.split()[1]), headers, reply[:length]))
+        reply = reply[length:]
+    return found
+
+
+def get(target, *header_lines, version="HTTP/1.1"):
+    return (f"GET {target} {version}\r\n" + "".join(line + "\r\n" for line in header_lines) + "\r\n").encode()
+
+
+def test_package_answer(service):
+    [(status, headers, body)] = responses(exchange(service, get("/packages/9?at=10:25%20AM")))
+
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert json.loads(body) == json.loads(json.dumps(service.query.package(9, "10:25 AM")))
+    assert headers["etag"].startswith(f'"{service.plan_tag}-')
+
+
+def test_unchanged_answer_gets_304(service):
+    [(_, first, body)] = responses(exchange(service, get("/trucks/2?at=9:00")))
+    etag = first["etag"]
+
+    reply = exchange(service, get("/trucks/2?at=9:00", f"If-None-Match: {etag}")
+                     + get("/trucks/2?at=9:00", f'If-None-Match: "stale", {etag}')
+                     + get("/trucks/2?at=9:00", 'If-None-Match: "stale"'))
+
+    [(status1, headers1, body1), (status2, _, body2), (status3, _, body3)] = responses(reply)
+    assert (status1, headers1["etag"], body1) == (304, etag, b"")
+    assert "content-length" not in headers1
+    assert (status2, body2) == (304, b"")
+    assert (status3, body3) == (200, body)
+
+
+def test_same_bucket_shares_one_answer(service):
+    first = service.handle("/fleet?at=10:00:05")
+    second = service.handle("/fleet?at=10:00:59")
+    next_minute = service.handle("/fleet?at=10:01")
+
+    assert first == second
+    assert next_minute[1] != first[1]
+    assert (service.misses, service.hits) == (2, 1)
+
+
+def test_least_recently_used_answer_goes_first(wgups_day):
+    service = StatusService(StatusQuery(wgups_day), cache_size=2)
+
+    service.handle("/packages/1?at=9:00")
+    service.handle("/packages/2?at=9:00")
+    service.handle("/packages/1?at=9:00")  # Package 1 is now the most recently used
+    service.handle("/packages/3?at=9:00")
+
+    assert [number for _, number, _ in service.cache] == [1, 3]
+    service.handle("/packages/1?at=9:00")
+    service.handle("/packages/2?at=9:00")
+    assert (service.misses, service.hits) == (4, 2)
+
+
+def test_requests_without_a_time_use_the_clock(wgups_day):
+    service = StatusService(StatusQuery(wgups_day), clock=lambda: wgups_day.start_time.replace(hour=10, minute=25))
+
+    assert service.handle("/packages/9") == service.handle("/packages/9?at=10:25")
+
+
+@pytest.mark.parametrize("raw, status", [
+    (get("/mileage"), 200),
+    (get("/health"), 200),
+    (get("/packages/99"), 404),
+    (get("/trucks/7"), 404),
+    (get("/trucks/two"), 404),
+    (get("/nowhere"), 404),
+    # '²' is a digit to str.isdigit() but not to int()
+    (b"GET /packages/\xb2 HTTP/1.1\r\n\r\n", 404),
+    (get("/fleet?at=25:99"), 400),
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"POST /fleet HTTP/1.1\r\n\r\n", 405),
+    (get("/fleet", *(f"X-Header-{number}: 1" for number in range(MAX_HEADER_LINES))), 431),
+    (get("/fleet", "X-Long: " + "x" * 70000), 431),
+    (get("/fleet?at=" + "1" * 70000), 414),
+])
+def test_request_status(service, raw, status):
+    [(found, headers, body)] = responses(exchange(service, raw))
+
+    assert found == status
+    assert (status == 200) == ("error" not in json.loads(body))
+
+
+def test_digit_like_ids_are_unknown_paths(service):
+    assert service.handle("/packages/²")[0] == 404
+    assert service.handle("/trucks/٣")[0] == 404
+
+
+def test_keep_alive_answers_every_pipelined_request(service):
+    reply = exchange(service, get("/health") + get("/mileage") + get("/packages/9?at=11:00", "Connection: close")
+                     + get("/health"))
+
+    found = responses(reply)
+    assert [status for status, _, _ in found] == [200, 200, 200]
+    assert found[-1][1]["connection"] == "close"
+    assert json.loads(found[1][2])["total"] == service.query.mileage()["total"]
+
+
+def test_http_1_0_closes_unless_kept_alive(service):
+    assert len(responses(exchange(service, get("/health", version="HTTP/1.0") * 2))) == 1
+    assert len(responses(exchange(service, get("/health", "Connection: keep-alive", version="HTTP/1.0") * 2))) == 2
+
+
+def test_request_with_a_body_closes_the_connection(service):
+    raw = b"GET /health HTTP/1.1\r\nContent-Length: 4\r\n\r\nbody" + get("/mileage")
+
+    [(status, headers, _)] = responses(exchange(service, raw))
+    assert (status, headers["connection"]) == (200, "close")
+
+
+def test_head_sends_headers_only(service):
+    reply = exchange(service, b"HEAD /mileage HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert int(responses(head + b"\r\n\r\n")[0][1]["content-length"]) == len(service.handle("/mileage")[2])
+    assert body == b""
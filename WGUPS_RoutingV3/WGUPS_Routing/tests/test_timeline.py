@@ -0,0 +1,133 @@
+# test_timeline.py - Tests for the recorded delivery timeline
+import datetime
+
+from clock import seconds_of_day
+from main import DeliveryRouter
+from timeline import DeliveryTimeline
+
+DAY = datetime.datetime(2024, 1, 1, 8, 0)
+
+
+def at(hour, minute=0, second=0):
+    return DAY.replace(hour=hour, minute=minute, second=second)
+
+
+def seconds(hour, minute=0, second=0):
+    return seconds_of_day(at(hour, minute, second))
+
+
+def small_day():
+    """Truck 1 takes packages 1 and 2 out at 8:00; package 2 was late to the hub, package 3 had a wrong address."""
+    timeline = DeliveryTimeline(DAY)
+    timeline.add_package(1, 1, 0, "233 Canyon Rd", "10:30 AM")
+    timeline.add_package(2, 1, 0, "2530 S 500 E", "EOD", available_time=seconds(7, 50))
+    timeline.add_package(3, 2, 0, "300 State St", "EOD", address_pending=True)
+
+    timeline.record_loaded(seconds(8), 1, 0, [1, 2])
+    timeline.record_departed(seconds(8), 1, 0, [1, 2], 0.0)
+    timeline.record_delivered(seconds(8, 20, 30), 1, 1, 6.1)
+    timeline.record_delivered(seconds(8, 45), 1, 2, 13.6)
+    timeline.record_returned(seconds(9, 10), 1, 0, 21.1)
+    timeline.record_changed(seconds(10, 20), 3, address="410 S State St")
+    timeline.record_changed(seconds(10, 25), 1, deadline="9:00 AM")
+    timeline.finish()
+    return timeline
+
+
+def test_package_goes_through_its_day():
+    timeline = small_day()
+
+    def status(hour, minute=0, second=0):
+        found = timeline.package_status(1, at(hour, minute, second))
+        return found['status'], found['time_info']
+
+    assert status(7, 59) == ("At Hub", "Departs 08:00 AM")
+    # Loaded and sent out in the same second - the later event wins
+    assert status(8) == ("En Route", "In Transit")
+    assert status(8, 20, 29) == ("En Route", "In Transit")
+    assert status(8, 20, 30) == ("Delivered", "08:20 AM")
+    assert status(17) == ("Delivered", "08:20 AM")
+
+
+def test_late_package_is_delayed_until_it_arrives():
+    timeline = small_day()
+
+    assert timeline.package_status(2, at(7, 30))['status'] == "Delayed"
+    assert timeline.package_status(2, at(7, 30))['time_info'] == "Arrives 7:50 AM"
+    assert timeline.package_status(2, at(7, 55))['status'] == "At Hub"
+
+
+def test_address_and_deadline_changes_show_from_when_they_happen():
+    timeline = small_day()
+
+    before = timeline.package_status(3, at(10, 19))
+    after = timeline.package_status(3, at(10, 20))
+    assert (before['status'], before['time_info'], before['address']) == ("At Hub", "Address TBD", "300 State St")
+    assert (after['time_info'], after['address']) == ("Waiting", "410 S State St")
+
+    assert timeline.package_status(1, at(10, 24))['deadline'] == "10:30 AM"
+    assert timeline.package_status(1, at(10, 25))['deadline'] == "9:00 AM"
+
+
+def test_truck_status():
+    timeline = small_day()
+
+    def status(hour, minute=0):
+        found = timeline.truck_status(1, at(hour, minute))
+        return found['status'], found['on_board'], found['delivered'], found['miles']
+
+    assert status(7, 59) == ("At Hub", 0, 0, 0.0)
+    assert status(8, 30) == ("En Route", 1, 1, 6.1)
+    assert status(9) == ("En Route", 0, 2, 13.6)
+    assert status(9, 10) == ("At Hub", 0, 2, 21.1)
+
+
+def test_unknown_package_and_idle_truck():
+    timeline = small_day()
+
+    assert timeline.package_status(99, at(9)) is None
+    assert timeline.truck_status(5, at(9)) is None
+    assert timeline.package_events(99) == []
+
+
+def test_package_events_are_in_time_order():
+    events = small_day().package_events(2)
+
+    assert [kind for _, kind in events] == [DeliveryTimeline.ARRIVED, DeliveryTimeline.LOADED,
+                                            DeliveryTimeline.DEPARTED, DeliveryTimeline.DELIVERED]
+    assert [moment for moment, _ in events] == sorted(moment for moment, _ in events)
+
+
+def test_wgups_statuses_match_the_delivery_times(wgups_day):
+    # Every 5 minutes of the day, the timeline's answer agrees with the departure and delivery times
+    for package_id in range(1, 41):
+        package = wgups_day.package_table.lookup(package_id)
+        departure = wgups_day.package_departure(package_id)
+        for minutes in range(0, 5 * 60, 5):
+            query_time = at(8) + datetime.timedelta(minutes=minutes)
+            status = wgups_day.get_package_status_at_time(package_id, query_time)['status']
+            if query_time >= package['delivery_time']:
+                assert status == "Delivered", (package_id, query_time)
+            elif query_time >= departure:
+                assert status == "En Route", (package_id, query_time)
+            else:
+                assert status in ("At Hub", "Delayed"), (package_id, query_time)
+
+
+def test_wgups_package_9_address_before_and_after_the_correction(wgups_day):
+    before = wgups_day.get_package_status_at_time(9, at(10, 19))
+    after = wgups_day.get_package_status_at_time(9, at(10, 20))
+
+    assert (before['address'], before['time_info']) == ("300 State St", "Address TBD")
+    assert after['address'] == "410 S State St"
+
+
+def test_wgups_address_change_mid_route_shows_from_when_it_happens(wgups_day, run_day):
+    router = DeliveryRouter()
+    router.change_package(19, "9:00 AM", address="3575 W Valley Central Station bus Loop", zip_code="84119")
+    run_day(router)
+
+    before = router.timeline.package_status(19, at(8, 59))
+    after = router.timeline.package_status(19, at(9))
+    assert before['address'] == wgups_day.package_table.lookup(19)['delivery_address']
+    assert after['address'] == "3575 W Valley Central Station bus Loop"